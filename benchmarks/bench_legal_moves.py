@@ -0,0 +1,85 @@
+"""
+Micro-benchmark for legal move generation in random midgame states, compared against the original set-rebuilding
+implementation.  Games play tricks on compact hands, so those are the figures that matter; tuple hands take a
+conversion on every call.
+
+    python -m benchmarks.bench_legal_moves
+"""
+import random
+import timeit
+from typing import Set, List
+
+from benchmarks.bench_ordering import _legacy_get_trick_winning_card, _legacy_second_card_wins
+from pinochle.cards import Card, CardDeck, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.play_tricks import PlayTricksState
+
+NUMBER = 20
+
+
+def _legacy_valid_cards_to_play(state: PlayTricksState) -> Set[Card]:
+    hand = state.hands[state.player_index]
+    if len(state.current_trick) == 0:
+        return set(hand)
+
+    def has_suit_in_hand(suit: Suit) -> bool:
+        return suit in {card.suit for card in hand}
+
+    def suit_of_current_trick() -> Suit:
+        return state.current_trick[0].suit
+
+    if has_suit_in_hand(suit_of_current_trick()):
+        matching_cards = set(card for card in hand if card.suit == suit_of_current_trick())
+    elif has_suit_in_hand(state.trump):
+        matching_cards = set(card for card in hand if card.suit == state.trump)
+    else:
+        return set(hand)
+
+    winning_cards = set(
+        filter(
+            lambda card: _legacy_second_card_wins(
+                _legacy_get_trick_winning_card(state.current_trick, state.trump), card, trump=state.trump
+            ),
+            matching_cards,
+        )
+    )
+    return winning_cards if winning_cards else matching_cards
+
+
+def midgame_states(count: int, seed: int = 0) -> List[PlayTricksState]:
+    """
+    Random states part way through a hand, reached by playing random legal cards from a random deal.
+    """
+    rng = random.Random(seed)
+    states = []
+    while len(states) < count:
+        hands = CardDeck.deal(rng)
+        state = PlayTricksState(
+            hands=hands, players=("a", "b", "c", "d"), player_index=rng.randrange(4), trump=rng.choice(list(Suit))
+        )
+        for _ in range(rng.randrange(8, 40)):
+            state = state.play_card(state.current_player(), rng.choice(state.legal_moves()))
+        states.append(state)
+    return states
+
+
+def main() -> None:
+    states = midgame_states(500)
+    compact_states = [
+        state._replace(hands=tuple(CompactHand.from_cards(hand) for hand in state.hands)) for state in states
+    ]
+    for state, compact_state in zip(states, compact_states):
+        assert set(state.legal_moves()) == set(compact_state.legal_moves()) == _legacy_valid_cards_to_play(state)
+
+    legacy = min(timeit.repeat(lambda: [_legacy_valid_cards_to_play(s) for s in states], number=NUMBER, repeat=5))
+    for name, timed_states in (("tuple hands", states), ("compact hands", compact_states)):
+        current = min(timeit.repeat(lambda: [s.legal_moves() for s in timed_states], number=NUMBER, repeat=5))
+        per_call = NUMBER * len(states)
+        print(
+            f"legal moves, {name:14s} legacy {legacy / per_call * 1e6:8.2f} us   "
+            f"current {current / per_call * 1e6:8.2f} us   {legacy / current:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
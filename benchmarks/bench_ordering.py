@@ -0,0 +1,80 @@
+"""
+Micro-benchmark for card ordering:  sorting hands and resolving tricks, compared against the original list.index
+based comparisons.
+
+    python -m benchmarks.bench_ordering
+"""
+import random
+import timeit
+from functools import reduce
+from typing import Tuple, Callable
+
+from pinochle.cards import Card, CardDeck, Suit, Rank
+from pinochle.trick import get_trick_winning_card
+
+NUMBER = 200
+
+
+def _legacy_suit_lt(suit0: Suit, suit1: Suit) -> bool:
+    order = [Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS, Suit.SPADES]
+    return order.index(suit0) < order.index(suit1)
+
+
+def _legacy_rank_lt(rank0: Rank, rank1: Rank) -> bool:
+    order = [Rank.NINE, Rank.JACK, Rank.QUEEN, Rank.KING, Rank.TEN, Rank.ACE]
+    return order.index(rank0) < order.index(rank1)
+
+
+class _LegacyCard:
+    __slots__ = ("card",)
+
+    def __init__(self, card: Card):
+        self.card = card
+
+    def __lt__(self, other: "_LegacyCard") -> bool:
+        if self.card.suit == other.card.suit:
+            return _legacy_rank_lt(self.card.rank, other.card.rank)
+        return _legacy_suit_lt(self.card.suit, other.card.suit)
+
+
+def _legacy_second_card_wins(card0: Card, card1: Card, trump: Suit) -> bool:
+    if card0.suit == card1.suit:
+        return _legacy_rank_lt(card0.rank, card1.rank)
+    else:
+        return card1.suit == trump
+
+
+def _legacy_get_trick_winning_card(cards: Tuple[Card, ...], trump: Suit) -> Card:
+    return reduce(
+        lambda card0, card1: card1 if _legacy_second_card_wins(card0, card1, trump) else card0, cards[1:], cards[0]
+    )
+
+
+def _time(function: Callable[[], object]) -> float:
+    return min(timeit.repeat(function, number=NUMBER, repeat=5)) / NUMBER
+
+
+def _report(name: str, legacy: float, current: float) -> None:
+    print(f"{name:<24} legacy {legacy * 1e6:8.2f} us   current {current * 1e6:8.2f} us   {legacy / current:5.1f}x")
+
+
+def main() -> None:
+    rng = random.Random(0)
+    hands = [tuple(rng.sample(CardDeck.all_cards(), k=12)) for _ in range(50)]
+    tricks = [tuple(rng.sample(CardDeck.all_cards(), k=4)) for _ in range(50)]
+    legacy_hands = [[_LegacyCard(card) for card in hand] for hand in hands]
+
+    _report(
+        "sort 12-card hand",
+        _time(lambda: [sorted(hand) for hand in legacy_hands]) / len(hands),
+        _time(lambda: [sorted(hand) for hand in hands]) / len(hands),
+    )
+    _report(
+        "get_trick_winning_card",
+        _time(lambda: [_legacy_get_trick_winning_card(trick, Suit.HEARTS) for trick in tricks]) / len(tricks),
+        _time(lambda: [get_trick_winning_card(trick, Suit.HEARTS) for trick in tricks]) / len(tricks),
+    )
+
+
+if __name__ == "__main__":
+    main()
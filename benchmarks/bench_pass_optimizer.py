@@ -0,0 +1,68 @@
+"""
+Pass selection over dealt hands, searching with pruning (best_passes) against scoring every distinct pass of four
+cards, for the partner's pass (12 cards) and the bid winner's (16 cards).  Prints microseconds per search and the
+slowest search, which is what a millisecond time budget has to cover.
+
+    python -m benchmarks.bench_pass_optimizer
+"""
+import itertools
+import random
+import time
+from typing import List, Tuple
+
+from pinochle.analysis.bid_estimator import card_trick_power, PASS_SIZE
+from pinochle.analysis.pass_optimizer import best_passes, PassObjective, TO_BID_WINNER, TO_PARTNER
+from pinochle.cards import Card, CardDeck, Suit
+from pinochle.scoring import score_meld, precompute_meld_table
+from pinochle.utils import remove_cards_from_hand
+
+NUM_HANDS = 200
+NUM_BRUTE_FORCE_HANDS = 20
+TOP_K = 3
+
+
+def hands(objective: PassObjective) -> List[Tuple[Tuple[Card, ...], Suit]]:
+    rng = random.Random(0)
+    cases = []
+    for _ in range(NUM_HANDS):
+        deal = CardDeck.deal(rng)
+        hand = deal[0] if objective is TO_BID_WINNER else deal[0] + deal[1][:PASS_SIZE]
+        cases.append((hand, rng.choice(list(Suit))))
+    return cases
+
+
+def brute_force(hand: Tuple[Card, ...], trump: Suit, objective: PassObjective) -> List[float]:
+    scores = []
+    for cards in set(itertools.combinations(sorted(hand), PASS_SIZE)):
+        kept = remove_cards_from_hand(hand, cards)
+        scores.append(
+            score_meld(list(kept), trump)
+            + objective.kept_power * sum(card_trick_power(card, trump) for card in kept)
+            + objective.passed_power * sum(card_trick_power(card, trump) for card in cards)
+        )
+    return sorted(scores, reverse=True)[:TOP_K]
+
+
+def main() -> None:
+    precompute_meld_table()
+    for name, objective in (("to bid winner", TO_BID_WINNER), ("to partner", TO_PARTNER)):
+        cases = hands(objective)
+        times, nodes = [], 0
+        for hand, trump in cases:
+            start = time.perf_counter()
+            nodes += best_passes(hand, trump, objective, top_k=TOP_K, time_budget=None).nodes
+            times.append(time.perf_counter() - start)
+        print(
+            f"{name:14s} pruned      {sum(times) / len(times) * 1e6:8.0f} us/search "
+            f"(slowest {max(times) * 1e6:.0f} us, {nodes / len(cases):.0f} nodes)"
+        )
+
+        start = time.perf_counter()
+        for hand, trump in cases[:NUM_BRUTE_FORCE_HANDS]:
+            brute_force(hand, trump, objective)
+        elapsed = time.perf_counter() - start
+        print(f"{name:14s} brute force {elapsed / NUM_BRUTE_FORCE_HANDS * 1e6:8.0f} us/search")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Nodes per second of a plain exhaustive search over small endgames, walking PlayTricksState (a new state per node)
+against SearchState (make_move and unmake_move in place), and random playouts of whole hands both ways.
+
+    python -m benchmarks.bench_search_state
+"""
+import random
+import time
+from typing import List
+
+from pinochle.cards import CardDeck, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.play_tricks import PlayTricksState
+from pinochle.search_state import SearchState, random_playout
+
+CARDS_PER_HAND = 3
+NUM_ENDGAMES = 20
+NUM_PLAYOUTS = 500
+
+
+def endgames() -> List[PlayTricksState]:
+    rng = random.Random(0)
+    states = []
+    for _ in range(NUM_ENDGAMES):
+        cards = rng.sample(CardDeck.all_cards(), k=4 * CARDS_PER_HAND)
+        hands = tuple(CompactHand.from_cards(cards[player::4]) for player in range(4))
+        states.append(PlayTricksState(hands=hands, players=("a", "b", "c", "d"), player_index=0, trump=Suit.HEARTS))
+    return states
+
+
+def count_immutable_nodes(state: PlayTricksState) -> int:
+    if not any(state.hands):
+        return 1
+    return 1 + sum(count_immutable_nodes(state.play_card(state.current_player(), card)) for card in state.legal_moves())
+
+
+def count_search_state_nodes(search_state: SearchState) -> int:
+    if search_state.is_over():
+        return 1
+    nodes = 1
+    for move in search_state.legal_moves():
+        search_state.make_move(move)
+        nodes += count_search_state_nodes(search_state)
+        search_state.unmake_move()
+    return nodes
+
+
+def immutable_playout(state: PlayTricksState, rng: random.Random) -> None:
+    while any(state.hands):
+        state = state.play_card(state.current_player(), rng.choice(state.legal_moves()))
+
+
+def main() -> None:
+    states = endgames()
+    for name, count_nodes in (
+        ("PlayTricksState", count_immutable_nodes),
+        ("SearchState", lambda state: count_search_state_nodes(SearchState(state))),
+    ):
+        start = time.perf_counter()
+        nodes = sum(count_nodes(state) for state in states)
+        elapsed = time.perf_counter() - start
+        print(f"search   {name:16s} {nodes / elapsed:10.0f} nodes/s ({nodes} nodes)")
+
+    deal = PlayTricksState(
+        hands=tuple(CompactHand.from_cards(hand) for hand in CardDeck.deal(random.Random(0))),
+        players=("a", "b", "c", "d"),
+        player_index=0,
+        trump=Suit.HEARTS,
+    )
+    for name, playout in (("PlayTricksState", immutable_playout), ("SearchState", random_playout)):
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for _ in range(NUM_PLAYOUTS):
+            playout(deal, rng)
+        elapsed = time.perf_counter() - start
+        print(f"playouts {name:16s} {NUM_PLAYOUTS / elapsed:10.0f} hands/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Time and memory of PlayTricksState.play_card over whole hands, compared against the original transition that
+validated through legal_moves and rebuilt the state with _replace.  Memory is measured with tracemalloc:  the bytes
+each state keeps alive when a game's history is kept, and the peak of the short-lived allocations of a transition.
+
+    python -m benchmarks.bench_transitions
+"""
+import random
+import timeit
+import tracemalloc
+from typing import List, Callable
+
+from pinochle.cards import Card, CardDeck, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.play_tricks import PlayTricksState, CompletedTrick, InvalidPlay
+from pinochle.scoring import count_trick_points, LAST_TRICK_POINTS
+from pinochle.trick import second_card_wins
+from pinochle.utils import remove_cards_from_hand
+
+NUM_HANDS = 200
+
+Transition = Callable[[PlayTricksState, str, Card], PlayTricksState]
+
+
+def _legacy_play_card(state: PlayTricksState, player: str, card: Card) -> PlayTricksState:
+    if player != state.current_player():
+        raise InvalidPlay(f"{player} cannot play on {state.current_player()}'s turn")
+    if card not in state.legal_moves():
+        raise InvalidPlay("Invalid card played")
+    new_hand = remove_cards_from_hand(state.hands[state.player_index], (card,))
+    new_hands = state.hands[: state.player_index] + (new_hand,) + state.hands[state.player_index + 1 :]
+
+    if not state.current_trick:
+        led_suit, winner_index, winning_card = card.suit, state.player_index, card
+    else:
+        led_suit, winner_index, winning_card = state._trick_in_progress()
+        if second_card_wins(winning_card, card, trump=state.trump):
+            winner_index, winning_card = state.player_index, card
+
+    trick = state.current_trick + (card,)
+    if len(trick) < 4:
+        return state._replace(
+            hands=new_hands,
+            player_index=(state.player_index + 1) % 4,
+            current_trick=trick,
+            winner_index=winner_index,
+            winning_card=winning_card,
+            led_suit=led_suit,
+        )
+    points = count_trick_points(trick) + (0 if any(new_hands) else LAST_TRICK_POINTS)
+    team_points = list(state.team_points)
+    team_points[winner_index % 2] += points
+    completed_trick = CompletedTrick(
+        leader_index=(state.player_index + 1) % 4, cards=trick, winner_index=winner_index, points=points
+    )
+    return state._replace(
+        hands=new_hands,
+        player_index=winner_index,
+        current_trick=tuple(),
+        winner_index=None,
+        winning_card=None,
+        led_suit=None,
+        completed_tricks=state.completed_tricks + (completed_trick,),
+        team_points=(team_points[0], team_points[1]),
+    )
+
+
+def _current_play_card(state: PlayTricksState, player: str, card: Card) -> PlayTricksState:
+    return state.play_card(player, card)
+
+
+def starting_states(compact: bool) -> List[PlayTricksState]:
+    states = []
+    for seed in range(NUM_HANDS):
+        rng = random.Random(seed)
+        hands = CardDeck.deal(rng)
+        if compact:
+            hands = tuple(CompactHand.from_cards(hand) for hand in hands)
+        states.append(
+            PlayTricksState(hands=hands, players=("a", "b", "c", "d"), player_index=0, trump=rng.choice(list(Suit)))
+        )
+    return states
+
+
+def move_lists(states: List[PlayTricksState]) -> List[List[Card]]:
+    """
+    The cards each hand plays, always the lowest legal card, worked out once so that timing only covers transitions.
+    """
+    moves = []
+    for state in states:
+        cards = []
+        while any(state.hands):
+            cards.append(state.legal_moves()[0])
+            state = state.play_card(state.current_player(), cards[-1])
+        moves.append(cards)
+    return moves
+
+
+def play_all(transition: Transition, states: List[PlayTricksState], moves: List[List[Card]], history: list) -> None:
+    for state, cards in zip(states, moves):
+        for card in cards:
+            state = transition(state, state.players[state.player_index], card)
+            history.append(state)
+
+
+def memory_per_transition(transition: Transition, states, moves):
+    history: list = []
+    tracemalloc.start()
+    play_all(transition, states, moves, history)
+    retained, _ = tracemalloc.get_traced_memory()
+
+    transient_peaks = 0
+    for state, cards in zip(states[:20], moves[:20]):
+        for card in cards:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            state = transition(state, state.players[state.player_index], card)
+            transient_peaks += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return retained / len(history), transient_peaks / sum(len(cards) for cards in moves[:20])
+
+
+def main() -> None:
+    for compact in (False, True):
+        states = starting_states(compact)
+        moves = move_lists(states)
+        plays = sum(len(cards) for cards in moves)
+        for name, transition in (("legacy", _legacy_play_card), ("current", _current_play_card)):
+            elapsed = min(timeit.repeat(lambda: play_all(transition, states, moves, []), number=1, repeat=5))
+            retained, transient = memory_per_transition(transition, states, moves)
+            print(
+                f"{'compact' if compact else 'tuple'} hands, {name:7s} {elapsed / plays * 1e6:6.2f} us/play   "
+                f"retained {retained:6.1f} B/state   transient peak {transient:6.1f} B/play"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Size and encode/decode time of the binary wire format against the JSON game codec, over every state of a full game.
+
+    python -m benchmarks.bench_wire_format
+"""
+import random
+import timeit
+from typing import List
+
+from pinochle import game_codec, wire_format
+from pinochle.cards import CardDeck, Suit
+from pinochle.game_events import (
+    GameStarted,
+    BidPlaced,
+    BiddingPassed,
+    TrumpSelected,
+    CardsPassed,
+    CardPlayed,
+    apply_event,
+)
+from pinochle.pinochle_game import PinochleGame, GameState
+
+NUMBER = 20
+
+
+def full_game_states(seed: int = 0) -> List[PinochleGame]:
+    """
+    Every state of a game a bids and wins in a random trump, with every card played at random.
+    """
+    rng = random.Random(seed)
+    players = ("a", "b", "c", "d")
+    events = [
+        GameStarted(players=players, hands=CardDeck.deal()),
+        BidPlaced(player="a", bid=25),
+        *(BiddingPassed(player=player) for player in "bcd"),
+        TrumpSelected(player="a", trump=rng.choice(list(Suit))),
+    ]
+    game = None
+    for event in events:
+        game = apply_event(game, event)
+    states = [game]
+    for source, destination in (("c", "a"), ("a", "c")):
+        hand = game.hands[players.index(source)]
+        game = apply_event(game, CardsPassed(source=source, destination=destination, cards=tuple(hand[:4])))
+        states.append(game)
+    while game.state == GameState.PLAYING_TRICKS:
+        game = apply_event(game, CardPlayed(player=game.current_player(), card=rng.choice(game.tricks.legal_moves())))
+        states.append(game)
+    return states
+
+
+def main() -> None:
+    states = full_game_states()
+    for name, codec in (("json", game_codec), ("binary", wire_format)):
+        encoded = [codec.encode_game(state) for state in states]
+        assert [codec.decode_game(data) for data in encoded] == states
+        size = sum(len(data.encode() if isinstance(data, str) else data) for data in encoded) / len(states)
+        encode = min(timeit.repeat(lambda: [codec.encode_game(s) for s in states], number=NUMBER, repeat=5))
+        decode = min(timeit.repeat(lambda: [codec.decode_game(d) for d in encoded], number=NUMBER, repeat=5))
+        per_call = NUMBER * len(states)
+        print(
+            f"{name:7s} {size:7.1f} bytes   encode {encode / per_call * 1e6:7.2f} us   "
+            f"decode {decode / per_call * 1e6:7.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Benchmark suite for the rules hot paths, over fixed-seed workloads so that runs are comparable.  Results are written
+as JSON, and a run compared against an earlier one fails when any benchmark slows down by more than the threshold.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare results.json --threshold 0.25
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import timeit
+from typing import NamedTuple, Callable, Any, List, Dict, Optional
+
+from benchmarks.bench_legal_moves import midgame_states
+from pinochle.cards import CardDeck, Suit
+from pinochle.passing_cards import PassingCards
+from pinochle.scoring import score_meld
+from pinochle.sim import play_hand, HeuristicPolicy
+from pinochle.trick import get_trick_winning_card
+from pinochle.utils import remove_cards_from_hand
+
+DEFAULT_THRESHOLD = 0.2
+REPEAT = 5
+SEED = 0
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # Builds the workload outside the timed section
+    setup: Callable[[], Any]
+    # Runs the whole workload once, returning how many calls of the benchmarked operation it made
+    run: Callable[[Any], int]
+    number: int = 10
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline_us: float
+    current_us: float
+
+    def slowdown(self) -> float:
+        return self.current_us / self.baseline_us - 1
+
+
+def _random_hands() -> List[tuple]:
+    rng = random.Random(SEED)
+    return [(hand, rng.choice(tuple(Suit))) for _ in range(50) for hand in CardDeck.deal(rng)]
+
+
+def _score_meld(hands) -> int:
+    for hand, trump in hands:
+        score_meld(hand, trump)
+    return len(hands)
+
+
+def _legal_moves(states) -> int:
+    for state in states:
+        state.legal_moves()
+    return len(states)
+
+
+def _pass_sequences() -> List[tuple]:
+    """
+    Deals with the partner passing their four highest cards to the bid winner, who passes back their four lowest.
+    """
+    rng = random.Random(SEED)
+    sequences = []
+    for _ in range(200):
+        bid_winner_hand, _, partner_hand, _ = CardDeck.deal(rng)
+        to_bid_winner = tuple(sorted(partner_hand)[-4:])
+        to_partner = tuple(sorted(bid_winner_hand + to_bid_winner)[:4])
+        sequences.append((bid_winner_hand, partner_hand, to_bid_winner, to_partner))
+    return sequences
+
+
+def _remove_cards(sequences) -> int:
+    for bid_winner_hand, partner_hand, to_bid_winner, to_partner in sequences:
+        remove_cards_from_hand(partner_hand, to_bid_winner)
+        remove_cards_from_hand(bid_winner_hand + to_bid_winner, to_partner)
+    return 2 * len(sequences)
+
+
+def _pass_cards(sequences) -> int:
+    for bid_winner_hand, partner_hand, to_bid_winner, to_partner in sequences:
+        PassingCards(
+            bid_winner="a", partner="c", bid_winner_hand=bid_winner_hand, partner_hand=partner_hand
+        ).pass_cards(source="c", destination="a", cards=to_bid_winner).pass_cards(
+            source="a", destination="c", cards=to_partner
+        )
+    return len(sequences)
+
+
+def _deal(rng: random.Random) -> int:
+    for _ in range(200):
+        CardDeck.deal(rng)
+    return 200
+
+
+def _random_tricks() -> List[tuple]:
+    rng = random.Random(SEED)
+    return [(tuple(rng.sample(CardDeck.all_cards(), k=4)), rng.choice(tuple(Suit))) for _ in range(500)]
+
+
+def _trick_winning_card(tricks) -> int:
+    for cards, trump in tricks:
+        get_trick_winning_card(cards, trump)
+    return len(tricks)
+
+
+def _full_hands(policies) -> int:
+    for hand_number in range(10):
+        play_hand(hand_number, policies, seed=SEED)
+    return 10
+
+
+BENCHMARKS = (
+    Benchmark("score_meld", _random_hands, _score_meld),
+    Benchmark("legal_moves", lambda: midgame_states(500, seed=SEED), _legal_moves),
+    Benchmark("remove_cards_from_hand", _pass_sequences, _remove_cards),
+    Benchmark("pass_cards", _pass_sequences, _pass_cards),
+    Benchmark("deal", lambda: random.Random(SEED), _deal),
+    Benchmark("get_trick_winning_card", _random_tricks, _trick_winning_card),
+    Benchmark("play_hand", lambda: (HeuristicPolicy(),) * 4, _full_hands, number=5),
+)
+
+
+def run_benchmarks(benchmarks=BENCHMARKS, repeat: int = REPEAT, name_filter: str = "") -> Dict[str, float]:
+    """
+    Runs each benchmark, returning the best time per call in microseconds by name.
+    """
+    results = {}
+    for benchmark in benchmarks:
+        if name_filter not in benchmark.name:
+            continue
+        workload = benchmark.setup()
+        calls = benchmark.run(workload)
+        best = min(timeit.repeat(lambda: benchmark.run(workload), number=benchmark.number, repeat=repeat))
+        results[benchmark.name] = best / (benchmark.number * calls) * 1e6
+    return results
+
+
+def to_json(results: Dict[str, float]) -> Dict[str, Any]:
+    return {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {name: {"per_call_us": per_call_us} for name, per_call_us in results.items()},
+    }
+
+
+def find_regressions(
+    baseline: Dict[str, Any], results: Dict[str, float], threshold: float = DEFAULT_THRESHOLD
+) -> List[Regression]:
+    """
+    Benchmarks that are more than threshold (0.2 is 20%) slower than in the baseline JSON.  Benchmarks missing from
+    either side are skipped.
+    """
+    regressions = []
+    for name, per_call_us in results.items():
+        if name not in baseline["results"]:
+            continue
+        regression = Regression(name, baseline["results"][name]["per_call_us"], per_call_us)
+        if regression.slowdown() > threshold:
+            regressions.append(regression)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Time the rules hot paths")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="fail on regressions against this earlier JSON result")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--filter", default="", help="only run benchmarks whose names contain this")
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = run_benchmarks(repeat=args.repeat, name_filter=args.filter)
+    for name, per_call_us in results.items():
+        line = f"{name:24s} {per_call_us:10.2f} us"
+        if baseline is not None and name in baseline["results"]:
+            line += f"   baseline {baseline['results'][name]['per_call_us']:10.2f} us"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(to_json(results), output_file, indent=2)
+
+    if baseline is None:
+        return 0
+    regressions = find_regressions(baseline, results, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression.name}: {regression.slowdown():.0%} slower than the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
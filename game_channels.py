@@ -0,0 +1,167 @@
+"""
+Fan-out of game updates to WebSocket subscribers.  Each game with subscribers in this process has one GameChannel,
+which follows the game's event log and turns every new event into deltas (see pinochle.game_deltas).  The public
+delta is encoded once per event and the same text is queued for every subscriber; only players who learn about cards
+get a message of their own.
+
+A channel catches up as soon as this process records a move, and otherwise checks the store every poll_interval
+seconds, which picks up moves recorded by other worker processes.  If following the game fails, the error is logged
+and every subscriber is closed with an internal error, rather than left waiting on a channel that has stopped.
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, Optional, Set, Tuple
+
+from starlette import status
+from starlette.concurrency import run_in_threadpool
+
+from game_repository import GameRepository, LoadedGame
+from pinochle.game_codec import decode_event
+from pinochle.game_deltas import public_delta, private_deltas
+from pinochle.game_events import apply_event
+
+SUBSCRIBER_QUEUE_SIZE = 256
+
+logger = logging.getLogger(__name__)
+
+
+class Subscriber:
+    def __init__(self, player: Optional[str]) -> None:
+        self.player = player
+        # None tells the connection to close, with close_code
+        self.messages: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.close_code = status.WS_1000_NORMAL_CLOSURE
+
+    def send(self, message: str) -> bool:
+        try:
+            self.messages.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def drop(self, close_code: int = status.WS_1000_NORMAL_CLOSURE) -> None:
+        """
+        Drops whatever is still queued and tells the connection to close, for a client too slow to keep up or a channel
+        that can no longer follow its game.
+        """
+        while not self.messages.empty():
+            self.messages.get_nowait()
+        self.close_code = close_code
+        self.messages.put_nowait(None)
+
+
+class GameChannel:
+    def __init__(self, repository: GameRepository, game_id: int, loaded: LoadedGame, poll_interval: float) -> None:
+        self._repository = repository
+        self._game_id = game_id
+        self._loaded = loaded
+        self._poll_interval = poll_interval
+        self._subscribers: Set[Subscriber] = set()
+        self._changed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def loaded(self) -> LoadedGame:
+        """
+        The game as of the last delta sent, which is where a new subscriber's updates start from.
+        """
+        return self._loaded
+
+    def subscribe(self, player: Optional[str]) -> Subscriber:
+        subscriber = Subscriber(player)
+        self._subscribers.add(subscriber)
+        if self._task is None:
+            self._task = asyncio.create_task(self._follow())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def is_idle(self) -> bool:
+        return not self._subscribers
+
+    def notify(self) -> None:
+        self._changed.set()
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _follow(self) -> None:
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._changed.clear()
+                await self._catch_up()
+        except Exception:
+            logger.exception("Stopped following game %s", self._game_id)
+            self._drop_all(status.WS_1011_INTERNAL_ERROR)
+
+    async def _catch_up(self) -> None:
+        events = await run_in_threadpool(
+            self._repository.store.get_events, self._game_id, start=self._loaded.event_count
+        )
+        for text in events:
+            before = self._loaded.game
+            event = decode_event(text)
+            after = apply_event(before, event)
+            self._loaded = LoadedGame(event_count=self._loaded.event_count + 1, game=after)
+            self._broadcast(
+                json.dumps(public_delta(before, event, after, self._loaded.event_count)),
+                private_deltas(event, self._loaded.event_count),
+            )
+
+    def _drop_all(self, close_code: int) -> None:
+        subscribers, self._subscribers = self._subscribers, set()
+        for subscriber in subscribers:
+            subscriber.drop(close_code)
+        # Whoever subscribes next starts following again, from the last event that was sent
+        self._task = None
+
+    def _broadcast(self, public_message: str, private_messages: Dict[str, Dict]) -> None:
+        private_texts = {player: json.dumps(delta) for player, delta in private_messages.items()}
+        for subscriber in list(self._subscribers):
+            sent = subscriber.send(public_message)
+            if sent and subscriber.player in private_texts:
+                sent = subscriber.send(private_texts[subscriber.player])
+            if not sent:
+                self._subscribers.discard(subscriber)
+                subscriber.drop()
+
+
+class GameChannels:
+    def __init__(self, repository: GameRepository, poll_interval: float = 0.5) -> None:
+        self._repository = repository
+        self._poll_interval = poll_interval
+        self._channels: Dict[int, GameChannel] = {}
+
+    async def subscribe(self, game_id: int, player: Optional[str]) -> Tuple[GameChannel, Subscriber]:
+        """
+        Subscribes to a game's updates.  Raises GameNotFound for an unknown game.
+        """
+        channel = self._channels.get(game_id)
+        if channel is None:
+            loaded = await run_in_threadpool(self._repository.load, game_id)
+            # Another subscriber may have opened the channel while the game loaded
+            channel = self._channels.setdefault(
+                game_id, GameChannel(self._repository, game_id, loaded, self._poll_interval)
+            )
+        return channel, channel.subscribe(player)
+
+    def unsubscribe(self, game_id: int, subscriber: Subscriber) -> None:
+        channel = self._channels.get(game_id)
+        if channel is None:
+            return
+        channel.unsubscribe(subscriber)
+        if channel.is_idle():
+            channel.close()
+            del self._channels[game_id]
+
+    def notify(self, game_id: int) -> None:
+        channel = self._channels.get(game_id)
+        if channel is not None:
+            channel.notify()
@@ -0,0 +1,58 @@
+"""
+Event-sourced games on top of a GameStore.  Each accepted action is appended to the game's event log, and every
+snapshot_interval events the resulting state is stored too, so loading a game decodes one snapshot and replays at most
+snapshot_interval - 1 events, whether it is the current state or any earlier point of the game.
+"""
+from typing import NamedTuple, Optional, Tuple
+
+from game_store import GameStore
+from pinochle.game_codec import encode_event, decode_event, encode_game, decode_game
+from pinochle.game_events import GameEvent, GameStarted, apply_event, replay, SNAPSHOT_INTERVAL
+from pinochle.pinochle_game import PinochleGame
+
+
+class LoadedGame(NamedTuple):
+    event_count: int
+    game: PinochleGame
+
+
+class GameRepository:
+    def __init__(self, store: GameStore, snapshot_interval: int = SNAPSHOT_INTERVAL) -> None:
+        self.store = store
+        self.snapshot_interval = snapshot_interval
+
+    def start(self, started: GameStarted) -> Tuple[int, LoadedGame]:
+        """
+        Creates a game from its first event.  Returns the new game's id along with the game.
+        """
+        game_id = self.store.create()
+        return game_id, self.record(game_id, None, started)
+
+    def load(self, game_id: int, event_count: Optional[int] = None) -> LoadedGame:
+        """
+        The game after its first event_count events, or its current state.  Raises GameNotFound for an unknown game.
+        """
+        self.store.check_exists(game_id)
+        snapshot = self.store.get_snapshot(game_id, at_or_before=event_count)
+        if snapshot is None:
+            start, game = 0, None
+        else:
+            start, game = snapshot[0], decode_game(snapshot[1])
+
+        events = [decode_event(event) for event in self.store.get_events(game_id, start=start, stop=event_count)]
+        if event_count is not None and start + len(events) != event_count:
+            raise ValueError(f"Game {game_id} has {start + len(events)} events, cannot load it after {event_count}")
+        return LoadedGame(event_count=start + len(events), game=replay(events, game))
+
+    def record(self, game_id: int, loaded: Optional[LoadedGame], event: GameEvent) -> LoadedGame:
+        """
+        Applies the event to a loaded game and appends it to the log.  A move the game rejects raises its usual
+        exception, and a game that moved on since it was loaded raises EventConflict; neither writes anything.
+        """
+        event_count, game = (0, None) if loaded is None else loaded
+        game = apply_event(game, event)
+        self.store.append_event(game_id, event_count, encode_event(event))
+        event_count += 1
+        if event_count % self.snapshot_interval == 0:
+            self.store.put_snapshot(game_id, event_count, encode_game(game))
+        return LoadedGame(event_count=event_count, game=game)
@@ -0,0 +1,324 @@
+"""
+Storage for the web shell's games.  Each game is an integer id with an append-only log of its events and occasional
+snapshots of its state (see pinochle.game_events).  The store only hands out ids and keeps text, so several server
+processes can share one store.
+
+    open_game_store("memory")              one process only, lost on restart
+    open_game_store("sqlite:games.db")     SQLite in WAL mode, safe across processes
+    open_game_store("file:games.log")      an append-only log, safe across processes on one machine
+
+The web app picks one from the PINOCHLE_GAME_STORE environment variable.
+"""
+import fcntl
+import itertools
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+GAME_STORE_ENV_VAR = "PINOCHLE_GAME_STORE"
+
+_NO_LIMIT = 2**62
+
+
+class GameNotFound(KeyError):
+    pass
+
+
+class EventConflict(Exception):
+    """
+    Another writer appended an event to the game first.
+    """
+
+
+class GameStore(ABC):
+    @abstractmethod
+    def create(self) -> int:
+        """
+        Starts a new game with no events and returns its id.  Ids are unique across every process sharing the store.
+        """
+
+    @abstractmethod
+    def check_exists(self, game_id: int) -> None:
+        """
+        Raises GameNotFound unless the game was created.
+        """
+
+    @abstractmethod
+    def append_event(self, game_id: int, sequence: int, event: str) -> None:
+        """
+        Appends the event as the game's event number sequence, counting from 0.  Raises EventConflict unless the game
+        has exactly sequence events so far, which stops two writers who loaded the same state from both appending.
+        """
+
+    @abstractmethod
+    def get_events(self, game_id: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        """
+        The game's events numbered from start up to but not including stop, in order.
+        """
+
+    @abstractmethod
+    def put_snapshot(self, game_id: int, event_count: int, snapshot: str) -> None:
+        """
+        Stores the game's state after its first event_count events.
+        """
+
+    @abstractmethod
+    def get_snapshot(self, game_id: int, at_or_before: Optional[int] = None) -> Optional[Tuple[int, str]]:
+        """
+        The latest snapshot, or the latest taken at or before at_or_before events, as (event_count, snapshot).
+        """
+
+    def close(self) -> None:
+        pass
+
+
+def _latest_snapshot(snapshots: Dict[int, str], at_or_before: Optional[int]) -> Optional[Tuple[int, str]]:
+    event_counts = [count for count in snapshots if at_or_before is None or count <= at_or_before]
+    if not event_counts:
+        return None
+    event_count = max(event_counts)
+    return event_count, snapshots[event_count]
+
+
+class InMemoryGameStore(GameStore):
+    def __init__(self) -> None:
+        self._events: Dict[int, List[str]] = {}
+        self._snapshots: Dict[int, Dict[int, str]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def create(self) -> int:
+        with self._lock:
+            game_id = next(self._ids)
+            self._events[game_id] = []
+            self._snapshots[game_id] = {}
+        return game_id
+
+    def check_exists(self, game_id: int) -> None:
+        if game_id not in self._events:
+            raise GameNotFound(game_id)
+
+    def append_event(self, game_id: int, sequence: int, event: str) -> None:
+        with self._lock:
+            self.check_exists(game_id)
+            events = self._events[game_id]
+            if len(events) != sequence:
+                raise EventConflict(f"Game {game_id} has {len(events)} events, cannot append event {sequence}")
+            events.append(event)
+
+    def get_events(self, game_id: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        return self._events.get(game_id, [])[start:stop]
+
+    def put_snapshot(self, game_id: int, event_count: int, snapshot: str) -> None:
+        with self._lock:
+            self.check_exists(game_id)
+            self._snapshots[game_id][event_count] = snapshot
+
+    def get_snapshot(self, game_id: int, at_or_before: Optional[int] = None) -> Optional[Tuple[int, str]]:
+        return _latest_snapshot(self._snapshots.get(game_id, {}), at_or_before)
+
+
+class SqliteGameStore(GameStore):
+    """
+    Ids come from an INTEGER PRIMARY KEY, which SQLite allocates inside the inserting transaction.  WAL mode lets
+    readers in other processes carry on while one process writes.  Connections are pooled per store; sqlite3 keeps a
+    per-connection cache of compiled statements, so each statement below is prepared once per connection.
+    """
+
+    _CREATE_TABLES = (
+        "CREATE TABLE IF NOT EXISTS games (id INTEGER PRIMARY KEY)",
+        "CREATE TABLE IF NOT EXISTS events ("
+        " game_id INTEGER NOT NULL, sequence INTEGER NOT NULL, event TEXT NOT NULL, PRIMARY KEY (game_id, sequence))",
+        "CREATE TABLE IF NOT EXISTS snapshots ("
+        " game_id INTEGER NOT NULL, event_count INTEGER NOT NULL, snapshot TEXT NOT NULL,"
+        " PRIMARY KEY (game_id, event_count))",
+    )
+    _INSERT = "INSERT INTO games DEFAULT VALUES"
+    _SELECT = "SELECT 1 FROM games WHERE id = ?"
+    # Inserts nothing unless the game exists and has exactly the given number of events
+    _APPEND_EVENT = (
+        "INSERT INTO events (game_id, sequence, event) SELECT ?, ?, ?"
+        " WHERE EXISTS (SELECT 1 FROM games WHERE id = ?)"
+        " AND (SELECT COUNT(*) FROM events WHERE game_id = ?) = ?"
+    )
+    _SELECT_EVENTS = "SELECT event FROM events WHERE game_id = ? AND sequence >= ? AND sequence < ? ORDER BY sequence"
+    _PUT_SNAPSHOT = "INSERT OR REPLACE INTO snapshots (game_id, event_count, snapshot) VALUES (?, ?, ?)"
+    _SELECT_SNAPSHOT = (
+        "SELECT event_count, snapshot FROM snapshots WHERE game_id = ? AND event_count <= ?"
+        " ORDER BY event_count DESC LIMIT 1"
+    )
+
+    def __init__(self, path: str, pool_size: int = 4, timeout: float = 5.0) -> None:
+        self._path = path
+        self._timeout = timeout
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(self._connect())
+        with self._connection() as connection:
+            for statement in self._CREATE_TABLES:
+                connection.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path, timeout=self._timeout, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            with connection:
+                yield connection
+        finally:
+            self._pool.put(connection)
+
+    def create(self) -> int:
+        with self._connection() as connection:
+            return connection.execute(self._INSERT).lastrowid
+
+    def check_exists(self, game_id: int) -> None:
+        with self._connection() as connection:
+            row = connection.execute(self._SELECT, (game_id,)).fetchone()
+        if row is None:
+            raise GameNotFound(game_id)
+
+    def append_event(self, game_id: int, sequence: int, event: str) -> None:
+        with self._connection() as connection:
+            try:
+                cursor = connection.execute(self._APPEND_EVENT, (game_id, sequence, event, game_id, game_id, sequence))
+            except sqlite3.IntegrityError as e:
+                raise EventConflict(f"Game {game_id} already has event {sequence}") from e
+            if cursor.rowcount == 0:
+                self.check_exists(game_id)
+                raise EventConflict(f"Game {game_id} does not have {sequence} events, cannot append event {sequence}")
+
+    def get_events(self, game_id: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        stop = _NO_LIMIT if stop is None else stop
+        with self._connection() as connection:
+            return [row[0] for row in connection.execute(self._SELECT_EVENTS, (game_id, start, stop))]
+
+    def put_snapshot(self, game_id: int, event_count: int, snapshot: str) -> None:
+        self.check_exists(game_id)
+        with self._connection() as connection:
+            connection.execute(self._PUT_SNAPSHOT, (game_id, event_count, snapshot))
+
+    def get_snapshot(self, game_id: int, at_or_before: Optional[int] = None) -> Optional[Tuple[int, str]]:
+        at_or_before = _NO_LIMIT if at_or_before is None else at_or_before
+        with self._connection() as connection:
+            row = connection.execute(self._SELECT_SNAPSHOT, (game_id, at_or_before)).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def close(self) -> None:
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class AppendOnlyFileGameStore(GameStore):
+    """
+    Every write appends one JSON line to the log: a new game, an event, or a snapshot.
+    Writers hold an exclusive lock on the file while they catch up on other processes' lines and append their own,
+    which is what makes id allocation and event sequencing atomic.  Each process keeps an index of the log and reads
+    only what was appended since.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._events: Dict[int, List[str]] = {}
+        self._snapshots: Dict[int, Dict[int, str]] = {}
+        self._offset = 0
+        self._lock = threading.Lock()
+        open(path, "a").close()
+
+    @contextmanager
+    def _locked_file(self, lock_type: int) -> Iterator:
+        with self._lock, open(self._path, "r+") as file:
+            fcntl.flock(file, lock_type)
+            try:
+                self._catch_up(file)
+                yield file
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+    def _catch_up(self, file) -> None:
+        file.seek(self._offset)
+        for line in iter(file.readline, ""):
+            if not line.endswith("\n"):
+                # A line still being written by another process
+                break
+            self._index(json.loads(line))
+            self._offset = file.tell()
+
+    def _index(self, record: Dict) -> None:
+        game_id = record["id"]
+        if "event" in record:
+            self._events[game_id].append(record["event"])
+        elif "snapshot" in record:
+            self._snapshots[game_id][record["event_count"]] = record["snapshot"]
+        else:
+            self._events[game_id] = []
+            self._snapshots[game_id] = {}
+
+    def _append(self, file, record: Dict) -> None:
+        file.seek(0, os.SEEK_END)
+        file.write(json.dumps(record) + "\n")
+        file.flush()
+        os.fsync(file.fileno())
+        self._index(record)
+        self._offset = file.tell()
+
+    def _check_indexed(self, game_id: int) -> None:
+        if game_id not in self._events:
+            raise GameNotFound(game_id)
+
+    def create(self) -> int:
+        with self._locked_file(fcntl.LOCK_EX) as file:
+            game_id = max(self._events, default=-1) + 1
+            self._append(file, {"id": game_id})
+        return game_id
+
+    def check_exists(self, game_id: int) -> None:
+        with self._locked_file(fcntl.LOCK_SH):
+            self._check_indexed(game_id)
+
+    def append_event(self, game_id: int, sequence: int, event: str) -> None:
+        with self._locked_file(fcntl.LOCK_EX) as file:
+            self._check_indexed(game_id)
+            if len(self._events[game_id]) != sequence:
+                raise EventConflict(
+                    f"Game {game_id} has {len(self._events[game_id])} events, cannot append event {sequence}"
+                )
+            self._append(file, {"id": game_id, "sequence": sequence, "event": event})
+
+    def get_events(self, game_id: int, start: int = 0, stop: Optional[int] = None) -> List[str]:
+        with self._locked_file(fcntl.LOCK_SH):
+            return self._events.get(game_id, [])[start:stop]
+
+    def put_snapshot(self, game_id: int, event_count: int, snapshot: str) -> None:
+        with self._locked_file(fcntl.LOCK_EX) as file:
+            self._check_indexed(game_id)
+            self._append(file, {"id": game_id, "event_count": event_count, "snapshot": snapshot})
+
+    def get_snapshot(self, game_id: int, at_or_before: Optional[int] = None) -> Optional[Tuple[int, str]]:
+        with self._locked_file(fcntl.LOCK_SH):
+            return _latest_snapshot(self._snapshots.get(game_id, {}), at_or_before)
+
+
+def open_game_store(url: str) -> GameStore:
+    kind, _, path = url.partition(":")
+    if kind == "memory":
+        return InMemoryGameStore()
+    elif kind == "sqlite" and path:
+        return SqliteGameStore(path)
+    elif kind == "file" and path:
+        return AppendOnlyFileGameStore(path)
+    raise ValueError(f"Unknown game store {url!r}, expected memory, sqlite:<path> or file:<path>")
+
+
+def game_store_from_env() -> GameStore:
+    return open_game_store(os.environ.get(GAME_STORE_ENV_VAR, "memory"))
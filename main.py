@@ -1,25 +1,268 @@
-from typing import Tuple, Dict
+import asyncio
+import json
+import os
+import weakref
+from asyncio import Lock
+from typing import Tuple, List, Optional
 
-from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, WebSocket, Request, Response
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, validator
+from starlette.concurrency import run_in_threadpool
+
+from game_channels import GameChannels
+from game_repository import GameRepository, LoadedGame
+from game_store import game_store_from_env, GameNotFound, EventConflict
+from pinochle.bidding import InvalidBid
+from pinochle.cards import CardDeck, Card, Rank, Suit
+from pinochle.game_codec import encode_game
+from pinochle.game_deltas import public_view, seat_view
+from pinochle.game_events import (
+    GameEvent,
+    GameStarted,
+    BidPlaced,
+    BiddingPassed,
+    TrumpSelected,
+    CardsPassed,
+    CardPlayed,
+)
+from pinochle.passing_cards import IllegalPass
+from pinochle.pinochle_game import GameState
+from pinochle.play_tricks import InvalidPlay
+from pinochle.utils import InvalidCardRemoval
+from pinochle import wire_format, instrumentation
+
+# A game that another worker process changed since we loaded it is reloaded and the move retried this many times
+MAX_CONFLICT_RETRIES = 3
 
 app = FastAPI()
 
+if os.environ.get("PINOCHLE_INSTRUMENTATION", "") not in ("", "0"):
+    instrumentation.enable_instrumentation()
+
 
 class Game(BaseModel):
     players: Tuple[str, str, str, str]
 
+    @validator("players", each_item=True)
+    def name_fits_wire_format(cls, player: str) -> str:
+        if len(player.encode()) > wire_format.MAX_NAME_BYTES:
+            raise ValueError(f"Player names can be at most {wire_format.MAX_NAME_BYTES} bytes of UTF-8")
+        return player
+
+
+class CardModel(BaseModel):
+    rank: Rank
+    suit: Suit
+
+    @classmethod
+    def from_card(cls, card: Card) -> "CardModel":
+        return cls(rank=card.rank, suit=card.suit)
+
+    def to_card(self) -> Card:
+        return Card(rank=self.rank, suit=self.suit)
+
+
+class GameView(BaseModel):
+    players: Tuple[str, str, str, str]
+    state: str
+    event_count: int
+    current_player: Optional[str]
+    current_bid: int
+    bid_winner: Optional[str]
+    trump: Optional[Suit]
+    hand_sizes: Tuple[int, int, int, int]
+    current_trick: List[CardModel]
+    team_points: Tuple[int, int]
+
+
+class PlayerAction(BaseModel):
+    player: str
+
+
+class Bid(PlayerAction):
+    bid: int
+
+
+class TrumpSelection(PlayerAction):
+    trump: Suit
+
+
+class Pass(BaseModel):
+    source: str
+    destination: str
+    cards: Tuple[CardModel, CardModel, CardModel, CardModel]
+
+
+class Play(PlayerAction):
+    card: CardModel
+
+
+games = game_store_from_env()
+repository = GameRepository(games)
+channels = GameChannels(repository)
+# One lock per game in use, so moves on a game run one at a time while other games carry on.  A lock goes away once no
+# request holds or waits on it.
+_game_locks: "weakref.WeakValueDictionary[int, Lock]" = weakref.WeakValueDictionary()
+
+
+@app.on_event("shutdown")
+def close_game_store():
+    games.close()
+
 
-games: Dict[int, Game] = {}
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Call counts and latencies of the rules hot paths in this worker, for Prometheus.  Only recorded when the
+    PINOCHLE_INSTRUMENTATION environment variable is set.
+    """
+    return PlainTextResponse(instrumentation.prometheus_text(), media_type="text/plain; version=0.0.4")
 
 
-@app.get("/games/{game_id}")
-def get_game(game_id: int):
-    return games[game_id]
+@app.get("/games/{game_id}", response_model=GameView)
+async def get_game(request: Request, game_id: int):
+    """
+    The game as every player and spectator sees it.  Like the moves below, this comes in the compact binary format
+    (see pinochle.wire_format) instead of JSON when the client accepts it.
+    """
+    return _game_view(request, await _load(game_id))
+
+
+@app.get("/games/{game_id}/players/{player}/hand")
+async def get_hand(request: Request, game_id: int, player: str):
+    """
+    The player's hand, sorted.  Send "Accept: application/vnd.pinochle+binary" to get one card id byte per card
+    instead of JSON.
+    """
+    game = (await _load(game_id)).game
+    if player not in game.players:
+        raise HTTPException(status_code=404, detail=f"{player} is not playing game {game_id}")
+    hand = sorted(game.hands[game.players.index(player)])
+    if _wants_binary(request):
+        return Response(content=wire_format.encode_cards(hand), media_type=wire_format.MEDIA_TYPE)
+    return [CardModel.from_card(card) for card in hand]
+
+
+@app.get("/games/{game_id}/states/{event_count}")
+async def get_game_state(request: Request, game_id: int, event_count: int):
+    """
+    The whole game, every hand included, as it stood after event_count events, for replaying a finished game.  Comes
+    as JSON, or in the compact binary format (see pinochle.wire_format) when the client accepts it.
+    """
+    if (await _load(game_id)).game.state != GameState.COMPLETE:
+        raise HTTPException(status_code=403, detail=f"Game {game_id} is still being played")
+    try:
+        if event_count < 1:
+            raise ValueError(event_count)
+        game = (await run_in_threadpool(repository.load, game_id, event_count)).game
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} has no state after {event_count} events")
+    if _wants_binary(request):
+        return Response(content=wire_format.encode_game(game), media_type=wire_format.MEDIA_TYPE)
+    return Response(content=encode_game(game), media_type="application/json")
 
 
 @app.post("/games/")
-def new_game(game: Game):
-    game_id = len(games)
-    games[game_id] = game
+async def new_game(game: Game):
+    started = GameStarted(players=game.players, hands=CardDeck.deal())
+    game_id, _ = await run_in_threadpool(repository.start, started)
     return {"game_id": game_id}
+
+
+@app.post("/games/{game_id}/bids", response_model=GameView)
+async def bid(request: Request, game_id: int, bid: Bid):
+    return await _record(request, game_id, BidPlaced(player=bid.player, bid=bid.bid))
+
+
+@app.post("/games/{game_id}/bids/pass", response_model=GameView)
+async def pass_bidding(request: Request, game_id: int, action: PlayerAction):
+    return await _record(request, game_id, BiddingPassed(player=action.player))
+
+
+@app.post("/games/{game_id}/trump", response_model=GameView)
+async def select_trump(request: Request, game_id: int, selection: TrumpSelection):
+    return await _record(request, game_id, TrumpSelected(player=selection.player, trump=selection.trump))
+
+
+@app.post("/games/{game_id}/passes", response_model=GameView)
+async def pass_cards(request: Request, game_id: int, cards_passed: Pass):
+    cards = tuple(card.to_card() for card in cards_passed.cards)
+    return await _record(
+        request, game_id, CardsPassed(source=cards_passed.source, destination=cards_passed.destination, cards=cards)
+    )
+
+
+@app.post("/games/{game_id}/plays", response_model=GameView)
+async def play_card(request: Request, game_id: int, play: Play):
+    return await _record(request, game_id, CardPlayed(player=play.player, card=play.card.to_card()))
+
+
+@app.websocket("/games/{game_id}/updates")
+async def game_updates(websocket: WebSocket, game_id: int, player: Optional[str] = None):
+    """
+    Sends the game as this seat sees it, then a delta for every move.  Connect with ?player=<name> to take a seat and
+    see that hand, or without it to spectate.
+    """
+    await websocket.accept()
+    try:
+        channel, subscriber = await channels.subscribe(game_id, player)
+    except GameNotFound:
+        await websocket.close(code=4404)
+        return
+    try:
+        loaded = channel.loaded
+        if player is not None and player not in loaded.game.players:
+            await websocket.close(code=4404)
+            return
+        await websocket.send_text(json.dumps(seat_view(loaded.game, loaded.event_count, player)))
+
+        # Clients only listen, so a receive only ever returns when they disconnect
+        disconnected = asyncio.create_task(websocket.receive())
+        while True:
+            message = asyncio.create_task(subscriber.messages.get())
+            await asyncio.wait((message, disconnected), return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done() or message.result() is None:
+                message.cancel()
+                break
+            await websocket.send_text(message.result())
+        if not disconnected.done():
+            disconnected.cancel()
+            await websocket.close(code=subscriber.close_code)
+    finally:
+        channels.unsubscribe(game_id, subscriber)
+
+
+async def _load(game_id: int) -> LoadedGame:
+    try:
+        return await run_in_threadpool(repository.load, game_id)
+    except GameNotFound:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+
+
+async def _record(request: Request, game_id: int, event: GameEvent):
+    lock = _game_locks.setdefault(game_id, Lock())
+    async with lock:
+        for _ in range(MAX_CONFLICT_RETRIES):
+            loaded = await _load(game_id)
+            try:
+                loaded = await run_in_threadpool(repository.record, game_id, loaded, event)
+            except EventConflict:
+                continue
+            except (InvalidBid, IllegalPass, InvalidPlay, InvalidCardRemoval) as e:
+                raise HTTPException(status_code=400, detail=e.args[0])
+            channels.notify(game_id)
+            return _game_view(request, loaded)
+    raise HTTPException(status_code=409, detail=f"Game {game_id} is changing too quickly, try again")
+
+
+def _game_view(request: Request, loaded: LoadedGame):
+    if _wants_binary(request):
+        content = wire_format.encode_view(loaded.game, loaded.event_count)
+        return Response(content=content, media_type=wire_format.MEDIA_TYPE)
+    return GameView(**public_view(loaded.game, loaded.event_count))
+
+
+def _wants_binary(request: Request) -> bool:
+    accepted = (media_range.split(";")[0].strip() for media_range in request.headers.get("accept", "").split(","))
+    return wire_format.MEDIA_TYPE in accepted
@@ -0,0 +1,305 @@
+"""
+Auction simulator for tuning bidding bots:  many deals are bid out at once, each over its own BiddingState, between
+four bidding policies.
+
+Every hand's meld under every trump is scored in one vectorized call per chunk of deals, and each policy values all the
+hands it holds in one more, so what is left per deal is the bidding itself.  Each round every player still bidding
+raises by one while the bid stays within the value their policy put on the hand, and passes otherwise.  Requires numpy,
+which is an optional dependency (the "analysis" extra).
+
+The first bid rotates with the deal number, as in sim, and chunk k of a run is dealt from a generator seeded from
+(seed, k), so a run gives the same results however many worker processes share it.
+
+    python -m pinochle.analysis.auction --deals 1000000 --workers 8 --policies meld threshold monte-carlo meld
+"""
+import argparse
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import NamedTuple, Tuple, Optional, Sequence, Dict, List
+
+import numpy as np
+
+from pinochle.analysis.bid_estimator import card_trick_power
+from pinochle.batch_dealing import deal_ids, id_counts, NUM_HANDS, HAND_SIZE
+from pinochle.batch_scoring import score_meld_batch
+from pinochle.bidding import BiddingState, OPENING_BID
+from pinochle.cards import Suit, NUM_DISTINCT_CARDS, card_from_id
+from pinochle.scoring import TOTAL_TRICK_POINTS
+from pinochle.sim import SEATS, MAX_BID
+
+_SUITS = tuple(Suit)
+_SEAT_INDICES = {seat: index for index, seat in enumerate(SEATS)}
+_COPIES_PER_CARD = 2
+# Each card id's trick-taking power under each trump, as in bid_estimator.heuristic_trick_points
+_TRICK_POWER = np.array(
+    [[card_trick_power(card_from_id(id_), trump) for id_ in range(NUM_DISTINCT_CARDS)] for trump in Suit]
+)
+
+
+class HandValues(NamedTuple):
+    """
+    A policy's view of N hands:  the highest bid it would make with each, and the suit ordinal it would name as trump.
+    """
+
+    limits: np.ndarray
+    trumps: np.ndarray
+
+
+class BiddingPolicy(ABC):
+    """
+    Values hands for bidding, many at a time.  Policies must pickle to run in worker processes.
+    """
+
+    @abstractmethod
+    def value_hands(self, counts: np.ndarray, meld: np.ndarray, rng: np.random.Generator) -> HandValues:
+        """
+        counts is an N x 24 card count matrix (see batch_scoring.card_count_matrix), and meld the N x 4 matrix of each
+        hand's meld score with each suit, by ordinal, as trump.
+        """
+
+
+class ThresholdPolicy(BiddingPolicy):
+    """
+    Bids up to the same threshold whatever the hand, naming the trump with the most meld.
+    """
+
+    def __init__(self, threshold: int = 30) -> None:
+        self.threshold = threshold
+
+    def value_hands(self, counts: np.ndarray, meld: np.ndarray, rng: np.random.Generator) -> HandValues:
+        return HandValues(limits=np.full(len(counts), self.threshold), trumps=meld.argmax(axis=1))
+
+
+class MeldPolicy(BiddingPolicy):
+    """
+    Bids up to its best meld plus expected_trick_points, as sim.HeuristicPolicy does.
+    """
+
+    def __init__(self, expected_trick_points: int = 12) -> None:
+        self.expected_trick_points = expected_trick_points
+
+    def value_hands(self, counts: np.ndarray, meld: np.ndarray, rng: np.random.Generator) -> HandValues:
+        trumps = meld.argmax(axis=1)
+        return HandValues(limits=meld[np.arange(len(meld)), trumps] + self.expected_trick_points, trumps=trumps)
+
+
+class MonteCarloPolicy(BiddingPolicy):
+    """
+    Bids up to what it expects the team to make, less a margin.  Under each trump that is its own meld plus the average,
+    over num_samples random partner hands, of the partner's meld and the heuristic trick points.  A vectorized cousin of
+    bid_estimator.estimate_bid that leaves out the pass.
+    """
+
+    def __init__(self, num_samples: int = 16, margin: int = 0) -> None:
+        self.num_samples = num_samples
+        self.margin = margin
+
+    def value_hands(self, counts: np.ndarray, meld: np.ndarray, rng: np.random.Generator) -> HandValues:
+        num_hands, num_samples = len(counts), self.num_samples
+        unseen = _COPIES_PER_CARD - counts
+        unseen_ids = np.repeat(np.tile(np.arange(NUM_DISTINCT_CARDS, dtype=np.uint8), num_hands), unseen.ravel())
+        samples = np.repeat(unseen_ids.reshape(num_hands, -1), num_samples, axis=0)
+        rng.permuted(samples, axis=1, out=samples)
+
+        partner_counts = id_counts(samples[:, :HAND_SIZE]).astype(np.int16)
+        opponent_counts = np.repeat(unseen, num_samples, axis=0) - partner_counts
+        team_counts = np.repeat(counts, num_samples, axis=0) + partner_counts
+        partner_meld = _meld_by_trump(partner_counts)
+        team_power = team_counts @ _TRICK_POWER.T
+        trick_points = TOTAL_TRICK_POINTS * team_power / (team_power + opponent_counts @ _TRICK_POWER.T)
+
+        expected = meld + (partner_meld + trick_points).reshape(num_hands, num_samples, len(_SUITS)).mean(axis=1)
+        trumps = expected.argmax(axis=1)
+        limits = np.floor(expected[np.arange(num_hands), trumps]).astype(int) - self.margin
+        return HandValues(limits=limits, trumps=trumps)
+
+
+class AuctionStats(NamedTuple):
+    deals: int
+    mean_bid: float
+    # How many deals each winning bid took
+    bid_counts: Dict[int, int]
+    # Share of deals won at the opening bid, with nobody bidding
+    opening_bid_rate: float
+    mean_bids_per_deal: float
+    win_rate_by_seat: Dict[str, float]
+    trump_rate: Dict[Suit, float]
+    mean_team_meld: float
+    # The winning bid less the bidding team's meld, which the team must take in tricks
+    mean_points_needed: float
+    # Share of contracts needing more trick points than there are
+    unmakeable_rate: float
+
+
+class AuctionResults(NamedTuple):
+    """
+    One entry per deal in each array.  Seats and trumps are indices into SEATS and Suit.
+    """
+
+    first_bidders: np.ndarray
+    winners: np.ndarray
+    bids: np.ndarray
+    trumps: np.ndarray
+    team_meld: np.ndarray
+    num_bids: np.ndarray
+    elapsed: float
+
+    def deals_per_second(self) -> float:
+        return len(self.bids) / self.elapsed if self.elapsed else 0.0
+
+    def stats(self) -> AuctionStats:
+        deals = len(self.bids)
+        points_needed = self.bids - self.team_meld
+        bid_values, bid_counts = np.unique(self.bids, return_counts=True)
+        return AuctionStats(
+            deals=deals,
+            mean_bid=float(self.bids.mean()),
+            bid_counts=dict(zip(bid_values.tolist(), bid_counts.tolist())),
+            opening_bid_rate=float((self.bids == OPENING_BID).mean()),
+            mean_bids_per_deal=float(self.num_bids.mean()),
+            win_rate_by_seat={seat: float((self.winners == index).mean()) for index, seat in enumerate(SEATS)},
+            trump_rate={suit: float((self.trumps == suit.ordinal).mean()) for suit in Suit},
+            mean_team_meld=float(self.team_meld.mean()),
+            mean_points_needed=float(points_needed.mean()),
+            unmakeable_rate=float((points_needed > TOTAL_TRICK_POINTS).mean()),
+        )
+
+
+def run_auctions(first_bidders: Sequence[int], limits: np.ndarray) -> Tuple[List[BiddingState], np.ndarray]:
+    """
+    Bids out one auction per row of limits, an N x 4 matrix of the highest bid each seat will make, with the given seat
+    bidding first.  Returns the finished BiddingStates and how many bids each auction took.
+    """
+    states = [
+        BiddingState(current_bid=OPENING_BID, active_players=SEATS[first:] + SEATS[:first]) for first in first_bidders
+    ]
+    num_bids = np.zeros(len(states), dtype=int)
+    bidding = list(range(len(states)))
+    while bidding:
+        # Every auction still open takes one turn per round, with the decisions made for all of them at once
+        seats = [_SEAT_INDICES[states[deal].current_player()] for deal in bidding]
+        next_bids = np.array([states[deal].current_bid for deal in bidding]) + 1
+        raises = (next_bids <= limits[bidding, seats]).tolist()
+
+        still_bidding = []
+        for deal, seat, next_bid, raise_ in zip(bidding, seats, next_bids.tolist(), raises):
+            if raise_:
+                states[deal] = states[deal].new_bid(next_bid, SEATS[seat])
+                num_bids[deal] += 1
+            else:
+                states[deal] = states[deal].pass_bidding(SEATS[seat])
+            if states[deal].get_winner() is None:
+                still_bidding.append(deal)
+        bidding = still_bidding
+    return states, num_bids
+
+
+def simulate_auctions(
+    num_deals: int,
+    policies: Optional[Sequence[BiddingPolicy]] = None,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 10000,
+) -> AuctionResults:
+    """
+    Bids out num_deals deals with policies[i] in SEATS[i], meld bots in every seat by default.  Pass a
+    ProcessPoolExecutor as executor to spread chunks of chunk_size deals over processes; without one every chunk runs
+    in this process.
+    """
+    policies = tuple(policies or (MeldPolicy(),) * len(SEATS))
+    if len(policies) != len(SEATS):
+        raise ValueError(f"Need a policy for each of the {len(SEATS)} seats, got {len(policies)}")
+    chunks = [
+        (chunk_index, start, min(start + chunk_size, num_deals))
+        for chunk_index, start in enumerate(range(0, num_deals, chunk_size))
+    ]
+
+    start_time = time.perf_counter()
+    if executor is None:
+        results = [_auction_chunk(chunk_index, start, stop, policies, seed) for chunk_index, start, stop in chunks]
+    else:
+        futures = [
+            executor.submit(_auction_chunk, chunk_index, start, stop, policies, seed)
+            for chunk_index, start, stop in chunks
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start_time
+
+    if not results:
+        results = [tuple(np.zeros(0, dtype=int) for _ in range(6))]
+    return AuctionResults(*(np.concatenate(column) for column in zip(*results)), elapsed=elapsed)
+
+
+def _auction_chunk(
+    chunk_index: int, start: int, stop: int, policies: Sequence[BiddingPolicy], seed: int
+) -> Tuple[np.ndarray, ...]:
+    num_deals = stop - start
+    rng = np.random.default_rng([seed, chunk_index])
+    counts = id_counts(deal_ids(num_deals, rng).reshape(num_deals * NUM_HANDS, HAND_SIZE)).astype(np.int16)
+    meld = _meld_by_trump(counts)
+
+    limits = np.empty((num_deals, NUM_HANDS), dtype=int)
+    trumps = np.empty((num_deals, NUM_HANDS), dtype=int)
+    for policy in {id(policy): policy for policy in policies}.values():
+        seats = [seat for seat, seat_policy in enumerate(policies) if seat_policy is policy]
+        rows = (np.arange(num_deals)[:, None] * NUM_HANDS + seats).ravel()
+        values = policy.value_hands(counts[rows], meld[rows], rng)
+        limits[:, seats] = np.minimum(values.limits, MAX_BID).reshape(num_deals, len(seats))
+        trumps[:, seats] = values.trumps.reshape(num_deals, len(seats))
+
+    first_bidders = np.arange(start, stop) % len(SEATS)
+    states, num_bids = run_auctions(first_bidders.tolist(), limits)
+    winners = np.array([_SEAT_INDICES[state.get_winner()] for state in states], dtype=int)
+    bids = np.array([state.current_bid for state in states], dtype=int)
+    deals = np.arange(num_deals)
+    contract_trumps = trumps[deals, winners]
+    team_meld = (
+        meld[deals * NUM_HANDS + winners, contract_trumps]
+        + meld[deals * NUM_HANDS + (winners + 2) % NUM_HANDS, contract_trumps]
+    )
+    return first_bidders, winners, bids, contract_trumps, team_meld, num_bids
+
+
+def _meld_by_trump(counts: np.ndarray) -> np.ndarray:
+    """
+    Each hand's meld score with each suit as trump, as an N x 4 matrix, scored in one batch.
+    """
+    trumps = np.tile(np.arange(len(_SUITS)), len(counts))
+    return score_meld_batch(np.repeat(counts, len(_SUITS), axis=0), trumps).reshape(len(counts), len(_SUITS))
+
+
+_POLICIES = {"threshold": ThresholdPolicy, "meld": MeldPolicy, "monte-carlo": MonteCarloPolicy}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bid out many deals between bidding bots and report the contracts")
+    parser.add_argument("--deals", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument(
+        "--policies", nargs=len(SEATS), choices=sorted(_POLICIES), default=["meld"] * len(SEATS), metavar="POLICY"
+    )
+    args = parser.parse_args()
+
+    policies = [_POLICIES[name]() for name in args.policies]
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            results = simulate_auctions(args.deals, policies, args.seed, executor, args.chunk_size)
+    else:
+        results = simulate_auctions(args.deals, policies, args.seed, chunk_size=args.chunk_size)
+
+    stats = results.stats()
+    print(f"{stats.deals} deals in {results.elapsed:.2f}s, {results.deals_per_second():.0f} deals/s")
+    print(f"mean winning bid {stats.mean_bid:.2f}, {stats.mean_bids_per_deal:.2f} bids per deal")
+    print(f"won at the opening bid {stats.opening_bid_rate:.1%}")
+    for seat, policy_name in zip(SEATS, args.policies):
+        print(f"  {seat:6s} {policy_name:12s} wins {stats.win_rate_by_seat[seat]:.1%}")
+    print(f"mean team meld {stats.mean_team_meld:.2f}, trick points needed {stats.mean_points_needed:.2f}")
+    print(f"contracts needing more than {TOTAL_TRICK_POINTS} trick points {stats.unmakeable_rate:.1%}")
+    print("trump " + ", ".join(f"{suit.name.lower()} {rate:.1%}" for suit, rate in stats.trump_rate.items()))
+
+
+if __name__ == "__main__":
+    main()
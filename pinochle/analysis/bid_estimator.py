@@ -0,0 +1,245 @@
+"""
+Monte-Carlo bid estimation:  deal the unseen cards out many ways and average what the bidding team would make under
+each trump suit, meld plus trick points.
+"""
+import os
+import random
+import time
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from typing import NamedTuple, Dict, Tuple, Optional, Callable, List
+
+from pinochle.cards import Card, CardDeck, Suit, Rank
+from pinochle.passing_cards import PassingCards
+from pinochle.scoring import MeldCounter, TOTAL_TRICK_POINTS
+from pinochle.utils import remove_cards_from_hand
+
+HAND_SIZE = 12
+PASS_SIZE = 4
+# Workers stop sampling once this share of a time budget is spent, leaving the rest to get their results back
+WORKER_SHARE_OF_BUDGET = 0.8
+
+TrickPointsEstimator = Callable[[Tuple[Card, ...], Tuple[Card, ...], Suit], float]
+
+
+class BidEstimate(NamedTuple):
+    trump: Suit
+    meld: float
+    trick_points: float
+    samples: int
+
+    def total(self) -> float:
+        return self.meld + self.trick_points
+
+
+class _SampleTotals(NamedTuple):
+    samples: int
+    meld: Tuple[float, ...]
+    trick_points: Tuple[float, ...]
+
+
+def heuristic_trick_points(team_cards: Tuple[Card, ...], opponent_cards: Tuple[Card, ...], trump: Suit) -> float:
+    """
+    A cheap stand-in for playing the hand out:  the bidding team's share of the trick points follows its share of
+    trick-taking power, where trump outweighs off-suit aces, which outweigh everything else.
+    """
+    team_power = _trick_power(team_cards, trump)
+    opponent_power = _trick_power(opponent_cards, trump)
+    return TOTAL_TRICK_POINTS * team_power / (team_power + opponent_power)
+
+
+def _trick_power(cards: Tuple[Card, ...], trump: Suit) -> float:
+    return sum(card_trick_power(card, trump) for card in cards)
+
+
+def card_trick_power(card: Card, trump: Suit) -> float:
+    if card.suit is trump:
+        return 3 + card.rank.ordinal / 5
+    elif card.rank is Rank.ACE:
+        return 2
+    elif card.rank is Rank.TEN:
+        return 1
+    return 0.25
+
+
+def estimate_bid(
+    hand: Tuple[Card, ...],
+    num_samples: int = 1000,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+    time_budget: Optional[float] = None,
+    chunk_size: int = 100,
+    trick_points_estimator: TrickPointsEstimator = heuristic_trick_points,
+    num_workers: Optional[int] = None,
+) -> Dict[Suit, BidEstimate]:
+    """
+    Estimates what the bidding team makes under each trump if this 12-card hand wins the bid.
+
+    Samples are split into chunks of chunk_size, each seeded from (seed, chunk index), so results do not depend on how
+    many workers run them.  Pass a long-lived ProcessPoolExecutor as executor to spread the chunks over processes, and
+    its size as num_workers (one worker per CPU if not given); without one the chunks run in this process.  With a time_budget (seconds) sampling stops once the budget is spent
+    and the estimate covers whatever samples finished, always at least one.
+    """
+    if len(hand) != HAND_SIZE:
+        raise ValueError(f"Bid estimates need a {HAND_SIZE}-card hand, got {len(hand)}")
+    start_time = time.monotonic()
+    deadline = None if time_budget is None else start_time + time_budget
+    chunks = [
+        (chunk_index, min(chunk_size, num_samples - start))
+        for chunk_index, start in enumerate(range(0, num_samples, chunk_size))
+    ]
+
+    if executor is None:
+        totals = []
+        for chunk_index, size in chunks:
+            totals.append(_sample_chunk(hand, seed, chunk_index, size, deadline, trick_points_estimator))
+            if _past(deadline):
+                break
+        return _combine(totals)
+
+    worker_deadline = None if time_budget is None else start_time + time_budget * WORKER_SHARE_OF_BUDGET
+    return _combine(
+        _sample_on_executor(
+            executor,
+            num_workers or os.cpu_count() or 1,
+            hand,
+            seed,
+            chunks,
+            deadline,
+            worker_deadline,
+            trick_points_estimator,
+        )
+    )
+
+
+def best_bid(estimates: Dict[Suit, BidEstimate]) -> BidEstimate:
+    return max(estimates.values(), key=lambda estimate: estimate.total())
+
+
+def _past(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _sample_on_executor(
+    executor: Executor,
+    num_workers: int,
+    hand: Tuple[Card, ...],
+    seed: int,
+    chunks: List[Tuple[int, int]],
+    deadline: Optional[float],
+    worker_deadline: Optional[float],
+    trick_points_estimator: TrickPointsEstimator,
+) -> List[_SampleTotals]:
+    """
+    Keeps one chunk running for each of num_workers workers, handing out the next as each finishes, so no chunk waits in the executor's
+    queue while the budget runs down.  Workers stop at worker_deadline and send back what they have, which leaves the
+    rest of the budget to collect it.  Chunks are combined in chunk order, so the sums do not depend on which worker
+    finished first.
+    """
+    remaining = iter(chunks)
+    running: Dict[Future, int] = {}
+    finished: Dict[int, _SampleTotals] = {}
+
+    def submit_next() -> None:
+        chunk = next(remaining, None)
+        if chunk is not None:
+            chunk_index, size = chunk
+            future = executor.submit(
+                _sample_chunk, hand, seed, chunk_index, size, worker_deadline, trick_points_estimator
+            )
+            running[future] = chunk_index
+
+    for _ in range(num_workers):
+        submit_next()
+    while running:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            if finished:
+                break
+            # Nothing came back in time, say while the pool started up, so wait for the first chunk.  Its worker is
+            # past its deadline and stops after one sample.
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            finished[running.pop(future)] = future.result()
+            if not _past(worker_deadline):
+                submit_next()
+
+    for future in running:
+        future.cancel()
+    return [finished[chunk_index] for chunk_index in sorted(finished)]
+
+
+def _sample_chunk(
+    hand: Tuple[Card, ...],
+    seed: int,
+    chunk_index: int,
+    num_samples: int,
+    deadline: Optional[float],
+    trick_points_estimator: TrickPointsEstimator,
+) -> _SampleTotals:
+    rng = random.Random(f"{seed}:{chunk_index}")
+    unseen = remove_cards_from_hand(CardDeck.all_cards(), hand)
+    meld = [0.0] * len(Suit)
+    trick_points = [0.0] * len(Suit)
+
+    samples = 0
+    while samples < num_samples:
+        dealt = rng.sample(unseen, k=len(unseen))
+        partner_hand = tuple(dealt[:HAND_SIZE])
+        opponent_cards = tuple(dealt[HAND_SIZE:])
+        for trump in Suit:
+            passed = _exchange_passes(hand, partner_hand, trump)
+            meld[trump.ordinal] += _meld(passed.bid_winner_hand, trump) + _meld(passed.partner_hand, trump)
+            trick_points[trump.ordinal] += trick_points_estimator(
+                passed.bid_winner_hand + passed.partner_hand, opponent_cards, trump
+            )
+        samples += 1
+        if _past(deadline):
+            break
+
+    return _SampleTotals(samples=samples, meld=tuple(meld), trick_points=tuple(trick_points))
+
+
+def _exchange_passes(bid_winner_hand: Tuple[Card, ...], partner_hand: Tuple[Card, ...], trump: Suit) -> PassingCards:
+    passing = PassingCards(
+        bid_winner="bid_winner", partner="partner", bid_winner_hand=bid_winner_hand, partner_hand=partner_hand
+    )
+    passing = passing.pass_cards(
+        source="partner", destination="bid_winner", cards=_best_cards_to_pass(partner_hand, trump)
+    )
+    return passing.pass_cards(
+        source="bid_winner",
+        destination="partner",
+        cards=_worst_cards_to_keep(passing.bid_winner_hand, trump),
+    )
+
+
+def _pass_priority(card: Card, trump: Suit) -> Tuple[bool, bool, int]:
+    return card.suit is trump, card.rank is Rank.ACE, card.rank.ordinal
+
+
+def _best_cards_to_pass(hand: Tuple[Card, ...], trump: Suit) -> Tuple[Card, ...]:
+    return tuple(sorted(hand, key=lambda card: _pass_priority(card, trump), reverse=True)[:PASS_SIZE])
+
+
+def _worst_cards_to_keep(hand: Tuple[Card, ...], trump: Suit) -> Tuple[Card, ...]:
+    return tuple(sorted(hand, key=lambda card: _pass_priority(card, trump))[:PASS_SIZE])
+
+
+def _meld(hand: Tuple[Card, ...], trump: Suit) -> int:
+    return MeldCounter(hand=hand, trump=trump).count().score()
+
+
+def _combine(totals: List[_SampleTotals]) -> Dict[Suit, BidEstimate]:
+    samples = sum(total.samples for total in totals)
+    estimates = {}
+    for trump in Suit:
+        meld = sum(total.meld[trump.ordinal] for total in totals)
+        trick_points = sum(total.trick_points[trump.ordinal] for total in totals)
+        estimates[trump] = BidEstimate(
+            trump=trump,
+            meld=meld / samples if samples else 0.0,
+            trick_points=trick_points / samples if samples else 0.0,
+            samples=samples,
+        )
+    return estimates
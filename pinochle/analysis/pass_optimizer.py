@@ -0,0 +1,238 @@
+"""
+Pass selection:  which four cards to pass, searched over every distinct pass rather than picked by a fixed rule.
+
+A pass is scored as the meld left in the passer's hand plus trick-taking power (see bid_estimator.card_trick_power),
+weighted by direction.  The partner is credited with the power it hands the bid winner, and the bid winner with the
+power it keeps.
+
+The search takes cards in a fixed order and never goes back to an earlier one, so each distinct multiset of cards is
+tried once and identical copies are never tried twice.  The suit signatures of the cards left are updated as cards are
+taken, so scoring a node is four table lookups.  Meld never rises as cards leave a hand, which gives an upper bound for
+every pass below a node, and branches that cannot beat the k-th best pass found so far are pruned.
+"""
+import heapq
+import time
+from typing import NamedTuple, Tuple, List, Optional
+
+from pinochle.analysis.bid_estimator import card_trick_power, HAND_SIZE, PASS_SIZE
+from pinochle.cards import Card, Suit, NUM_DISTINCT_CARDS, NUM_RANKS, card_from_id
+from pinochle.compact_hand import CompactHand, Hand, SLOT_BITS
+from pinochle.passing_cards import PassingCards, IllegalPass
+from pinochle.scoring import suit_meld, score_suit_melds
+
+DEFAULT_TIME_BUDGET = 0.005
+_CHECK_CLOCK_EVERY = 64
+# Slack for float rounding when comparing bounds to scores
+_EPSILON = 1e-9
+_SUIT_OF = tuple(id_ // NUM_RANKS for id_ in range(NUM_DISTINCT_CARDS))
+_SLOT_OF = tuple(1 << ((id_ % NUM_RANKS) * SLOT_BITS) for id_ in range(NUM_DISTINCT_CARDS))
+_TRICK_POWER = tuple(
+    tuple(card_trick_power(card_from_id(id_), trump) for id_ in range(NUM_DISTINCT_CARDS)) for trump in Suit
+)
+
+
+class PassObjective(NamedTuple):
+    """
+    Weights of the trick-taking power kept and passed, added to the meld left in the passer's hand.  Weights must not be
+    negative, or pruning could drop the best pass.
+    """
+
+    kept_power: float
+    passed_power: float
+
+
+TO_BID_WINNER = PassObjective(kept_power=0.0, passed_power=1.0)
+TO_PARTNER = PassObjective(kept_power=1.0, passed_power=0.0)
+
+
+class PassCandidate(NamedTuple):
+    cards: Tuple[Card, Card, Card, Card]
+    score: float
+    # The meld left in the passer's hand
+    meld: int
+
+
+class PassSearch(NamedTuple):
+    # Best first
+    candidates: Tuple[PassCandidate, ...]
+    # False if the time budget ran out first, in which case candidates are the best of the passes searched
+    complete: bool
+    nodes: int
+
+
+class SuggestedPasses(NamedTuple):
+    source: str
+    destination: str
+    search: PassSearch
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+def best_passes(
+    hand: Hand,
+    trump: Suit,
+    objective: PassObjective = TO_BID_WINNER,
+    top_k: int = 1,
+    time_budget: Optional[float] = DEFAULT_TIME_BUDGET,
+) -> PassSearch:
+    """
+    The top_k distinct passes from hand under the objective.  time_budget is in seconds, or None to always finish.
+    """
+    if objective.kept_power < 0 or objective.passed_power < 0:
+        raise ValueError(f"Objective weights must not be negative, got {objective}")
+    if top_k < 1:
+        raise ValueError(f"top_k must be at least 1, got {top_k}")
+    compact_hand = hand if isinstance(hand, CompactHand) else CompactHand.from_cards(hand)
+    if len(compact_hand) < PASS_SIZE:
+        raise ValueError(f"Need at least {PASS_SIZE} cards to pass, got {len(compact_hand)}")
+    return _PassSearcher(compact_hand, trump, objective, top_k, time_budget).search()
+
+
+def suggest_passes(
+    passing: PassingCards, trump: Suit, top_k: int = 1, time_budget: Optional[float] = DEFAULT_TIME_BUDGET
+) -> SuggestedPasses:
+    """
+    Searches whichever pass is due:  the partner's to the bid winner while both hold 12 cards, then the bid winner's
+    back to the partner.  Hand sizes are all there is to go on, so once both passes are made the first looks due again.
+    """
+    bid_winner_size, partner_size = len(passing.bid_winner_hand), len(passing.partner_hand)
+    if bid_winner_size == HAND_SIZE and partner_size == HAND_SIZE:
+        search = best_passes(passing.partner_hand, trump, TO_BID_WINNER, top_k, time_budget)
+        return SuggestedPasses(source=passing.partner, destination=passing.bid_winner, search=search)
+    if bid_winner_size == HAND_SIZE + PASS_SIZE and partner_size == HAND_SIZE - PASS_SIZE:
+        search = best_passes(passing.bid_winner_hand, trump, TO_PARTNER, top_k, time_budget)
+        return SuggestedPasses(source=passing.bid_winner, destination=passing.partner, search=search)
+    raise IllegalPass(
+        f"No pass is due with {bid_winner_size} cards for the bid winner and {partner_size} for the partner"
+    )
+
+
+class _PassSearcher:
+    def __init__(
+        self, hand: CompactHand, trump: Suit, objective: PassObjective, top_k: int, time_budget: Optional[float]
+    ) -> None:
+        self.trump = trump
+        self.kept_weight, self.passed_weight = objective
+        self.top_k = top_k
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.power = _TRICK_POWER[trump.ordinal]
+        self.counts = list(hand.counts())
+        self.signatures = list(hand.suit_signatures())
+        self.suits = [suit_meld(signature) for signature in self.signatures]
+        self.kept_power = sum(self.power[id_] * copies for id_, copies in enumerate(self.counts))
+        self.passed_power = 0.0
+        self.taken: List[int] = []
+        # (score, -order found, card ids, meld), so that the worst pass, and of equal ones the latest found, is first
+        self.heap: List[Tuple[float, int, Tuple[int, ...], int]] = []
+        self.nodes = 0
+        self.next_clock_check = _CHECK_CLOCK_EVERY
+
+        # Cards that cost the least to pass come first, so good passes are found early and prune more
+        self.ids = sorted((id_ for id_ in range(NUM_DISTINCT_CARDS) if self.counts[id_]), key=self._cost_to_pass)
+        weights = [self.power[id_] for id_ in self.ids]
+        self.suffix_max_power = [max(weights[position:]) for position in range(len(weights))]
+        self.suffix_min_power = [min(weights[position:]) for position in range(len(weights))]
+
+    def search(self) -> PassSearch:
+        try:
+            self._search(0, PASS_SIZE)
+            complete = True
+        except _OutOfTime:
+            complete = False
+        candidates = tuple(
+            PassCandidate(cards=tuple(card_from_id(id_) for id_ in sorted(ids)), score=score, meld=meld)
+            for score, _, ids, meld in sorted(self.heap, reverse=True)
+        )
+        return PassSearch(candidates=candidates, complete=complete, nodes=self.nodes)
+
+    def _cost_to_pass(self, id_: int) -> float:
+        """
+        The meld given up by passing the card, less its trick power weighted by direction.
+        """
+        self._take(id_)
+        cost = -score_suit_melds(self.suits, self.trump) + (self.kept_weight - self.passed_weight) * self.power[id_]
+        self._put_back(id_)
+        return cost
+
+    def _search(self, start: int, remaining: int) -> None:
+        """
+        Takes the remaining cards, in every way that starts from position start of the card order.  Cards are taken
+        and put back inline, and the last card's passes are scored here rather than a level down, since this loop is
+        where nearly all the time goes.
+        """
+        self.nodes += 1
+        # The clock is not checked until a pass has been found, so running out of time still suggests one
+        if self.deadline is not None and self.heap and self.nodes >= self.next_clock_check:
+            if time.perf_counter() > self.deadline:
+                raise _OutOfTime()
+            self.next_clock_check = self.nodes + _CHECK_CLOCK_EVERY
+        ids, counts, signatures, suits, power, trump = (
+            self.ids,
+            self.counts,
+            self.signatures,
+            self.suits,
+            self.power,
+            self.trump,
+        )
+        kept_weight, passed_weight = self.kept_weight, self.passed_weight
+        heap, top_k = self.heap, self.top_k
+        # Meld never rises as cards leave, so the meld held now caps every pass below this node
+        meld_cap = None
+
+        for position in range(start, len(ids)):
+            id_ = ids[position]
+            if not counts[id_]:
+                continue
+            if len(heap) == top_k:
+                if meld_cap is None:
+                    meld_cap = score_suit_melds(suits, trump)
+                bound = (
+                    meld_cap
+                    + kept_weight * (self.kept_power - remaining * self.suffix_min_power[position])
+                    + passed_weight * (self.passed_power + remaining * self.suffix_max_power[position])
+                )
+                if bound <= heap[0][0] + _EPSILON:
+                    return
+            suit = _SUIT_OF[id_]
+            signature, suit_meld_before = signatures[suit], suits[suit]
+            counts[id_] -= 1
+            signatures[suit] = signature - _SLOT_OF[id_]
+            suits[suit] = suit_meld(signatures[suit])
+            self.kept_power -= power[id_]
+            self.passed_power += power[id_]
+            self.taken.append(id_)
+
+            if remaining == 1:
+                self.nodes += 1
+                meld = score_suit_melds(suits, trump)
+                self._offer(meld + kept_weight * self.kept_power + passed_weight * self.passed_power, meld)
+            else:
+                # Starting again from this card lets a second copy be taken, without ever taking cards out of order
+                self._search(position, remaining - 1)
+
+            self.taken.pop()
+            self.kept_power += power[id_]
+            self.passed_power -= power[id_]
+            signatures[suit], suits[suit] = signature, suit_meld_before
+            counts[id_] += 1
+
+    def _take(self, id_: int) -> None:
+        suit = _SUIT_OF[id_]
+        self.counts[id_] -= 1
+        self.signatures[suit] -= _SLOT_OF[id_]
+        self.suits[suit] = suit_meld(self.signatures[suit])
+
+    def _put_back(self, id_: int) -> None:
+        suit = _SUIT_OF[id_]
+        self.counts[id_] += 1
+        self.signatures[suit] += _SLOT_OF[id_]
+        self.suits[suit] = suit_meld(self.signatures[suit])
+
+    def _offer(self, score: float, meld: int) -> None:
+        entry = (score, -self.nodes, tuple(self.taken), meld)
+        if len(self.heap) < self.top_k:
+            heapq.heappush(self.heap, entry)
+        elif score > self.heap[0][0] + _EPSILON:
+            heapq.heapreplace(self.heap, entry)
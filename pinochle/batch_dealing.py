@@ -0,0 +1,67 @@
+"""
+Many deals at once, shuffled in a single vectorized step over an N x 48 matrix of card ids.  Requires numpy, which is
+an optional dependency (the "analysis" extra).
+"""
+from typing import Iterator, Tuple, Union
+
+import numpy as np
+
+from pinochle.cards import Card, CardDeck, NUM_DISTINCT_CARDS, card_id, card_from_id
+from pinochle.compact_hand import CompactHand, SLOT_BITS
+
+NUM_HANDS = 4
+HAND_SIZE = 12
+
+_DECK_IDS = np.array([card_id(card) for card in CardDeck.all_cards()], dtype=np.uint8)
+_CARDS = np.array([card_from_id(id_) for id_ in range(NUM_DISTINCT_CARDS)], dtype=object)
+
+Deal = Tuple[Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...]]
+CompactDeal = Tuple[CompactHand, CompactHand, CompactHand, CompactHand]
+
+
+def deal_ids(n: int, seed: Union[int, np.random.Generator, None] = None) -> np.ndarray:
+    """
+    Returns an n x 4 x 12 matrix of card ids (see cards.card_id), one shuffled deck per deal.  The same seed always
+    gives the same deals.
+    """
+    rng = np.random.default_rng(seed)
+    decks = np.tile(_DECK_IDS, (n, 1))
+    rng.permuted(decks, axis=1, out=decks)
+    return decks.reshape(n, NUM_HANDS, HAND_SIZE)
+
+
+def deal_many(
+    n: int, seed: Union[int, np.random.Generator, None] = None, compact: bool = False
+) -> Iterator[Union[Deal, CompactDeal]]:
+    """
+    Yields n deals of four hands, as tuples of cards in dealt order or, with compact=True, as CompactHands.
+    """
+    ids = deal_ids(n, seed)
+    if compact:
+        yield from _compact_deals(ids)
+    else:
+        for deal in _CARDS[ids].tolist():
+            yield tuple(deal[0]), tuple(deal[1]), tuple(deal[2]), tuple(deal[3])
+
+
+def id_counts(ids: np.ndarray) -> np.ndarray:
+    """
+    Turns an N x k matrix of card ids, one hand per row, into an N x 24 card count matrix (see
+    batch_scoring.card_count_matrix).
+    """
+    num_hands = ids.shape[0]
+    slots = ids + np.arange(num_hands)[:, None] * NUM_DISTINCT_CARDS
+    counts = np.bincount(slots.ravel(), minlength=num_hands * NUM_DISTINCT_CARDS).astype(np.uint8)
+    return counts.reshape(num_hands, NUM_DISTINCT_CARDS)
+
+
+def _compact_deals(ids: np.ndarray) -> Iterator[CompactDeal]:
+    counts = id_counts(ids.reshape(ids.shape[0] * NUM_HANDS, HAND_SIZE))
+    packed = (counts[:, 0::2] | (counts[:, 1::2] << SLOT_BITS)).tobytes()
+    row_bytes = NUM_DISTINCT_CARDS * SLOT_BITS // 8
+    compact = [
+        CompactHand(int.from_bytes(packed[start : start + row_bytes], "little"))
+        for start in range(0, len(packed), row_bytes)
+    ]
+    for start in range(0, len(compact), NUM_HANDS):
+        yield compact[start], compact[start + 1], compact[start + 2], compact[start + 3]
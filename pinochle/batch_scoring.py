@@ -0,0 +1,146 @@
+"""
+Meld scoring for many hands at once, vectorized over an N x 24 card count matrix.  Requires numpy, which is an
+optional dependency (the "analysis" extra).
+"""
+from typing import Iterable, Sequence, Union
+
+import numpy as np
+
+from pinochle.cards import Suit, Rank, NUM_DISTINCT_CARDS, NUM_RANKS, card_id
+from pinochle.compact_hand import CompactHand, Hand, SLOT_BITS, SLOT_MASK
+from pinochle.scoring import Meld
+
+_NUM_SUITS = NUM_DISTINCT_CARDS // NUM_RANKS
+_PACKED_BYTES = NUM_DISTINCT_CARDS * SLOT_BITS // 8
+
+_NINE = Rank.NINE.ordinal
+_JACK = Rank.JACK.ordinal
+_QUEEN = Rank.QUEEN.ordinal
+_KING = Rank.KING.ordinal
+_ACE = Rank.ACE.ordinal
+
+_SCORE_WITH_10X_FOR_DOUBLE = {
+    base_score: np.array([0, base_score, 10 * base_score]) for base_score in (4, 6, 8, 10, 15)
+}
+_PINOCHLE_SCORES = np.array([0, 4, 30])
+
+Hands = Union[np.ndarray, Iterable[Hand]]
+Trumps = Union[Suit, Sequence[Suit], np.ndarray]
+
+
+def card_count_matrix(hands: Iterable[Hand]) -> np.ndarray:
+    """
+    Returns an N x 24 matrix where column i counts the copies of the card with id i (see cards.card_id).
+    """
+    hands = list(hands)
+    if hands and all(isinstance(hand, CompactHand) for hand in hands):
+        return _unpack_compact_hands(hands)
+
+    rows = [row for row, hand in enumerate(hands) for _ in hand]
+    ids = [card_id(card) for hand in hands for card in hand]
+    counts = np.zeros((len(hands), NUM_DISTINCT_CARDS), dtype=np.int16)
+    np.add.at(counts, (rows, ids), 1)
+    return counts
+
+
+def _unpack_compact_hands(hands: Sequence[CompactHand]) -> np.ndarray:
+    packed = np.frombuffer(b"".join(hand.bits.to_bytes(_PACKED_BYTES, "little") for hand in hands), dtype=np.uint8)
+    packed = packed.reshape(len(hands), _PACKED_BYTES)
+    counts = np.empty((len(hands), NUM_DISTINCT_CARDS), dtype=np.int16)
+    counts[:, 0::2] = packed & SLOT_MASK
+    counts[:, 1::2] = packed >> SLOT_BITS
+    return counts
+
+
+def meld_batch(hands: Hands, trumps: Trumps) -> np.ndarray:
+    """
+    Counts every Meld field for each hand.  Returns an N x 9 matrix whose columns follow the Meld field order.
+
+    hands is either an N x 24 count matrix (see card_count_matrix) or an iterable of hands.  trumps is a single suit for
+    every hand, one suit per hand, or an array of one suit ordinal per hand.
+    """
+    counts = hands if isinstance(hands, np.ndarray) else card_count_matrix(hands)
+    by_suit = counts.reshape(-1, _NUM_SUITS, NUM_RANKS)
+    num_hands = by_suit.shape[0]
+    rows = np.arange(num_hands)
+    trump_indices = _trump_indices(trumps, num_hands)
+
+    trump_counts = by_suit[rows, trump_indices]
+    marriages = np.minimum(by_suit[:, :, _QUEEN], by_suit[:, :, _KING])
+    marriages_in_trump = marriages[rows, trump_indices]
+    runs_in_trump = trump_counts[:, _JACK:].min(axis=1)
+    around = by_suit.min(axis=1)
+
+    return np.stack(
+        [
+            trump_counts[:, _NINE],
+            marriages.sum(axis=1) - marriages_in_trump,
+            marriages_in_trump - runs_in_trump,
+            around[:, _JACK],
+            around[:, _QUEEN],
+            around[:, _KING],
+            around[:, _ACE],
+            runs_in_trump,
+            np.minimum(
+                by_suit[:, Suit.DIAMONDS.ordinal, _JACK],
+                by_suit[:, Suit.SPADES.ordinal, _QUEEN],
+            ),
+        ],
+        axis=1,
+    )
+
+
+def _trump_indices(trumps: Trumps, num_hands: int) -> np.ndarray:
+    if isinstance(trumps, Suit):
+        return np.full(num_hands, trumps.ordinal)
+    if isinstance(trumps, np.ndarray):
+        if trumps.shape != (num_hands,):
+            raise ValueError(f"Expected {num_hands} trump suits, got an array of shape {trumps.shape}")
+        return trumps
+    if len(trumps) != num_hands:
+        raise ValueError(f"Expected {num_hands} trump suits, got {len(trumps)}")
+    return np.fromiter((trump.ordinal for trump in trumps), dtype=np.intp, count=num_hands)
+
+
+def score_meld_batch(hands: Hands, trumps: Trumps) -> np.ndarray:
+    """
+    Vectorized equivalent of scoring.score_meld for many hands.  Returns one score per hand.
+    """
+    meld = meld_batch(hands, trumps)
+    (
+        nines_of_trump,
+        non_trump_marriages,
+        trump_marriages,
+        jacks_around,
+        queens_around,
+        kings_around,
+        aces_around,
+        runs_in_trump,
+        pinochles,
+    ) = meld.T
+
+    return (
+        nines_of_trump
+        + 2 * non_trump_marriages
+        + 4 * trump_marriages
+        + _score_with_10x_for_double(jacks_around, 4)
+        + _score_with_10x_for_double(queens_around, 6)
+        + _score_with_10x_for_double(kings_around, 8)
+        + _score_with_10x_for_double(aces_around, 10)
+        + _score_with_10x_for_double(runs_in_trump, 15)
+        + _lookup_score(pinochles, _PINOCHLE_SCORES, "Pinochles")
+    )
+
+
+def _score_with_10x_for_double(counts: np.ndarray, base_score: int) -> np.ndarray:
+    return _lookup_score(counts, _SCORE_WITH_10X_FOR_DOUBLE[base_score], "Count")
+
+
+def _lookup_score(counts: np.ndarray, scores: np.ndarray, name: str) -> np.ndarray:
+    if counts.size and counts.max() >= len(scores):
+        raise ValueError(f"{name} should always be 0, 1, or 2.  Got {counts.max()}")
+    return scores[counts]
+
+
+def meld_from_row(row: Sequence[int]) -> Meld:
+    return Meld(*(int(count) for count in row))
@@ -2,6 +2,9 @@ from typing import NamedTuple, Tuple, Optional
 
 from pinochle.cards import Suit
 
+# The bid that stands when every player but one passes without bidding
+OPENING_BID = 24
+
 
 class InvalidBid(Exception):
     pass
@@ -16,7 +19,12 @@ class BiddingState(NamedTuple):
     def new_bid(self, bid: int, player: str) -> "BiddingState":
         self._validate_bid(bid, player)
 
-        return self._replace(current_bid=bid, current_player_index=self._get_next_bidder_index())
+        return BiddingState(
+            current_bid=bid,
+            active_players=self.active_players,
+            current_player_index=self._get_next_bidder_index(),
+            trump=self.trump,
+        )
 
     def _validate_bid(self, bid, player):
         self._validate_player_can_bid(player=player)
@@ -40,9 +48,14 @@ class BiddingState(NamedTuple):
     def pass_bidding(self, player: str) -> "BiddingState":
         self._validate_player_can_bid(player=player)
 
-        return self._replace(
-            active_players=tuple(p for p in self.active_players if p != player),
+        # The player passing is always the current player, so they can be sliced out by index
+        index = self.current_player_index
+        active_players = self.active_players[:index] + self.active_players[index + 1 :]
+        return BiddingState(
+            current_bid=self.current_bid,
+            active_players=active_players,
             current_player_index=self._get_next_bidder_index_when_passing(),
+            trump=self.trump,
         )
 
     def _get_next_bidder_index_when_passing(self):
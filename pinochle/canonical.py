@@ -0,0 +1,127 @@
+"""
+Canonical forms for hands and deals, so that analysis results can be cached once for every equivalent position.
+
+Cards within a hand are unordered, so a canonical hand is its CompactHand count vector.  Suits are interchangeable
+up to a point:  trump always keeps its label, and for meld diamonds and spades do too, since a pinochle is the jack of
+diamonds with the queen of spades.  With preserve_meld=False (trick play only, as in the solver) every non-trump suit
+may be relabeled.  Among the allowed relabelings the canonical one gives the smallest hands, compared seat by seat.
+
+Hashes are 64-bit blake2b digests of the canonical form, so they are the same in every process and across runs,
+unlike hash().
+"""
+import functools
+import hashlib
+import itertools
+from typing import NamedTuple, Tuple, Optional, Iterable
+
+from pinochle.cards import Card, Suit, NUM_RANKS, card_id, card_from_id
+from pinochle.compact_hand import CompactHand, Hand, SUIT_BITS, SUIT_MASK
+
+Permutation = Tuple[int, int, int, int]
+
+_SUITS = tuple(Suit)
+_MELD_FIXED_SUITS = frozenset((Suit.DIAMONDS.ordinal, Suit.SPADES.ordinal))
+_NO_TRUMP = len(_SUITS)
+_HAND_BYTES = len(_SUITS) * SUIT_BITS // 8
+
+
+class CanonicalDeal(NamedTuple):
+    """
+    A deal relabeled into canonical form.  permutation[s] is the canonical suit ordinal for original suit ordinal s.
+    """
+
+    hands: Tuple[CompactHand, ...]
+    trump: Optional[Suit]
+    preserve_meld: bool
+    permutation: Permutation
+
+    def hash64(self) -> int:
+        return _hash64(self.hands, self.trump, self.preserve_meld)
+
+    def to_canonical(self, card: Card) -> Card:
+        return _relabel_card(card, self.permutation)
+
+    def from_canonical(self, card: Card) -> Card:
+        return _relabel_card(card, _inverse(self.permutation))
+
+
+@functools.lru_cache(maxsize=None)
+def suit_permutations(trump: Optional[Suit], preserve_meld: bool = True) -> Tuple[Permutation, ...]:
+    """
+    Every relabeling of suits that keeps trump, and with preserve_meld also diamonds and spades, where they are.
+    """
+    fixed = set(_MELD_FIXED_SUITS) if preserve_meld else set()
+    if trump is not None:
+        fixed.add(trump.ordinal)
+    free = [suit for suit in range(len(_SUITS)) if suit not in fixed]
+    permutations = []
+    for targets in itertools.permutations(free):
+        permutation = list(range(len(_SUITS)))
+        for suit, target in zip(free, targets):
+            permutation[suit] = target
+        permutations.append((permutation[0], permutation[1], permutation[2], permutation[3]))
+    return tuple(permutations)
+
+
+def relabel(hand: CompactHand, permutation: Permutation) -> CompactHand:
+    return CompactHand(_relabel_bits(hand.bits, permutation))
+
+
+def canonical_deal(hands: Iterable[Hand], trump: Optional[Suit] = None, preserve_meld: bool = True) -> CanonicalDeal:
+    bits = tuple(_compact(hand).bits for hand in hands)
+    best_key, best_permutation = None, None
+    for permutation in suit_permutations(trump, preserve_meld):
+        key = tuple(_relabel_bits(hand_bits, permutation) for hand_bits in bits)
+        if best_key is None or key < best_key:
+            best_key, best_permutation = key, permutation
+    return CanonicalDeal(
+        hands=tuple(CompactHand(hand_bits) for hand_bits in best_key),
+        trump=trump,
+        preserve_meld=preserve_meld,
+        permutation=best_permutation,
+    )
+
+
+def canonical_hand(hand: Hand, trump: Optional[Suit] = None, preserve_meld: bool = True) -> CompactHand:
+    return canonical_deal((hand,), trump, preserve_meld).hands[0]
+
+
+def deal_hash(hands: Iterable[Hand], trump: Optional[Suit] = None, preserve_meld: bool = True) -> int:
+    return canonical_deal(hands, trump, preserve_meld).hash64()
+
+
+def hand_hash(hand: Hand, trump: Optional[Suit] = None, preserve_meld: bool = True) -> int:
+    return deal_hash((hand,), trump, preserve_meld)
+
+
+def _compact(hand: Hand) -> CompactHand:
+    return hand if isinstance(hand, CompactHand) else CompactHand.from_cards(hand)
+
+
+def _relabel_bits(bits: int, permutation: Permutation) -> int:
+    return (
+        (bits & SUIT_MASK) << (permutation[0] * SUIT_BITS)
+        | ((bits >> SUIT_BITS) & SUIT_MASK) << (permutation[1] * SUIT_BITS)
+        | ((bits >> (2 * SUIT_BITS)) & SUIT_MASK) << (permutation[2] * SUIT_BITS)
+        | (bits >> (3 * SUIT_BITS)) << (permutation[3] * SUIT_BITS)
+    )
+
+
+def _hash64(hands: Tuple[CompactHand, ...], trump: Optional[Suit], preserve_meld: bool) -> int:
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(bytes((_NO_TRUMP if trump is None else trump.ordinal, preserve_meld, len(hands))))
+    for hand in hands:
+        digest.update(hand.bits.to_bytes(_HAND_BYTES, "little"))
+    return int.from_bytes(digest.digest(), "little")
+
+
+def _relabel_card(card: Card, permutation: Permutation) -> Card:
+    id_ = card_id(card)
+    return card_from_id(permutation[id_ // NUM_RANKS] * NUM_RANKS + id_ % NUM_RANKS)
+
+
+def _inverse(permutation: Permutation) -> Permutation:
+    inverse = [0] * len(permutation)
+    for suit, target in enumerate(permutation):
+        inverse[target] = suit
+    return inverse[0], inverse[1], inverse[2], inverse[3]
@@ -2,7 +2,7 @@ import functools
 import random
 from dataclasses import dataclass
 from enum import Enum
-from typing import Tuple
+from typing import Tuple, Union
 
 
 @functools.total_ordering
@@ -12,9 +12,10 @@ class Suit(Enum):
     HEARTS = "Hearts"
     SPADES = "Spades"
 
+    ordinal: int
+
     def __lt__(self, other: "Suit") -> bool:
-        order = [Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS, Suit.SPADES]
-        return order.index(self) < order.index(other)
+        return self.ordinal < other.ordinal
 
     def __str__(self):
         return self.value
@@ -29,14 +30,26 @@ class Rank(Enum):
     TEN = "Ten"
     ACE = "Ace"
 
+    ordinal: int
+
     def __lt__(self, other: "Rank") -> bool:
-        order = [Rank.NINE, Rank.JACK, Rank.QUEEN, Rank.KING, Rank.TEN, Rank.ACE]
-        return order.index(self) < order.index(other)
+        return self.ordinal < other.ordinal
 
     def __str__(self):
         return self.value
 
 
+def _assign_ordinals(enum_class) -> None:
+    # Comparisons run constantly while sorting hands and resolving tricks, so each member carries its position in
+    # the declaration order as a plain int attribute
+    for ordinal, member in enumerate(enum_class):
+        member.ordinal = ordinal
+
+
+_assign_ordinals(Suit)
+_assign_ordinals(Rank)
+
+
 @functools.total_ordering
 @dataclass(frozen=True)
 class Card:
@@ -49,32 +62,63 @@ class Card:
         calculating play outcomes.  It will lead to weird results for that.  To do that properly, you need a function
         that knows the trump suit.  See tricks.py:second_card_wins()
         """
-        if self.suit == other.suit:
-            return self.rank < other.rank
-        return self.suit < other.suit
+        return card_id(self) < card_id(other)
+
+    def __hash__(self):
+        return card_id(self)
 
     def __str__(self):
         return f"{self.rank} of {self.suit}"
 
 
-class CardDeck:
-    @staticmethod
-    def _shuffle(cards: Tuple[Card]) -> Tuple[Card]:
-        return tuple(random.sample(cards, k=len(cards)))
+NUM_RANKS = len(Rank)
+NUM_DISTINCT_CARDS = len(Suit) * NUM_RANKS
+
+_CARDS_BY_ID: Tuple[Card, ...] = tuple(Card(rank=rank, suit=suit) for suit in Suit for rank in Rank)
+
+
+def card_id(card: Card) -> int:
+    """
+    Each of the 24 distinct cards has a small integer id.  Ids follow the in-hand sort order (suit, then rank), so
+    sorting ids sorts the cards.
+    """
+    return card.suit.ordinal * NUM_RANKS + card.rank.ordinal
 
+
+def card_from_id(id_: int) -> Card:
+    return _CARDS_BY_ID[id_]
+
+
+DeckRandom = Union[random.Random, int, None]
+
+
+class CardDeck:
     @classmethod
     def deal(
         cls,
+        rng: DeckRandom = None,
     ) -> Tuple[Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...]]:
-        cards = cls._shuffled_cards()
+        """
+        Deals four 12-card hands.  rng is a random.Random to shuffle with, or a seed for a new one; without it the deal
+        uses the random module's shared generator.
+        """
+        cards = cls._shuffled_cards(rng)
         return cards[:12], cards[12:24], cards[24:36], cards[36:]
 
     @classmethod
-    def _shuffled_cards(cls):
+    def _shuffled_cards(cls, rng: DeckRandom = None) -> Tuple[Card, ...]:
         cards = cls.all_cards()
-        return tuple(random.sample(cards, k=len(cards)))
+        return tuple(_as_random(rng).sample(cards, k=len(cards)))
 
     @classmethod
     @functools.cache
     def all_cards(cls) -> Tuple[Card, ...]:
         return tuple(Card(suit=suit, rank=rank) for suit in Suit for rank in Rank) * 2
+
+
+def _as_random(rng: DeckRandom):
+    if rng is None:
+        return random
+    elif isinstance(rng, random.Random):
+        return rng
+    return random.Random(rng)
@@ -0,0 +1,166 @@
+import functools
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Tuple, Union, Sequence
+
+from pinochle.cards import Card, Suit, NUM_DISTINCT_CARDS, NUM_RANKS, card_id, card_from_id
+
+SLOT_BITS = 4
+SLOT_MASK = (1 << SLOT_BITS) - 1
+MAX_COPIES = SLOT_MASK
+
+SUIT_BITS = NUM_RANKS * SLOT_BITS
+SUIT_MASK = (1 << SUIT_BITS) - 1
+
+_PACKED_BYTES = NUM_DISTINCT_CARDS * SLOT_BITS // 8
+# The lowest bit of every slot, and the slots of the first two suits
+_SLOT_LOW_BITS = sum(1 << (id_ * SLOT_BITS) for id_ in range(NUM_DISTINCT_CARDS))
+_HALF_BITS = 2 * SUIT_BITS
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_NUM_SUITS = len(Suit)
+_NIBBLE_SUMS = bytes((byte & SLOT_MASK) + (byte >> SLOT_BITS) for byte in range(256))
+# One copy of a card, indexed by suit ordinal then rank ordinal
+_SINGLE_CARD_BITS = tuple(
+    tuple(1 << ((suit_index * NUM_RANKS + rank_index) * SLOT_BITS) for rank_index in range(NUM_RANKS))
+    for suit_index in range(_NUM_SUITS)
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CompactHand:
+    """
+    A hand stored as a count vector: one 4-bit slot per card id (see cards.card_id), packed into a single int.  Card
+    order is not kept; iterating yields the cards in sorted order.
+    """
+
+    bits: int = 0
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[Card]) -> "CompactHand":
+        cards = tuple(cards)
+        if len(cards) <= MAX_COPIES:
+            # Too few cards for any slot to overflow, so the slots can be summed directly
+            return cls(sum([_SINGLE_CARD_BITS[card.suit.ordinal][card.rank.ordinal] for card in cards]))
+        counts = [0] * NUM_DISTINCT_CARDS
+        for card in cards:
+            counts[card_id(card)] += 1
+        return cls.from_counts(counts)
+
+    @classmethod
+    def from_counts(cls, counts: Sequence[int]) -> "CompactHand":
+        if len(counts) != NUM_DISTINCT_CARDS:
+            raise ValueError(f"Expected {NUM_DISTINCT_CARDS} counts, got {len(counts)}")
+        bits = 0
+        for id_ in reversed(range(NUM_DISTINCT_CARDS)):
+            if not 0 <= counts[id_] <= MAX_COPIES:
+                raise ValueError(f"Card count must be between 0 and {MAX_COPIES}, got {counts[id_]}")
+            bits = (bits << SLOT_BITS) | counts[id_]
+        return cls(bits)
+
+    def to_cards(self) -> Tuple[Card, ...]:
+        return tuple(self)
+
+    def counts(self) -> Tuple[int, ...]:
+        bits = self.bits
+        return tuple((bits >> (id_ * SLOT_BITS)) & SLOT_MASK for id_ in range(NUM_DISTINCT_CARDS))
+
+    def suit_signature(self, suit: Suit) -> int:
+        """
+        The counts of one suit's cards, packed one slot per rank in rank order.  Hands holding the same cards of a suit
+        share a signature.
+        """
+        return (self.bits >> (suit.ordinal * SUIT_BITS)) & SUIT_MASK
+
+    def suit_signatures(self) -> Tuple[int, ...]:
+        bits = self.bits
+        return tuple((bits >> (suit_index * SUIT_BITS)) & SUIT_MASK for suit_index in range(_NUM_SUITS))
+
+    def distinct_cards_of_suit(self, suit: Suit, lowest_rank: int = 0) -> Tuple[Card, ...]:
+        """
+        One of each card held in the suit, lowest rank first, skipping ranks whose ordinal is below lowest_rank.
+        """
+        signature = (self.bits >> (suit.ordinal * SUIT_BITS)) & SUIT_MASK
+        signature = (signature >> (lowest_rank * SLOT_BITS)) << (lowest_rank * SLOT_BITS)
+        return _distinct_cards_of_suit(suit.ordinal, signature)
+
+    def distinct_cards(self) -> Tuple[Card, ...]:
+        bits = self.bits
+        # Folding each 4-bit slot onto its lowest bit leaves one bit per card held, whatever the count
+        held = (bits | bits >> 1 | bits >> 2 | bits >> 3) & _SLOT_LOW_BITS
+        return _distinct_cards_held(0, held & _HALF_MASK) + _distinct_cards_held(1, held >> _HALF_BITS)
+
+    def count(self, card: Card) -> int:
+        return (self.bits >> (card_id(card) * SLOT_BITS)) & SLOT_MASK
+
+    def add(self, card: Card) -> "CompactHand":
+        shift = card_id(card) * SLOT_BITS
+        if (self.bits >> shift) & SLOT_MASK == MAX_COPIES:
+            raise ValueError(f"Cannot hold more than {MAX_COPIES} copies of {card}")
+        return CompactHand(self.bits + (1 << shift))
+
+    def add_cards(self, cards: Iterable[Card]) -> "CompactHand":
+        hand = self
+        for card in cards:
+            hand = hand.add(card)
+        return hand
+
+    def remove(self, card: Card) -> "CompactHand":
+        shift = card_id(card) * SLOT_BITS
+        if not (self.bits >> shift) & SLOT_MASK:
+            raise ValueError(f"{card} is not in hand")
+        return CompactHand(self.bits - (1 << shift))
+
+    def remove_cards(self, cards: Iterable[Card]) -> "CompactHand":
+        hand = self
+        for card in cards:
+            hand = hand.remove(card)
+        return hand
+
+    def __add__(self, cards: Iterable[Card]) -> "CompactHand":
+        if isinstance(cards, CompactHand):
+            return self.from_counts([a + b for a, b in zip(self.counts(), cards.counts())])
+        return self.add_cards(cards)
+
+    def __contains__(self, card: object) -> bool:
+        return isinstance(card, Card) and self.count(card) > 0
+
+    def __len__(self) -> int:
+        return sum(self.bits.to_bytes(_PACKED_BYTES, "little").translate(_NIBBLE_SUMS))
+
+    def __iter__(self) -> Iterator[Card]:
+        bits = self.bits
+        id_ = 0
+        while bits:
+            for _ in range(bits & SLOT_MASK):
+                yield card_from_id(id_)
+            bits >>= SLOT_BITS
+            id_ += 1
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __str__(self):
+        return ", ".join(str(card) for card in self)
+
+
+@functools.cache
+def _distinct_cards_of_suit(suit_index: int, signature: int) -> Tuple[Card, ...]:
+    first_id = suit_index * NUM_RANKS
+    return tuple(
+        card_from_id(first_id + rank_index)
+        for rank_index in range(NUM_RANKS)
+        if (signature >> (rank_index * SLOT_BITS)) & SLOT_MASK
+    )
+
+
+@functools.cache
+def _distinct_cards_held(half: int, held: int) -> Tuple[Card, ...]:
+    """
+    The cards of the first (half 0) or last two suits whose slots have their lowest bit set in held.
+    """
+    first_id = half * 2 * NUM_RANKS
+    return tuple(
+        card_from_id(first_id + offset) for offset in range(2 * NUM_RANKS) if (held >> (offset * SLOT_BITS)) & 1
+    )
+
+
+Hand = Union[Tuple[Card, ...], CompactHand]
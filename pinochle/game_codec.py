@@ -0,0 +1,162 @@
+"""
+JSON encoding of games and game events, for storing them outside the process.  Cards are written as their card ids
+(see cards.card_id), and hands come back as tuples of cards in the order they were written, or as compact hands once
+the game is playing tricks.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pinochle.bidding import BiddingState
+from pinochle.cards import Card, Suit, card_id, card_from_id
+from pinochle.compact_hand import Hand, CompactHand
+from pinochle.game_events import (
+    GameEvent,
+    GameStarted,
+    BidPlaced,
+    BiddingPassed,
+    TrumpSelected,
+    CardsPassed,
+    CardPlayed,
+    InvalidEvent,
+)
+from pinochle.pinochle_game import PinochleGame, GameState
+from pinochle.play_tricks import PlayTricksState, CompletedTrick
+
+
+def encode_event(event: GameEvent) -> str:
+    if isinstance(event, GameStarted):
+        fields = {"players": event.players, "hands": [_encode_cards(hand) for hand in event.hands]}
+    elif isinstance(event, BidPlaced):
+        fields = {"player": event.player, "bid": event.bid}
+    elif isinstance(event, BiddingPassed):
+        fields = {"player": event.player}
+    elif isinstance(event, TrumpSelected):
+        fields = {"player": event.player, "trump": event.trump.value}
+    elif isinstance(event, CardsPassed):
+        fields = {"source": event.source, "destination": event.destination, "cards": _encode_cards(event.cards)}
+    elif isinstance(event, CardPlayed):
+        fields = {"player": event.player, "card": card_id(event.card)}
+    else:
+        raise InvalidEvent(f"Unknown event {event!r}")
+    return _dumps({"type": type(event).__name__, **fields})
+
+
+def decode_event(text: str) -> GameEvent:
+    fields = json.loads(text)
+    event_type = fields["type"]
+    if event_type == GameStarted.__name__:
+        return GameStarted(players=tuple(fields["players"]), hands=_decode_hands(fields["hands"]))
+    elif event_type == BidPlaced.__name__:
+        return BidPlaced(player=fields["player"], bid=fields["bid"])
+    elif event_type == BiddingPassed.__name__:
+        return BiddingPassed(player=fields["player"])
+    elif event_type == TrumpSelected.__name__:
+        return TrumpSelected(player=fields["player"], trump=Suit(fields["trump"]))
+    elif event_type == CardsPassed.__name__:
+        return CardsPassed(
+            source=fields["source"], destination=fields["destination"], cards=_decode_cards(fields["cards"])
+        )
+    elif event_type == CardPlayed.__name__:
+        return CardPlayed(player=fields["player"], card=card_from_id(fields["card"]))
+    raise InvalidEvent(f"Unknown event type {event_type}")
+
+
+def encode_game(game: PinochleGame) -> str:
+    return _dumps(
+        {
+            "state": game.state.value,
+            "players": game.players,
+            "hands": [_encode_cards(hand) for hand in game.hands],
+            "bidding": {
+                "current_bid": game.bidding.current_bid,
+                "active_players": game.bidding.active_players,
+                "current_player_index": game.bidding.current_player_index,
+                "trump": _encode_suit(game.bidding.trump),
+            },
+            "trump": _encode_suit(game.trump),
+            "tricks": None if game.tricks is None else _encode_tricks(game.tricks),
+        }
+    )
+
+
+def decode_game(text: str) -> PinochleGame:
+    fields = json.loads(text)
+    bidding = fields["bidding"]
+    players = tuple(fields["players"])
+    hands = _decode_hands(fields["hands"])
+    if fields["tricks"] is not None:
+        hands = tuple(CompactHand.from_cards(hand) for hand in hands)
+    trump = _decode_suit(fields["trump"])
+    return PinochleGame(
+        state=GameState(fields["state"]),
+        players=players,
+        hands=hands,
+        bidding=BiddingState(
+            current_bid=bidding["current_bid"],
+            active_players=tuple(bidding["active_players"]),
+            current_player_index=bidding["current_player_index"],
+            trump=_decode_suit(bidding["trump"]),
+        ),
+        trump=trump,
+        tricks=None if fields["tricks"] is None else _decode_tricks(fields["tricks"], hands, players, trump),
+    )
+
+
+def _encode_tricks(tricks: PlayTricksState) -> Dict[str, Any]:
+    # The hands, players and trump are the game's own, so they are not written twice
+    return {
+        "player_index": tricks.player_index,
+        "current_trick": _encode_cards(tricks.current_trick),
+        "winner_index": tricks.winner_index,
+        "winning_card": None if tricks.winning_card is None else card_id(tricks.winning_card),
+        "led_suit": _encode_suit(tricks.led_suit),
+        "completed_tricks": [
+            [trick.leader_index, _encode_cards(trick.cards), trick.winner_index, trick.points]
+            for trick in tricks.completed_tricks
+        ],
+        "team_points": tricks.team_points,
+    }
+
+
+def _decode_tricks(
+    fields: Dict[str, Any], hands: Tuple[Hand, ...], players: Tuple[str, ...], trump: Suit
+) -> PlayTricksState:
+    return PlayTricksState(
+        hands=hands,
+        players=players,
+        player_index=fields["player_index"],
+        trump=trump,
+        current_trick=_decode_cards(fields["current_trick"]),
+        winner_index=fields["winner_index"],
+        winning_card=None if fields["winning_card"] is None else card_from_id(fields["winning_card"]),
+        led_suit=_decode_suit(fields["led_suit"]),
+        completed_tricks=tuple(
+            CompletedTrick(leader_index=leader, cards=_decode_cards(cards), winner_index=winner, points=points)
+            for leader, cards, winner, points in fields["completed_tricks"]
+        ),
+        team_points=tuple(fields["team_points"]),
+    )
+
+
+def _dumps(fields: Dict[str, Any]) -> str:
+    return json.dumps(fields, separators=(",", ":"))
+
+
+def _encode_cards(cards: Hand) -> List[int]:
+    return [card_id(card) for card in cards]
+
+
+def _decode_cards(ids: Sequence[int]) -> Tuple[Card, ...]:
+    return tuple(card_from_id(id_) for id_ in ids)
+
+
+def _decode_hands(hands: Sequence[Sequence[int]]) -> Tuple[Tuple[Card, ...], ...]:
+    return tuple(_decode_cards(hand) for hand in hands)
+
+
+def _encode_suit(suit: Optional[Suit]) -> Optional[str]:
+    return None if suit is None else suit.value
+
+
+def _decode_suit(value: Optional[str]) -> Optional[Suit]:
+    return None if value is None else Suit(value)
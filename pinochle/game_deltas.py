@@ -0,0 +1,101 @@
+"""
+What changed in a game with each event, as small JSON-ready dicts for pushing to clients.  The public delta for an
+event is the same for everyone watching the game; cards only its players should see, such as those passed between
+partners, go in per-player deltas instead.
+"""
+from typing import Any, Dict, List, Optional
+
+from pinochle.cards import Card
+from pinochle.game_events import (
+    GameEvent,
+    GameStarted,
+    BidPlaced,
+    BiddingPassed,
+    TrumpSelected,
+    CardsPassed,
+    CardPlayed,
+)
+from pinochle.pinochle_game import PinochleGame
+
+
+def card_json(card: Card) -> Dict[str, str]:
+    return {"rank": card.rank.value, "suit": card.suit.value}
+
+
+def cards_json(cards) -> List[Dict[str, str]]:
+    return [card_json(card) for card in cards]
+
+
+def public_view(game: PinochleGame, event_count: int) -> Dict[str, Any]:
+    """
+    Everything about the game that every player and spectator may see.
+    """
+    tricks = game.tricks
+    return {
+        "event_count": event_count,
+        "players": game.players,
+        "state": game.state.value,
+        "current_player": game.current_player(),
+        "current_bid": game.bidding.current_bid,
+        "bid_winner": game.bidding.get_winner(),
+        "trump": None if game.trump is None else game.trump.value,
+        "hand_sizes": [len(hand) for hand in game.hands],
+        "current_trick": [] if tricks is None else cards_json(tricks.current_trick),
+        "team_points": [0, 0] if tricks is None else list(tricks.team_points),
+    }
+
+
+def seat_view(game: PinochleGame, event_count: int, player: Optional[str]) -> Dict[str, Any]:
+    """
+    The public view, plus the player's own hand when the viewer holds a seat.
+    """
+    view = public_view(game, event_count)
+    if player is not None:
+        view["hand"] = cards_json(sorted(game.hands[game.players.index(player)]))
+    return view
+
+
+def public_delta(before: Optional[PinochleGame], event: GameEvent, after: PinochleGame, event_count: int) -> Dict:
+    delta: Dict[str, Any] = {"event_count": event_count, "type": type(event).__name__}
+    if isinstance(event, GameStarted):
+        delta["players"] = event.players
+    elif isinstance(event, BidPlaced):
+        delta.update(player=event.player, bid=event.bid)
+    elif isinstance(event, BiddingPassed):
+        delta.update(player=event.player, bid_winner=after.bidding.get_winner())
+    elif isinstance(event, TrumpSelected):
+        delta.update(player=event.player, trump=event.trump.value)
+    elif isinstance(event, CardsPassed):
+        delta.update(source=event.source, destination=event.destination)
+    elif isinstance(event, CardPlayed):
+        delta.update(player=event.player, card=card_json(event.card))
+        if len(after.tricks.completed_tricks) > len(before.tricks.completed_tricks):
+            trick = after.tricks.completed_tricks[-1]
+            delta.update(
+                trick_winner=after.players[trick.winner_index],
+                trick_points=trick.points,
+                team_points=list(after.tricks.team_points),
+            )
+
+    if before is None or before.state != after.state:
+        delta["state"] = after.state.value
+    delta["current_player"] = after.current_player()
+    return delta
+
+
+def private_deltas(event: GameEvent, event_count: int) -> Dict[str, Dict]:
+    """
+    The cards each player learns about from the event that others do not, by player.
+    """
+    if isinstance(event, GameStarted):
+        return {
+            player: {"event_count": event_count, "hand": cards_json(sorted(hand))}
+            for player, hand in zip(event.players, event.hands)
+        }
+    elif isinstance(event, CardsPassed):
+        cards = cards_json(event.cards)
+        return {
+            event.source: {"event_count": event_count, "cards_removed": cards},
+            event.destination: {"event_count": event_count, "cards_added": cards},
+        }
+    return {}
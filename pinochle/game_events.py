@@ -0,0 +1,81 @@
+"""
+Event sourcing for PinochleGame.  Every accepted action is an event, and a game is the result of applying its events
+in order to nothing.  Stored games keep a snapshot every SNAPSHOT_INTERVAL events alongside their events, so any
+earlier point in the game can be rebuilt by replaying from the nearest snapshot rather than from the deal.
+"""
+from typing import NamedTuple, Tuple, Union, Optional, Iterable
+
+from pinochle.cards import Card, Suit
+from pinochle.compact_hand import Hand
+from pinochle.pinochle_game import PinochleGame
+
+SNAPSHOT_INTERVAL = 16
+
+
+class GameStarted(NamedTuple):
+    players: Tuple[str, str, str, str]
+    hands: Tuple[Hand, Hand, Hand, Hand]
+
+
+class BidPlaced(NamedTuple):
+    player: str
+    bid: int
+
+
+class BiddingPassed(NamedTuple):
+    player: str
+
+
+class TrumpSelected(NamedTuple):
+    player: str
+    trump: Suit
+
+
+class CardsPassed(NamedTuple):
+    source: str
+    destination: str
+    cards: Tuple[Card, Card, Card, Card]
+
+
+class CardPlayed(NamedTuple):
+    player: str
+    card: Card
+
+
+GameEvent = Union[GameStarted, BidPlaced, BiddingPassed, TrumpSelected, CardsPassed, CardPlayed]
+
+
+class InvalidEvent(Exception):
+    pass
+
+
+def apply_event(game: Optional[PinochleGame], event: GameEvent) -> PinochleGame:
+    """
+    Returns the game after the event.  Raises the same exceptions as the PinochleGame transition it stands for.
+    """
+    if isinstance(event, GameStarted):
+        if game is not None:
+            raise InvalidEvent("The game has already started")
+        return PinochleGame.new_game(players=event.players, hands=event.hands)
+    if game is None:
+        raise InvalidEvent("The game has not started")
+
+    if isinstance(event, BidPlaced):
+        return game.bid(player=event.player, bid=event.bid)
+    elif isinstance(event, BiddingPassed):
+        return game.pass_bidding(player=event.player)
+    elif isinstance(event, TrumpSelected):
+        return game.select_trump(player=event.player, trump=event.trump)
+    elif isinstance(event, CardsPassed):
+        return game.pass_cards(source=event.source, destination=event.destination, cards=event.cards)
+    elif isinstance(event, CardPlayed):
+        return game.play_card(player=event.player, card=event.card)
+    raise InvalidEvent(f"Unknown event {event!r}")
+
+
+def replay(events: Iterable[GameEvent], game: Optional[PinochleGame] = None) -> PinochleGame:
+    for event in events:
+        game = apply_event(game, event)
+    if game is None:
+        raise InvalidEvent("No events to replay")
+    return game
@@ -0,0 +1,170 @@
+"""
+Call counts and latency histograms for the rules hot paths, exported in the Prometheus text format.
+
+Instrumentation is off by default and then costs nothing:  enable_instrumentation() swaps timed wrappers in for the
+methods listed in HOT_PATHS (or added with instrument()), and disable_instrumentation() puts the originals back.  Any
+other stretch of code can be timed with the timed() context manager, which only records while instrumentation is on.
+
+Metrics live in the process that recorded them, so with several web workers each one reports its own.
+"""
+import bisect
+import contextlib
+import functools
+import importlib
+import itertools
+import threading
+import time
+from typing import Dict, Tuple, List, Callable, Iterator
+
+from pinochle import memo
+
+# (module, class, method, operation name)
+HOT_PATHS = (
+    ("pinochle.bidding", "BiddingState", "new_bid", "bidding.new_bid"),
+    ("pinochle.bidding", "BiddingState", "pass_bidding", "bidding.pass_bidding"),
+    ("pinochle.passing_cards", "PassingCards", "pass_cards", "passing.pass_cards"),
+    ("pinochle.play_tricks", "PlayTricksState", "play_card", "tricks.play_card"),
+    ("pinochle.play_tricks", "PlayTricksState", "legal_moves", "tricks.legal_moves"),
+    # score_meld and MeldCounter users all count meld through here
+    ("pinochle.scoring", "MeldCounter", "count", "scoring.score_meld"),
+)
+
+# Upper bounds in seconds; the last bucket takes everything slower
+LATENCY_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 0.1, float("inf"))
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            self.bucket_counts[bucket] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+            self.count = 0
+            self.sum = 0.0
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        """
+        Cumulative bucket counts, as Prometheus reports them, with the sum and count, all taken at the same moment.
+        """
+        with self._lock:
+            counts, total_seconds, count = list(self.bucket_counts), self.sum, self.count
+        return list(itertools.accumulate(counts)), total_seconds, count
+
+
+_histograms: Dict[str, Histogram] = {}
+_histograms_lock = threading.Lock()
+# (owner, attribute) -> (original, operation name) for everything instrument() has been asked to time
+_targets: Dict[Tuple[type, str], Tuple[Callable, str]] = {}
+_enabled = False
+
+
+def histogram(operation: str) -> Histogram:
+    histogram_ = _histograms.get(operation)
+    if histogram_ is None:
+        with _histograms_lock:
+            histogram_ = _histograms.setdefault(operation, Histogram())
+    return histogram_
+
+
+def instrument(owner: type, attribute: str, operation: str) -> None:
+    """
+    Adds a method to what enable_instrumentation() times, starting right away if instrumentation is on.
+    """
+    if (owner, attribute) not in _targets:
+        _targets[(owner, attribute)] = (getattr(owner, attribute), operation)
+    if _enabled:
+        _wrap(owner, attribute)
+
+
+def enable_instrumentation() -> None:
+    global _enabled
+    for module_name, class_name, attribute, operation in HOT_PATHS:
+        instrument(getattr(importlib.import_module(module_name), class_name), attribute, operation)
+    for owner, attribute in _targets:
+        _wrap(owner, attribute)
+    _enabled = True
+
+
+def disable_instrumentation() -> None:
+    global _enabled
+    for (owner, attribute), (original, _) in _targets.items():
+        setattr(owner, attribute, original)
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset_metrics() -> None:
+    # Zeroed rather than dropped, since timed methods hold on to their histograms
+    with _histograms_lock:
+        histograms = list(_histograms.values())
+    for histogram_ in histograms:
+        histogram_.reset()
+
+
+@contextlib.contextmanager
+def timed(operation: str) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram(operation).observe(time.perf_counter() - start)
+
+
+def _wrap(owner: type, attribute: str) -> None:
+    original, operation = _targets[(owner, attribute)]
+    observe = histogram(operation).observe
+
+    @functools.wraps(original)
+    def timed_method(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            observe(time.perf_counter() - start)
+
+    setattr(owner, attribute, timed_method)
+
+
+def prometheus_text() -> str:
+    """
+    Every histogram recorded so far, and the counters of any memo caches in use, in the Prometheus text exposition
+    format.
+    """
+    lines = [
+        "# HELP pinochle_operation_seconds Time spent in rules operations.",
+        "# TYPE pinochle_operation_seconds histogram",
+    ]
+    with _histograms_lock:
+        histograms = sorted(_histograms.items())
+    for operation, histogram_ in histograms:
+        label = f'operation="{operation}"'
+        cumulative_counts, total_seconds, count = histogram_.snapshot()
+        for bound, bucket_count in zip(LATENCY_BUCKETS, cumulative_counts):
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'pinochle_operation_seconds_bucket{{{label},le="{le}"}} {bucket_count}')
+        lines.append(f"pinochle_operation_seconds_sum{{{label}}} {total_seconds!r}")
+        lines.append(f"pinochle_operation_seconds_count{{{label}}} {count}")
+
+    cache_stats = memo.cache_stats()
+    for field in ("hits", "misses", "evictions"):
+        lines.append(f"# TYPE pinochle_cache_{field}_total counter")
+        for cache, stats in sorted(cache_stats.items()):
+            lines.append(f'pinochle_cache_{field}_total{{cache="{cache}"}} {getattr(stats, field)}')
+    return "\n".join(lines) + "\n"
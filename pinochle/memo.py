@@ -0,0 +1,159 @@
+"""
+Opt-in memoization for pure rule functions such as meld scoring.  Functions are wrapped with memoize when they are
+defined but do not cache anything until caching is turned on, for all of them with enable_caching() or for one with
+function.memo.enable_cache().
+
+Each cache is a bounded LRU that counts its hits, misses and evictions.  Hands are keyed by their card counts (see
+hand_key), so the same cards in any order, as a tuple or a CompactHand, share one entry.
+"""
+import functools
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Callable, Hashable, Dict, Optional, Any
+
+from pinochle.compact_hand import CompactHand, Hand
+
+DEFAULT_MAXSIZE = 4096
+
+_MISSING = object()
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+def hand_key(hand: Hand) -> int:
+    """
+    The hand's packed card counts, the same whatever order its cards are in.
+    """
+    return hand.bits if isinstance(hand, CompactHand) else CompactHand.from_cards(hand).bits
+
+
+class Memoized:
+    """
+    The caching state behind one memoized function, which is reachable from it as .memo.
+    """
+
+    def __init__(self) -> None:
+        self.cache: Optional[LRUCache] = None
+
+    def enable_cache(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.cache = LRUCache(maxsize)
+
+    def disable_cache(self) -> None:
+        self.cache = None
+
+    def cache_stats(self) -> Optional[CacheStats]:
+        return None if self.cache is None else self.cache.stats()
+
+
+_memoized: Dict[str, Memoized] = {}
+
+
+def memoize(name: str, key: Callable[..., Hashable]) -> Callable[[Callable], Callable]:
+    """
+    Wraps a pure function for opt-in caching.  key takes the function's arguments and returns a hashable that is
+    equal for any two calls that must give the same result.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        memo = Memoized()
+
+        # A plain closure rather than a callable object keeps the cost of an uncached call low
+        @functools.wraps(function)
+        def memoized(*args, **kwargs):
+            cache = memo.cache
+            if cache is None:
+                return function(*args, **kwargs)
+            cache_key = key(*args, **kwargs)
+            value = cache.get(cache_key, _MISSING)
+            if value is _MISSING:
+                # Computed outside the cache's lock, so two threads missing on one key may both compute it
+                value = function(*args, **kwargs)
+                cache.put(cache_key, value)
+            return value
+
+        memoized.memo = memo
+        _memoized[name] = memo
+        return memoized
+
+    return decorator
+
+
+def enable_caching(maxsize: int = DEFAULT_MAXSIZE) -> None:
+    """
+    Turns on a fresh cache of maxsize entries for every memoized rule function.
+    """
+    _import_rules()
+    for memoized in _memoized.values():
+        memoized.enable_cache(maxsize)
+
+
+def disable_caching() -> None:
+    for memoized in _memoized.values():
+        memoized.disable_cache()
+
+
+def cache_stats() -> Dict[str, CacheStats]:
+    """
+    Stats for each memoized function that is caching, by name.
+    """
+    return {name: memoized.cache.stats() for name, memoized in _memoized.items() if memoized.cache is not None}
+
+
+def _import_rules() -> None:
+    # Memoized functions register themselves when their modules are imported
+    import pinochle.scoring  # noqa: F401
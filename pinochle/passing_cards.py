@@ -2,6 +2,7 @@ from enum import Enum
 from typing import NamedTuple, Tuple
 
 from pinochle.cards import Card
+from pinochle.compact_hand import Hand
 from pinochle.utils import remove_cards_from_hand
 
 
@@ -17,8 +18,8 @@ class PassDirection(Enum):
 class PassingCards(NamedTuple):
     bid_winner: str
     partner: str
-    bid_winner_hand: Tuple[Card, ...]
-    partner_hand: Tuple[Card, ...]
+    bid_winner_hand: Hand
+    partner_hand: Hand
 
     def pass_cards(self, source: str, destination: str, cards: Tuple[Card, Card, Card, Card]) -> "PassingCards":
         pass_direction = self._get_pass_direction(source=source, destination=destination)
@@ -50,7 +51,7 @@ class PassingCards(NamedTuple):
         self._validate_size_of_pass(cards)
 
     @staticmethod
-    def _validate_hand_size(player: str, hand: Tuple[Card, ...], target_size: int) -> None:
+    def _validate_hand_size(player: str, hand: Hand, target_size: int) -> None:
         if len(hand) != target_size:
             raise IllegalPass(f"{player} must have {target_size} cards in hand to pass, has {len(hand)}")
 
@@ -1,41 +1,120 @@
 from enum import Enum
 from typing import NamedTuple, Tuple, Optional
 
-from pinochle.bidding import BiddingState
-from pinochle.cards import Card, CardDeck, Suit
+from pinochle.bidding import BiddingState, InvalidBid, OPENING_BID
+from pinochle.cards import CardDeck, Suit, Card
+from pinochle.compact_hand import Hand, CompactHand
+from pinochle.passing_cards import PassingCards, IllegalPass
+from pinochle.play_tricks import PlayTricksState, InvalidPlay
 
 
 class GameState(Enum):
     BIDDING = "Bidding"
     PASSING_TO_BID_WINNER = "PassingToBidWinner"
+    PASSING_TO_PARTNER = "PassingToPartner"
+    PLAYING_TRICKS = "PlayingTricks"
+    COMPLETE = "Complete"
 
     def __str__(self):
         return self.value
 
 
-class IllegalPass(Exception):
-    pass
-
-
 class PinochleGame(NamedTuple):
     state: GameState
     players: Tuple[str, str, str, str]
-    hands: Tuple[Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...], Tuple[Card, ...]]
+    hands: Tuple[Hand, Hand, Hand, Hand]
     bidding: BiddingState
     trump: Optional[Suit]
+    tricks: Optional[PlayTricksState] = None
 
     @classmethod
-    def new_game(cls, players: Tuple[str, str, str, str]) -> "PinochleGame":
+    def new_game(
+        cls, players: Tuple[str, str, str, str], hands: Optional[Tuple[Hand, Hand, Hand, Hand]] = None
+    ) -> "PinochleGame":
         return PinochleGame(
             state=GameState.BIDDING,
             players=players,
-            hands=CardDeck.deal(),
-            bidding=BiddingState(current_bid=24, active_players=players),
+            hands=CardDeck.deal() if hands is None else hands,
+            bidding=BiddingState(current_bid=OPENING_BID, active_players=players),
             trump=None,
         )
 
+    def bid(self, player: str, bid: int) -> "PinochleGame":
+        if self.state != GameState.BIDDING:
+            raise InvalidBid("Bidding is over")
+        return self._replace(bidding=self.bidding.new_bid(bid=bid, player=player))
+
+    def pass_bidding(self, player: str) -> "PinochleGame":
+        if self.state != GameState.BIDDING:
+            raise InvalidBid("Bidding is over")
+        return self._replace(bidding=self.bidding.pass_bidding(player=player))
+
     def select_trump(self, player: str, trump: Suit) -> "PinochleGame":
-        return self._replace(trump=trump, state=GameState.PASSING_TO_BID_WINNER)
+        if self.state != GameState.BIDDING:
+            raise InvalidBid("Trump has already been set")
+        return self._replace(
+            bidding=self.bidding.set_trump(player=player, trump=trump),
+            trump=trump,
+            state=GameState.PASSING_TO_BID_WINNER,
+        )
+
+    def pass_cards(self, source: str, destination: str, cards: Tuple[Card, Card, Card, Card]) -> "PinochleGame":
+        if self.state == GameState.PASSING_TO_BID_WINNER:
+            expected_source, expected_destination = self._get_bid_winner_partner(), self._get_bid_winner()
+        elif self.state == GameState.PASSING_TO_PARTNER:
+            expected_source, expected_destination = self._get_bid_winner(), self._get_bid_winner_partner()
+        else:
+            raise IllegalPass(f"Cannot pass cards while {self.state}")
+        if (source, destination) != (expected_source, expected_destination):
+            raise IllegalPass(f"Illegal pass from {source} to {destination}, waiting on {expected_source}")
+
+        bid_winner_index = self.players.index(self._get_bid_winner())
+        partner_index = (bid_winner_index + 2) % 4
+        passing = PassingCards(
+            bid_winner=self._get_bid_winner(),
+            partner=self._get_bid_winner_partner(),
+            bid_winner_hand=self.hands[bid_winner_index],
+            partner_hand=self.hands[partner_index],
+        ).pass_cards(source=source, destination=destination, cards=cards)
+        hands = list(self.hands)
+        hands[bid_winner_index] = passing.bid_winner_hand
+        hands[partner_index] = passing.partner_hand
+        new_hands = (hands[0], hands[1], hands[2], hands[3])
+
+        if self.state == GameState.PASSING_TO_BID_WINNER:
+            return self._replace(hands=new_hands, state=GameState.PASSING_TO_PARTNER)
+        # Trick play runs on compact hands, which legal_moves and play_card use without converting
+        new_hands = tuple(CompactHand.from_cards(hand) for hand in new_hands)
+        return self._replace(
+            hands=new_hands,
+            state=GameState.PLAYING_TRICKS,
+            tricks=PlayTricksState(
+                hands=new_hands, players=self.players, player_index=bid_winner_index, trump=self.trump
+            ),
+        )
+
+    def play_card(self, player: str, card: Card) -> "PinochleGame":
+        if self.state != GameState.PLAYING_TRICKS:
+            raise InvalidPlay(f"Cannot play cards while {self.state}")
+        tricks = self.tricks.play_card(player=player, card=card)
+        state = GameState.PLAYING_TRICKS if any(tricks.hands) else GameState.COMPLETE
+        return PinochleGame(
+            state=state, players=self.players, hands=tricks.hands, bidding=self.bidding, trump=self.trump, tricks=tricks
+        )
+
+    def current_player(self) -> Optional[str]:
+        """
+        The player the game is waiting on, or None once it is complete.
+        """
+        if self.state == GameState.BIDDING:
+            return self.bidding.get_winner() or self.bidding.current_player()
+        elif self.state == GameState.PASSING_TO_BID_WINNER:
+            return self._get_bid_winner_partner()
+        elif self.state == GameState.PASSING_TO_PARTNER:
+            return self._get_bid_winner()
+        elif self.state == GameState.PLAYING_TRICKS:
+            return self.tricks.current_player()
+        return None
 
     def _get_bid_winner(self) -> str:
         return self.bidding.get_winner()
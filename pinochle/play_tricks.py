@@ -1,105 +1,168 @@
-from typing import NamedTuple, Tuple, Set, Optional
+from typing import NamedTuple, Tuple, Optional
 
-from pinochle.cards import Card, Suit
-from pinochle.trick import get_trick_winning_card, get_trick_winner_index, second_card_wins
-from pinochle.utils import remove_cards_from_hand, InvalidCardRemoval
+from pinochle.cards import Card, Suit, card_id
+from pinochle.compact_hand import Hand, CompactHand, SLOT_BITS, SUIT_BITS, SUIT_MASK
+from pinochle.scoring import count_trick_points, LAST_TRICK_POINTS
+from pinochle.trick import get_trick_winner_index, second_card_wins
+from pinochle.utils import remove_cards_from_hand
 
 
 class InvalidPlay(Exception):
     pass
 
 
+class CompletedTrick(NamedTuple):
+    leader_index: int
+    cards: Tuple[Card, ...]
+    winner_index: int
+    points: int
+
+
 class PlayTricksState(NamedTuple):
-    hands: Tuple[Tuple[Card, ...], ...]
+    hands: Tuple[Hand, ...]
     players: Tuple[str, str, str, str]
     player_index: int
     trump: Suit
     current_trick: Tuple[Card, ...] = tuple()
+    # The trick in progress, kept up to date by play_card.  A state built with a current_trick but without these
+    # works them out from the trick instead.
+    winner_index: Optional[int] = None
+    winning_card: Optional[Card] = None
+    led_suit: Optional[Suit] = None
+    completed_tricks: Tuple[CompletedTrick, ...] = tuple()
+    # Trick points taken by the team of players 0 and 2 and the team of players 1 and 3, including the last trick
+    team_points: Tuple[int, int] = (0, 0)
 
     def play_card(self, player: str, card: Card) -> "PlayTricksState":
-        if player != self.current_player():
+        player_index = self.player_index
+        if player != self.players[player_index]:
             raise InvalidPlay(f"{player} cannot play on {self.current_player()}'s turn")
-        self._validate_chosen_card(card=card)
-        try:
-            new_hand = remove_cards_from_hand(self._current_player_hand(), (card,))
-            new_hands = self.hands[: self.player_index] + (new_hand,) + self.hands[self.player_index + 1 :]
-        except InvalidCardRemoval as e:
-            raise InvalidPlay(f"{player} does not have a {card} in hand") from e
-
-        winner_index = self._get_trick_winner_index(card)
-        if winner_index is None:
-            new_player_index = self._incremented_player_index()
-            pass
+        hand = self.hands[player_index]
+        self._validate_chosen_card(card=card, hand=hand if isinstance(hand, CompactHand) else None)
+        hands = list(self.hands)
+        hands[player_index] = _remove_card(hand, card)
+        new_hands = tuple(hands)
+
+        if self._is_beginning_of_trick():
+            led_suit, winner_index, winning_card = card.suit, player_index, card
         else:
-            new_player_index = winner_index
+            led_suit, winner_index, winning_card = self._trick_in_progress()
+            if second_card_wins(winning_card, card, trump=self.trump):
+                winner_index, winning_card = player_index, card
+
+        trick = self.current_trick + (card,)
+        if len(trick) < 4:
+            return PlayTricksState(
+                hands=new_hands,
+                players=self.players,
+                player_index=(player_index + 1) % 4,
+                trump=self.trump,
+                current_trick=trick,
+                winner_index=winner_index,
+                winning_card=winning_card,
+                led_suit=led_suit,
+                completed_tricks=self.completed_tricks,
+                team_points=self.team_points,
+            )
 
-        return self._replace(
+        points = count_trick_points(trick)
+        if not any(new_hands):
+            points += LAST_TRICK_POINTS
+        team_points = list(self.team_points)
+        team_points[winner_index % 2] += points
+        completed_trick = CompletedTrick(
+            leader_index=(player_index + 1) % 4, cards=trick, winner_index=winner_index, points=points
+        )
+        return PlayTricksState(
             hands=new_hands,
-            player_index=new_player_index,
-            current_trick=(self.current_trick + (card,)),
+            players=self.players,
+            player_index=winner_index,
+            trump=self.trump,
+            completed_tricks=self.completed_tricks + (completed_trick,),
+            team_points=(team_points[0], team_points[1]),
         )
 
     def current_player(self) -> str:
         return self.players[self.player_index]
 
-    def _current_player_hand(self) -> Tuple[Card, ...]:
+    def _current_player_hand(self) -> Hand:
         return self.hands[self.player_index]
 
-    def _incremented_player_index(self) -> int:
-        return (self.player_index + 1) % 4
-
-    def _validate_chosen_card(self, card: Card) -> None:
-        if card not in self._get_valid_cards_to_play():
+    def _validate_chosen_card(self, card: Card, hand: Optional[CompactHand] = None) -> None:
+        """
+        Checks the card against the rules with bit tests on the hand's counts, without building the legal moves.
+        """
+        if hand is None:
+            hand = CompactHand.from_cards(self._current_player_hand())
+        if not hand.count(card):
             raise InvalidPlay("Invalid card played")
+        suit_and_cutoff = self._forced_suit_and_rank_cutoff(hand)
+        if suit_and_cutoff is not None:
+            suit, lowest_rank = suit_and_cutoff
+            if card.suit is not suit or card.rank.ordinal < lowest_rank:
+                raise InvalidPlay("Invalid card played")
+
+    def legal_moves(self) -> Tuple[Card, ...]:
+        """
+        The distinct cards the current player may play, in sorted order.  A player must follow the led suit, or failing
+        that play trump, and must beat the winning card if any of those cards can.
+        """
+        hand = self.hands[self.player_index]
+        if not isinstance(hand, CompactHand):
+            hand = CompactHand.from_cards(hand)
+        suit_and_cutoff = self._forced_suit_and_rank_cutoff(hand)
+        if suit_and_cutoff is None:
+            return hand.distinct_cards()
+        suit, lowest_rank = suit_and_cutoff
+        return hand.distinct_cards_of_suit(suit, lowest_rank)
+
+    def _forced_suit_and_rank_cutoff(self, hand: CompactHand) -> Optional[Tuple[Suit, int]]:
+        """
+        The suit the player must play and the lowest rank ordinal they may play in it, or None if any card will do.
+        """
+        if not self.current_trick:
+            return None
 
-    def _get_valid_cards_to_play(self) -> Set[Card]:
-        if self._is_beginning_of_trick():
-            return set(self._current_player_hand())
-
-        # (1) filter to either the current suit or trump or just return everything
-        if self._has_suit_in_hand(self._suit_of_current_trick()):
-            matching_cards = set(
-                card for card in self._current_player_hand() if card.suit == self._suit_of_current_trick()
-            )
-        elif self._has_suit_in_hand(self.trump):
-            matching_cards = set(card for card in self._current_player_hand() if card.suit == self.trump)
+        winning_card = self.winning_card
+        if winning_card is None:
+            led_suit, _, winning_card = self._trick_in_progress()
         else:
-            return set(self._current_player_hand())
-
-        # (2) filter to only winning cards
-        winning_cards = set(
-            filter(lambda card: second_card_wins(self._winning_card(), card, trump=self.trump), matching_cards)
-        )
-
-        # (3) if there are no winning cards, then return all matching cards
-        return winning_cards if winning_cards else matching_cards
+            led_suit = self.led_suit
+        bits = hand.bits
+        matching_suit = led_suit
+        signature = (bits >> (led_suit.ordinal * SUIT_BITS)) & SUIT_MASK
+        if not signature:
+            matching_suit = self.trump
+            signature = (bits >> (matching_suit.ordinal * SUIT_BITS)) & SUIT_MASK
+            if not signature:
+                return None
+
+        # The winning card is of the led suit or trump.  If it is of the suit being played, only higher ranks beat it;
+        # otherwise either every card of the suit beats it (trump over the led suit) or none does.
+        lowest_winning_rank = winning_card.rank.ordinal + 1
+        if winning_card.suit is matching_suit and signature >> (lowest_winning_rank * SLOT_BITS):
+            return matching_suit, lowest_winning_rank
+        return matching_suit, 0
 
     def _is_beginning_of_trick(self):
         return len(self.current_trick) == 0
 
-    def _has_suit_in_hand(self, suit: Suit) -> bool:
-        return suit in {card.suit for card in self._current_player_hand()}
-
-    def _suit_of_current_trick(self) -> Suit:
-        return self.current_trick[0].suit
-
-    def _card_wins(self, card: Card) -> bool:
-        pass
-
-    def _winning_card(self) -> Card:
-        return get_trick_winning_card(cards=self.current_trick, trump=self.trump)
-
-    def _second_card_wins(self, card0: Card, card1: Card) -> bool:
-        if card0.suit == card1.suit:
-            return card1.rank > card0.rank
-        else:
-            return card1.suit == self.trump
-
-    def _get_trick_winner_index(self, card: Card) -> Optional[int]:
-        if len(self.current_trick) < 3:
-            return None
-        else:
-            return self._index_of_trick_winner(self.current_trick + (card,))
-
-    def _index_of_trick_winner(self, trick: Tuple[Card, ...]) -> int:
-        return (get_trick_winner_index(cards=trick, trump=self.trump) + self.player_index + 1) % 4
+    def _trick_in_progress(self) -> Tuple[Suit, int, Card]:
+        """
+        The led suit, and the index and card of the player winning the trick so far.
+        """
+        if self.winning_card is not None:
+            return self.led_suit, self.winner_index, self.winning_card
+        trick = self.current_trick
+        leader_index = (self.player_index - len(trick)) % 4
+        winning_position = get_trick_winner_index(cards=trick, trump=self.trump)
+        return trick[0].suit, (leader_index + winning_position) % 4, trick[winning_position]
+
+
+def _remove_card(hand: Hand, card: Card) -> Hand:
+    """
+    The hand without one copy of a card it is known to hold.
+    """
+    if isinstance(hand, CompactHand):
+        return CompactHand(hand.bits - (1 << (card_id(card) * SLOT_BITS)))
+    return remove_cards_from_hand(hand, (card,))
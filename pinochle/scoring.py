@@ -1,6 +1,23 @@
-from typing import List, NamedTuple
+import functools
+import itertools
+from typing import List, NamedTuple, Union, Sequence, Dict, Iterable
 
 from pinochle.cards import Card, Suit, Rank
+from pinochle.compact_hand import CompactHand, Hand, SLOT_BITS, SLOT_MASK
+from pinochle.memo import memoize, hand_key
+
+COUNTER_RANKS = frozenset((Rank.ACE, Rank.TEN, Rank.KING))
+LAST_TRICK_POINTS = 1
+TOTAL_TRICK_POINTS = 2 * len(Suit) * len(COUNTER_RANKS) + LAST_TRICK_POINTS
+
+_TRICK_POINTS_BY_RANK = tuple(1 if rank in COUNTER_RANKS else 0 for rank in Rank)
+
+
+def count_trick_points(cards: Iterable[Card]) -> int:
+    """
+    Aces, tens, and kings are worth a point each to whoever takes them in a trick.
+    """
+    return sum(_TRICK_POINTS_BY_RANK[card.rank.ordinal] for card in cards)
 
 
 class Meld(NamedTuple):
@@ -66,53 +83,147 @@ class Meld(NamedTuple):
             raise Exception(f"Pinochles should always be 0, 1, or 2.  Got {self.pinochles}")
 
 
-def score_meld(hand: List[Card], trump: Suit) -> int:
+def score_meld(hand: Union[List[Card], Hand], trump: Suit) -> int:
     meld = MeldCounter(hand=hand, trump=trump).count()
     return meld.score()
 
 
+class SuitMeld(NamedTuple):
+    """
+    The meld ingredients found within a single suit.  Everything in a Meld can be combined from one of these per suit.
+    """
+
+    nines: int
+    marriages: int
+    runs: int
+    jacks: int
+    queens: int
+    kings: int
+    aces: int
+
+
+@functools.cache
+def suit_meld(signature: int) -> SuitMeld:
+    """
+    Looks up the meld ingredients for a suit signature (see CompactHand.suit_signature).  The table fills lazily as
+    signatures are seen; precompute_meld_table() fills it up front.
+    """
+    nines, jacks, queens, kings, tens, aces = ((signature >> (rank.ordinal * SLOT_BITS)) & SLOT_MASK for rank in Rank)
+    return SuitMeld(
+        nines=nines,
+        marriages=min(queens, kings),
+        runs=min(jacks, queens, kings, tens, aces),
+        jacks=jacks,
+        queens=queens,
+        kings=kings,
+        aces=aces,
+    )
+
+
+def precompute_meld_table() -> None:
+    """
+    Fills the suit_meld table for every signature a real deck can produce (0-2 copies of each card).
+    """
+    for counts in itertools.product(range(3), repeat=len(Rank)):
+        suit_meld(sum(count << (index * SLOT_BITS) for index, count in enumerate(counts)))
+
+
 class MeldCounter:
-    def __init__(self, hand: List[Card], trump: Suit):
+    def __init__(self, hand: Union[List[Card], Hand], trump: Suit):
         self.hand = hand
         self.trump = trump
 
     def count(self) -> Meld:
-        return Meld(
-            nines_of_trump=self._nines_of_trump(),
-            non_trump_marriages=self._non_trump_marriages(),
-            trump_marriages=self._trump_marriages(),
-            jacks_around=self._count_around(Rank.JACK),
-            queens_around=self._count_around(Rank.QUEEN),
-            kings_around=self._count_around(Rank.KING),
-            aces_around=self._count_around(Rank.ACE),
-            runs_in_trump=self._runs_in_trump(),
-            pinochles=self._pinochles(),
-        )
+        return _count_meld(self.hand, self.trump)
+
+
+@memoize("meld", key=lambda hand, trump: (hand_key(hand), trump.ordinal))
+def _count_meld(hand: Union[List[Card], Hand], trump: Suit) -> Meld:
+    return meld_from_suits(suits=_suit_melds(hand), trump=trump)
+
+
+def score_meld_all_trumps(hand: Union[List[Card], Hand]) -> Dict[Suit, Meld]:
+    """
+    Counts the meld in a hand under each possible trump suit.  Everything but nines, runs, and marriages in trump is
+    the same whatever the trump, so it is only counted once.
+    """
+    suits = _suit_melds(hand)
+    shared = _TrumpIndependentMeld.from_suits(suits)
+    return {trump: shared.meld(suits[trump.ordinal]) for trump in Suit}
+
 
-    def _nines_of_trump(self) -> int:
-        return self.hand.count(Card(Rank.NINE, self.trump))
+def best_meld_trump(hand: Union[List[Card], Hand]) -> Suit:
+    """
+    The trump suit that scores the most meld for this hand.  Ties go to the lowest suit.
+    """
+    melds = score_meld_all_trumps(hand)
+    return max(Suit, key=lambda trump: melds[trump].score())
 
-    def _non_trump_marriages(self) -> int:
-        return sum(self._marriages_in_suit(suit) for suit in self._non_trump_suits())
 
-    def _non_trump_suits(self) -> List[Suit]:
-        return [suit for suit in Suit if suit != self.trump]
+def _suit_melds(hand: Union[List[Card], Hand]) -> List[SuitMeld]:
+    compact_hand = hand if isinstance(hand, CompactHand) else CompactHand.from_cards(hand)
+    return [suit_meld(signature) for signature in compact_hand.suit_signatures()]
 
-    def _marriages_in_suit(self, suit: Suit) -> int:
-        return self._count_combinations([Card(Rank.QUEEN, suit), Card(Rank.KING, suit)])
 
-    def _count_combinations(self, target_cards):
-        card_counts = [self.hand.count(card) for card in target_cards]
-        return min(card_counts)
+def meld_from_suits(suits: Sequence[SuitMeld], trump: Suit) -> Meld:
+    return _TrumpIndependentMeld.from_suits(suits).meld(suits[trump.ordinal])
 
-    def _trump_marriages(self) -> int:
-        return self._marriages_in_suit(self.trump) - self._runs_in_trump()
 
-    def _count_around(self, rank: Rank) -> int:
-        return self._count_combinations([Card(rank, suit) for suit in Suit])
+# Scores for none, one, or two of a meld that scores 10x for a double
+_AROUND_SCORES = {base_score: (0, base_score, 10 * base_score) for base_score in (4, 6, 8, 10, 15)}
+_PINOCHLE_SCORES = (0, 4, 30)
 
-    def _runs_in_trump(self) -> int:
-        return self._count_combinations([Card(rank, self.trump) for rank in Rank if rank != Rank.NINE])
 
-    def _pinochles(self) -> int:
-        return self._count_combinations([Card(Rank.JACK, Suit.DIAMONDS), Card(Rank.QUEEN, Suit.SPADES)])
+def score_suit_melds(suits: Sequence[SuitMeld], trump: Suit) -> int:
+    """
+    The same as meld_from_suits(suits, trump).score(), without building the Meld, for search loops that score many
+    hands.
+    """
+    clubs, diamonds, hearts, spades = suits
+    trump_suit = suits[trump.ordinal]
+    runs = trump_suit.runs
+    marriages = clubs.marriages + diamonds.marriages + hearts.marriages + spades.marriages
+    return (
+        trump_suit.nines
+        + 2 * (marriages - trump_suit.marriages)
+        + 4 * (trump_suit.marriages - runs)
+        + _AROUND_SCORES[15][runs]
+        + _AROUND_SCORES[4][min(clubs.jacks, diamonds.jacks, hearts.jacks, spades.jacks)]
+        + _AROUND_SCORES[6][min(clubs.queens, diamonds.queens, hearts.queens, spades.queens)]
+        + _AROUND_SCORES[8][min(clubs.kings, diamonds.kings, hearts.kings, spades.kings)]
+        + _AROUND_SCORES[10][min(clubs.aces, diamonds.aces, hearts.aces, spades.aces)]
+        + _PINOCHLE_SCORES[min(diamonds.jacks, spades.queens)]
+    )
+
+
+class _TrumpIndependentMeld(NamedTuple):
+    marriages: int
+    jacks_around: int
+    queens_around: int
+    kings_around: int
+    aces_around: int
+    pinochles: int
+
+    @classmethod
+    def from_suits(cls, suits: Sequence[SuitMeld]) -> "_TrumpIndependentMeld":
+        return cls(
+            marriages=sum(suit.marriages for suit in suits),
+            jacks_around=min(suit.jacks for suit in suits),
+            queens_around=min(suit.queens for suit in suits),
+            kings_around=min(suit.kings for suit in suits),
+            aces_around=min(suit.aces for suit in suits),
+            pinochles=min(suits[Suit.DIAMONDS.ordinal].jacks, suits[Suit.SPADES.ordinal].queens),
+        )
+
+    def meld(self, trump_suit: SuitMeld) -> Meld:
+        return Meld(
+            nines_of_trump=trump_suit.nines,
+            non_trump_marriages=self.marriages - trump_suit.marriages,
+            trump_marriages=trump_suit.marriages - trump_suit.runs,
+            jacks_around=self.jacks_around,
+            queens_around=self.queens_around,
+            kings_around=self.kings_around,
+            aces_around=self.aces_around,
+            runs_in_trump=trump_suit.runs,
+            pinochles=self.pinochles,
+        )
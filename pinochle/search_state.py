@@ -0,0 +1,240 @@
+"""
+A mutable mirror of PlayTricksState for tree search and rollouts.
+
+PlayTricksState allocates a new state for every card played, which adds up over the millions of nodes of a search.
+SearchState plays and takes back cards in place instead:  make_move() plays a card id for the player to move and
+unmake_move() undoes the most recent move, keeping a Zobrist hash of the position up to date as it goes.  Convert a
+position in with SearchState(state) and back out with to_state(); the rules API stays immutable.
+
+make_move() trusts its caller to pass one of legal_moves(), so it does no checking of its own.
+"""
+import random
+from typing import Tuple, List, Optional
+
+from pinochle.cards import Suit, NUM_DISTINCT_CARDS, NUM_RANKS, card_id, card_from_id
+from pinochle.compact_hand import CompactHand, MAX_COPIES
+from pinochle.play_tricks import PlayTricksState, CompletedTrick
+from pinochle.scoring import COUNTER_RANKS, LAST_TRICK_POINTS
+
+NUM_PLAYERS = 4
+CARD_POINTS = tuple(1 if card_from_id(id_).rank in COUNTER_RANKS else 0 for id_ in range(NUM_DISTINCT_CARDS))
+CARD_SUITS = tuple(id_ // NUM_RANKS for id_ in range(NUM_DISTINCT_CARDS))
+CARD_RANKS = tuple(id_ % NUM_RANKS for id_ in range(NUM_DISTINCT_CARDS))
+
+_SUITS = tuple(Suit)
+
+_zobrist = random.Random(0x5EED)
+_HAND_KEYS = tuple(
+    tuple(
+        tuple(_zobrist.getrandbits(64) if copies else 0 for copies in range(MAX_COPIES + 1))
+        for _ in range(NUM_DISTINCT_CARDS)
+    )
+    for _ in range(NUM_PLAYERS)
+)
+_TRICK_KEYS = tuple(tuple(_zobrist.getrandbits(64) for _ in range(NUM_DISTINCT_CARDS)) for _ in range(NUM_PLAYERS))
+_TO_MOVE_KEYS = tuple(_zobrist.getrandbits(64) for _ in range(NUM_PLAYERS))
+_TRUMP_KEYS = tuple(_zobrist.getrandbits(64) for _ in _SUITS)
+
+
+class SearchState:
+    """
+    Hands are kept as a list of card counts per player, and cards as ids (see cards.card_id).  The hash covers what
+    decides the rest of the hand:  the trump, the hands, the trick in progress and the player to move, but not the
+    points already taken, so the same position reached by different lines of play hashes the same.
+    """
+
+    def __init__(self, state: PlayTricksState):
+        self.players = state.players
+        self.trump = state.trump.ordinal
+        self.compact_hands = any(isinstance(hand, CompactHand) for hand in state.hands)
+        self.counts = [[0] * NUM_DISTINCT_CARDS for _ in range(NUM_PLAYERS)]
+        for player, hand in enumerate(state.hands):
+            for card in hand:
+                self.counts[player][card_id(card)] += 1
+        self.held = [sum(counts[id_] for counts in self.counts) for id_ in range(NUM_DISTINCT_CARDS)]
+        self.cards_left = sum(self.held)
+        self.points_in_hands = sum(CARD_POINTS[id_] * copies for id_, copies in enumerate(self.held))
+        self.team_points = list(state.team_points)
+        # Tricks completed before the conversion, then (card ids, last player, winner, points) for each
+        # trick completed since
+        self._initial_tricks = state.completed_tricks
+        self.completed_tricks: List[Tuple[List[int], int, int, int]] = []
+        self.trick: List[int] = []
+        self.winner = 0
+        self.winning_strength = -1
+        self.hash = _TRUMP_KEYS[self.trump]
+        for player, counts in enumerate(self.counts):
+            for id_, copies in enumerate(counts):
+                self.hash ^= _HAND_KEYS[player][id_][copies]
+        # (card id, player, winner, winning strength, trick, hash) from before each move
+        self._undo: List[Tuple[int, int, int, int, List[int], int]] = []
+
+        self.to_move = (state.player_index - len(state.current_trick)) % NUM_PLAYERS
+        for card in state.current_trick:
+            self._add_to_trick(card_id(card))
+            self.to_move = (self.to_move + 1) % NUM_PLAYERS
+        self.hash ^= _TO_MOVE_KEYS[self.to_move]
+
+    def to_state(self) -> PlayTricksState:
+        """
+        The immutable state for this position.  Hands are CompactHands if any of the original state's were, and
+        otherwise tuples of cards in sorted order.
+        """
+        if self.compact_hands:
+            hands = tuple(CompactHand.from_counts(counts) for counts in self.counts)
+        else:
+            hands = tuple(
+                tuple(card_from_id(id_) for id_, copies in enumerate(counts) for _ in range(copies))
+                for counts in self.counts
+            )
+        winner_index, winning_card, led_suit = None, None, None
+        if self.trick:
+            leader = (self.to_move - len(self.trick)) % NUM_PLAYERS
+            winner_index = self.winner
+            winning_card = card_from_id(self.trick[(self.winner - leader) % NUM_PLAYERS])
+            led_suit = _SUITS[CARD_SUITS[self.trick[0]]]
+        return PlayTricksState(
+            hands=hands,
+            players=self.players,
+            player_index=self.to_move,
+            trump=_SUITS[self.trump],
+            current_trick=tuple(card_from_id(id_) for id_ in self.trick),
+            winner_index=winner_index,
+            winning_card=winning_card,
+            led_suit=led_suit,
+            completed_tricks=self._initial_tricks
+            + tuple(
+                CompletedTrick(
+                    leader_index=(last_player + 1) % NUM_PLAYERS,
+                    cards=tuple(card_from_id(id_) for id_ in trick),
+                    winner_index=winner,
+                    points=points,
+                )
+                for trick, last_player, winner, points in self.completed_tricks
+            ),
+            team_points=(self.team_points[0], self.team_points[1]),
+        )
+
+    def is_over(self) -> bool:
+        return not self.cards_left and not self.trick
+
+    def points_left(self) -> int:
+        """
+        Trick points still to be taken, including those of the trick in progress and the last trick bonus.
+        """
+        trick = sum(CARD_POINTS[id_] for id_ in self.trick)
+        return self.points_in_hands + trick + (LAST_TRICK_POINTS if self.cards_left or self.trick else 0)
+
+    def strength(self, id_: int) -> int:
+        suit = CARD_SUITS[id_]
+        if suit == self.trump:
+            return 2 * NUM_RANKS + CARD_RANKS[id_]
+        elif suit == CARD_SUITS[self.trick[0]]:
+            return NUM_RANKS + CARD_RANKS[id_]
+        return CARD_RANKS[id_]
+
+    def legal_moves(self) -> List[int]:
+        """
+        The distinct card ids the player to move may play, in sorted order, by the same rules as
+        PlayTricksState.legal_moves.
+        """
+        counts = self.counts[self.to_move]
+        if not self.trick:
+            return [id_ for id_ in range(NUM_DISTINCT_CARDS) if counts[id_]]
+
+        led = CARD_SUITS[self.trick[0]] * NUM_RANKS
+        matching = [id_ for id_ in range(led, led + NUM_RANKS) if counts[id_]]
+        if not matching:
+            trump = self.trump * NUM_RANKS
+            matching = [id_ for id_ in range(trump, trump + NUM_RANKS) if counts[id_]]
+            if not matching:
+                return [id_ for id_ in range(NUM_DISTINCT_CARDS) if counts[id_]]
+        winning = [id_ for id_ in matching if self.strength(id_) > self.winning_strength]
+        return winning or matching
+
+    def make_move(self, id_: int) -> int:
+        """
+        Plays a card for the player to move.  Returns the points the first team (players 0 and 2) took if this card
+        completed a trick.
+        """
+        # Written out with locals rather than through helper methods, since this runs at every node of a search
+        player = self.to_move
+        counts = self.counts[player]
+        copies = counts[id_]
+        counts[id_] = copies - 1
+        self.held[id_] -= 1
+        self.cards_left -= 1
+        self.points_in_hands -= CARD_POINTS[id_]
+        trick = self.trick
+        self._undo.append((id_, player, self.winner, self.winning_strength, trick, self.hash))
+        hand_keys = _HAND_KEYS[player][id_]
+        hash_ = self.hash ^ hand_keys[copies] ^ hand_keys[copies - 1] ^ _TO_MOVE_KEYS[player]
+
+        suit = CARD_SUITS[id_]
+        if suit == self.trump:
+            strength = 2 * NUM_RANKS + CARD_RANKS[id_]
+        elif not trick or suit == CARD_SUITS[trick[0]]:
+            strength = NUM_RANKS + CARD_RANKS[id_]
+        else:
+            strength = CARD_RANKS[id_]
+        if strength > self.winning_strength:
+            self.winning_strength = strength
+            self.winner = player
+
+        if len(trick) < NUM_PLAYERS - 1:
+            self.trick = trick + [id_]
+            next_player = (player + 1) % NUM_PLAYERS
+            self.to_move = next_player
+            self.hash = hash_ ^ _TRICK_KEYS[len(trick)][id_] ^ _TO_MOVE_KEYS[next_player]
+            return 0
+
+        # The trick is complete, so its cards leave the hash along with the earlier cards' keys
+        trick = trick + [id_]
+        points = CARD_POINTS[trick[0]] + CARD_POINTS[trick[1]] + CARD_POINTS[trick[2]] + CARD_POINTS[id_]
+        if not self.cards_left:
+            points += LAST_TRICK_POINTS
+        hash_ ^= _TRICK_KEYS[0][trick[0]] ^ _TRICK_KEYS[1][trick[1]] ^ _TRICK_KEYS[2][trick[2]]
+        winner = self.winner
+        self.team_points[winner % 2] += points
+        self.completed_tricks.append((trick, player, winner, points))
+        self.to_move = winner
+        self.hash = hash_ ^ _TO_MOVE_KEYS[winner]
+        self.trick = []
+        self.winning_strength = -1
+        return points if winner % 2 == 0 else 0
+
+    def unmake_move(self) -> int:
+        """
+        Takes back the most recent move, returning the card id it played.
+        """
+        id_, player, self.winner, self.winning_strength, trick, self.hash = self._undo.pop()
+        if not self.trick:
+            _, _, trick_winner, points = self.completed_tricks.pop()
+            self.team_points[trick_winner % 2] -= points
+        self.trick = trick
+        self.to_move = player
+        self.counts[player][id_] += 1
+        self.held[id_] += 1
+        self.cards_left += 1
+        self.points_in_hands += CARD_POINTS[id_]
+        return id_
+
+    def _add_to_trick(self, id_: int) -> None:
+        self.hash ^= _TRICK_KEYS[len(self.trick)][id_]
+        self.trick = self.trick + [id_]
+        strength = self.strength(id_)
+        if strength > self.winning_strength:
+            self.winning_strength = strength
+            self.winner = self.to_move
+
+
+def random_playout(state: PlayTricksState, rng: Optional[random.Random] = None) -> Tuple[int, int]:
+    """
+    Plays the rest of the hand with a uniformly random legal card at each turn, returning each team's trick points
+    for the whole hand.
+    """
+    rng = rng or random.Random()
+    search_state = SearchState(state)
+    while not search_state.is_over():
+        search_state.make_move(rng.choice(search_state.legal_moves()))
+    return search_state.team_points[0], search_state.team_points[1]
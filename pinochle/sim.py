@@ -0,0 +1,282 @@
+"""
+Headless self-play:  bots play whole hands of PinochleGame, through bidding, trump, passing, meld, and tricks, for bot
+tuning and rule regression.  Each seat has a Policy that makes its decisions.
+
+Hand i of a run is dealt and played from its own random.Random seeded from (seed, i), so a run gives the same results
+however many worker processes share it.  The first bid rotates with the hand number.
+
+    python -m pinochle.sim --hands 20000 --workers 8
+"""
+import argparse
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import NamedTuple, Tuple, Optional, Sequence, List
+
+from pinochle.cards import Card, CardDeck, Suit, Rank
+from pinochle.compact_hand import CompactHand
+from pinochle.pinochle_game import PinochleGame, GameState
+from pinochle.scoring import score_meld, score_meld_all_trumps
+
+SEATS = ("north", "east", "south", "west")
+MAX_BID = 60
+PASS_SIZE = 4
+
+
+class Policy(ABC):
+    """
+    A bot's decisions.  Policies are handed the whole game, but a fair policy only looks at its own hand and what is
+    public.  They must pickle to run in worker processes, so keep any state in the rng passed in rather than on self.
+    """
+
+    @abstractmethod
+    def bid(self, game: PinochleGame, player: str, rng: random.Random) -> Optional[int]:
+        """
+        A bid above game.bidding.current_bid, or None to pass.
+        """
+
+    @abstractmethod
+    def select_trump(self, game: PinochleGame, player: str, rng: random.Random) -> Suit:
+        pass
+
+    @abstractmethod
+    def cards_to_pass(self, game: PinochleGame, player: str, rng: random.Random) -> Tuple[Card, Card, Card, Card]:
+        pass
+
+    @abstractmethod
+    def play_card(self, game: PinochleGame, player: str, rng: random.Random) -> Card:
+        pass
+
+
+class RandomPolicy(Policy):
+    def __init__(self, bid_probability: float = 0.5) -> None:
+        self.bid_probability = bid_probability
+
+    def bid(self, game: PinochleGame, player: str, rng: random.Random) -> Optional[int]:
+        next_bid = game.bidding.current_bid + 1
+        if next_bid <= MAX_BID and rng.random() < self.bid_probability:
+            return next_bid
+        return None
+
+    def select_trump(self, game: PinochleGame, player: str, rng: random.Random) -> Suit:
+        return rng.choice(tuple(Suit))
+
+    def cards_to_pass(self, game: PinochleGame, player: str, rng: random.Random) -> Tuple[Card, Card, Card, Card]:
+        card_1, card_2, card_3, card_4 = rng.sample(tuple(_hand(game, player)), k=PASS_SIZE)
+        return card_1, card_2, card_3, card_4
+
+    def play_card(self, game: PinochleGame, player: str, rng: random.Random) -> Card:
+        return rng.choice(game.tricks.legal_moves())
+
+
+class HeuristicPolicy(Policy):
+    """
+    Bids up to its best meld plus expected_trick_points, names the trump with the most meld, passes trump and aces to
+    the bid winner, leads its highest card, and follows with its lowest legal card.
+    """
+
+    def __init__(self, expected_trick_points: int = 12) -> None:
+        self.expected_trick_points = expected_trick_points
+
+    def bid(self, game: PinochleGame, player: str, rng: random.Random) -> Optional[int]:
+        best_meld = max(meld.score() for meld in score_meld_all_trumps(_hand(game, player)).values())
+        next_bid = game.bidding.current_bid + 1
+        return next_bid if next_bid <= best_meld + self.expected_trick_points else None
+
+    def select_trump(self, game: PinochleGame, player: str, rng: random.Random) -> Suit:
+        melds = score_meld_all_trumps(_hand(game, player))
+        suit_lengths = [0] * len(Suit)
+        for card in _hand(game, player):
+            suit_lengths[card.suit.ordinal] += 1
+        return max(Suit, key=lambda trump: (melds[trump].score(), suit_lengths[trump.ordinal]))
+
+    def cards_to_pass(self, game: PinochleGame, player: str, rng: random.Random) -> Tuple[Card, Card, Card, Card]:
+        passing_to_bid_winner = game.state == GameState.PASSING_TO_BID_WINNER
+        cards = sorted(
+            _hand(game, player), key=lambda card: _pass_priority(card, game.trump), reverse=passing_to_bid_winner
+        )
+        return cards[0], cards[1], cards[2], cards[3]
+
+    def play_card(self, game: PinochleGame, player: str, rng: random.Random) -> Card:
+        legal_moves = game.tricks.legal_moves()
+        if game.tricks.current_trick:
+            return min(legal_moves, key=lambda card: (card.suit is game.trump, card.rank.ordinal))
+        return max(legal_moves, key=lambda card: (card.rank.ordinal, card.suit is not game.trump))
+
+
+def _hand(game: PinochleGame, player: str):
+    return game.hands[game.players.index(player)]
+
+
+def _pass_priority(card: Card, trump: Suit) -> Tuple[bool, bool, int]:
+    return card.suit is trump, card.rank is Rank.ACE, card.rank.ordinal
+
+
+class HandResult(NamedTuple):
+    """
+    The outcome of one hand.  Team results are indexed by team:  0 is north and south, 1 is east and west.
+    """
+
+    hand_number: int
+    bid_winner: str
+    bid: int
+    trump: Suit
+    meld: Tuple[int, int]
+    trick_points: Tuple[int, int]
+    scores: Tuple[int, int]
+
+    def made_bid(self) -> bool:
+        return self.scores[SEATS.index(self.bid_winner) % 2] >= 0
+
+
+class SimulationResult(NamedTuple):
+    hands: Tuple[HandResult, ...]
+    elapsed: float
+
+    def hands_per_second(self) -> float:
+        return len(self.hands) / self.elapsed if self.elapsed else 0.0
+
+    def average_scores(self) -> Tuple[float, float]:
+        count = len(self.hands) or 1
+        return (
+            sum(hand.scores[0] for hand in self.hands) / count,
+            sum(hand.scores[1] for hand in self.hands) / count,
+        )
+
+
+def play_hand(
+    hand_number: int, policies: Sequence[Policy], seed: int = 0, record: Optional[List[PinochleGame]] = None
+) -> HandResult:
+    """
+    Plays one hand with policies[i] in SEATS[i].  Pass a list as record to collect every state the game went through.
+    """
+    rng = random.Random(f"{seed}:{hand_number}")
+    first_bidder = hand_number % len(SEATS)
+    players = SEATS[first_bidder:] + SEATS[:first_bidder]
+    policy_of = dict(zip(SEATS, policies))
+    game = PinochleGame.new_game(players, hands=tuple(CompactHand.from_cards(hand) for hand in CardDeck.deal(rng)))
+
+    meld = None
+    while game.state != GameState.COMPLETE:
+        if record is not None:
+            record.append(game)
+        player = game.current_player()
+        policy = policy_of[player]
+        if game.state == GameState.BIDDING:
+            if game.bidding.get_winner() is not None:
+                game = game.select_trump(player, policy.select_trump(game, player, rng))
+            else:
+                bid = policy.bid(game, player, rng)
+                game = game.pass_bidding(player) if bid is None else game.bid(player, bid)
+        elif game.state in (GameState.PASSING_TO_BID_WINNER, GameState.PASSING_TO_PARTNER):
+            destination = players[(players.index(player) + 2) % 4]
+            game = game.pass_cards(player, destination, policy.cards_to_pass(game, player, rng))
+            if game.state == GameState.PLAYING_TRICKS:
+                meld = _team_meld(game)
+        else:
+            game = game.play_card(player, policy.play_card(game, player, rng))
+    if record is not None:
+        record.append(game)
+
+    return _score_hand(hand_number, game, meld)
+
+
+def _team_meld(game: PinochleGame) -> Tuple[int, int]:
+    team_meld = [0, 0]
+    for player, hand in zip(game.players, game.hands):
+        team_meld[SEATS.index(player) % 2] += score_meld(hand, game.trump)
+    return team_meld[0], team_meld[1]
+
+
+def _score_hand(hand_number: int, game: PinochleGame, meld: Tuple[int, int]) -> HandResult:
+    """
+    A team keeps its meld only if it takes a trick.  The bidding team scores meld plus trick points if that makes the
+    bid, and loses the bid otherwise.
+    """
+    tricks = game.tricks
+    trick_points = [0, 0]
+    took_trick = [False, False]
+    for trick in tricks.completed_tricks:
+        team = SEATS.index(game.players[trick.winner_index]) % 2
+        trick_points[team] += trick.points
+        took_trick[team] = True
+
+    bid_winner = game.bidding.get_winner()
+    bid = game.bidding.current_bid
+    scores = [meld[team] + trick_points[team] if took_trick[team] else 0 for team in range(2)]
+    bidding_team = SEATS.index(bid_winner) % 2
+    if scores[bidding_team] < bid:
+        scores[bidding_team] = -bid
+
+    return HandResult(
+        hand_number=hand_number,
+        bid_winner=bid_winner,
+        bid=bid,
+        trump=game.trump,
+        meld=meld,
+        trick_points=(trick_points[0], trick_points[1]),
+        scores=(scores[0], scores[1]),
+    )
+
+
+def _play_hands(start: int, stop: int, policies: Sequence[Policy], seed: int) -> Tuple[HandResult, ...]:
+    return tuple(play_hand(hand_number, policies, seed) for hand_number in range(start, stop))
+
+
+def simulate(
+    num_hands: int,
+    policies: Optional[Sequence[Policy]] = None,
+    seed: int = 0,
+    executor: Optional[Executor] = None,
+    chunk_size: int = 200,
+) -> SimulationResult:
+    """
+    Plays num_hands hands, heuristic bots in every seat by default.  Pass a ProcessPoolExecutor as executor to spread
+    chunks of chunk_size hands over processes; without one every hand runs in this process.
+    """
+    policies = tuple(policies or (HeuristicPolicy(),) * len(SEATS))
+    if len(policies) != len(SEATS):
+        raise ValueError(f"Need a policy for each of the {len(SEATS)} seats, got {len(policies)}")
+    chunks = [(start, min(start + chunk_size, num_hands)) for start in range(0, num_hands, chunk_size)]
+
+    start_time = time.perf_counter()
+    if executor is None:
+        results = [_play_hands(start, stop, policies, seed) for start, stop in chunks]
+    else:
+        futures = [executor.submit(_play_hands, start, stop, policies, seed) for start, stop in chunks]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start_time
+
+    return SimulationResult(hands=tuple(hand for chunk in results for hand in chunk), elapsed=elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play pinochle hands between bots and report the throughput")
+    parser.add_argument("--hands", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--policy", choices=("heuristic", "random"), default="heuristic")
+    args = parser.parse_args()
+
+    policy = HeuristicPolicy() if args.policy == "heuristic" else RandomPolicy()
+    policies = (policy,) * len(SEATS)
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            result = simulate(args.hands, policies, seed=args.seed, executor=executor)
+    else:
+        result = simulate(args.hands, policies, seed=args.seed)
+
+    north_south, east_west = result.average_scores()
+    made = sum(hand.made_bid() for hand in result.hands)
+    print(
+        f"{len(result.hands)} hands in {result.elapsed:.2f} s, {result.hands_per_second():.0f} hands/s "
+        f"({result.hands_per_second() * 60:.0f} per minute)"
+    )
+    print(
+        f"average score north/south {north_south:.2f}, east/west {east_west:.2f}, bids made {made / len(result.hands):.1%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,42 @@
-from functools import reduce
-from typing import Tuple
+from typing import Tuple, Callable
 
-from pinochle.cards import Card, Suit
+from pinochle.cards import Card, Suit, NUM_RANKS
+
+
+def card_strength_key(led_suit: Suit, trump: Suit) -> Callable[[Card], int]:
+    """
+    Returns a key function giving each card's strength within a trick:  trump beats the led suit, which beats
+    everything else, with rank breaking ties within a suit.  Equal strengths mean neither card beats the other, so the
+    first one played keeps the trick.
+    """
+    return _CARD_STRENGTH_KEYS[led_suit.ordinal][trump.ordinal]
+
+
+def _make_card_strength_key(led_suit: Suit, trump: Suit) -> Callable[[Card], int]:
+    def card_strength(card: Card) -> int:
+        if card.suit is trump:
+            return 2 * NUM_RANKS + card.rank.ordinal
+        elif card.suit is led_suit:
+            return NUM_RANKS + card.rank.ordinal
+        return card.rank.ordinal
+
+    return card_strength
+
+
+_CARD_STRENGTH_KEYS = tuple(tuple(_make_card_strength_key(led_suit, trump) for trump in Suit) for led_suit in Suit)
 
 
 def get_trick_winning_card(cards: Tuple[Card, ...], trump: Suit) -> Card:
-    return reduce(lambda card0, card1: card1 if second_card_wins(card0, card1, trump) else card0, cards[1:], cards[0])
+    return max(cards, key=card_strength_key(cards[0].suit, trump))
 
 
 def get_trick_winner_index(cards: Tuple[Card, ...], trump: Suit) -> int:
-    return cards.index(get_trick_winning_card(cards, trump))
+    card_strength = card_strength_key(cards[0].suit, trump)
+    return max(range(len(cards)), key=lambda index: card_strength(cards[index]))
 
 
 def second_card_wins(card0: Card, card1: Card, trump: Suit) -> bool:
-    if card0.suit == card1.suit:
-        return card1.rank > card0.rank
+    if card0.suit is card1.suit:
+        return card1.rank.ordinal > card0.rank.ordinal
     else:
-        return card1.suit == trump
+        return card1.suit is trump
@@ -1,19 +1,57 @@
-from typing import Tuple
+from collections import Counter
+from typing import Tuple, Sequence
 
-from pinochle.cards import Card
+from pinochle.cards import Card, NUM_DISTINCT_CARDS, NUM_RANKS
+from pinochle.compact_hand import CompactHand, Hand
 
 
 class InvalidCardRemoval(Exception):
     pass
 
 
-def remove_cards_from_hand(hand: Tuple[Card, ...], cards_to_remove: Tuple[Card, ...]) -> Tuple[Card, ...]:
+def remove_cards_from_hand(hand: Hand, cards_to_remove: Tuple[Card, ...]) -> Hand:
+    """
+    Removes one copy of each card in cards_to_remove, taking the earliest copies in hand and keeping the order of the
+    rest.  Raises InvalidCardRemoval naming the first card that runs out.
+    """
+    if isinstance(hand, CompactHand):
+        try:
+            return hand.remove_cards(cards_to_remove)
+        except ValueError as e:
+            raise InvalidCardRemoval(e.args[0]) from e
+
     if not cards_to_remove:
         return hand
-    try:
-        index_to_remove = hand.index(cards_to_remove[0])
-    except ValueError as e:
-        raise InvalidCardRemoval(f"{cards_to_remove[0]} is not in hand")
 
-    new_hand = hand[:index_to_remove] + hand[index_to_remove + 1 :]
-    return remove_cards_from_hand(hand=new_hand, cards_to_remove=cards_to_remove[1:])
+    # Counted by card id (see cards.card_id), which is much cheaper than hashing cards
+    to_remove = [0] * NUM_DISTINCT_CARDS
+    for card in cards_to_remove:
+        to_remove[card.suit.ordinal * NUM_RANKS + card.rank.ordinal] += 1
+    new_hand = []
+    for card in hand:
+        id_ = card.suit.ordinal * NUM_RANKS + card.rank.ordinal
+        if to_remove[id_]:
+            to_remove[id_] -= 1
+        else:
+            new_hand.append(card)
+    if len(new_hand) != len(hand) - len(cards_to_remove):
+        raise InvalidCardRemoval(f"{_first_missing_card(hand, cards_to_remove)} is not in hand")
+    return tuple(new_hand)
+
+
+def remove_cards_from_hands(hands: Tuple[Hand, ...], cards_to_remove: Sequence[Tuple[Card, ...]]) -> Tuple[Hand, ...]:
+    """
+    Removes cards from every hand at once, cards_to_remove[i] coming out of hands[i].
+    """
+    if len(hands) != len(cards_to_remove):
+        raise ValueError(f"Expected cards to remove for {len(hands)} hands, got {len(cards_to_remove)}")
+    return tuple(remove_cards_from_hand(hand, cards) for hand, cards in zip(hands, cards_to_remove))
+
+
+def _first_missing_card(hand: Tuple[Card, ...], cards_to_remove: Tuple[Card, ...]) -> Card:
+    held = Counter(hand)
+    for card in cards_to_remove:
+        if not held[card]:
+            return card
+        held[card] -= 1
+    raise AssertionError("Every card to remove is in hand")
@@ -0,0 +1,272 @@
+"""
+A compact binary encoding of card lists, whole games and game views, for clients that ask for it instead of JSON.  Every card is
+one byte, its card id (see cards.card_id), and everything else is packed with struct.  Like the JSON codec, decoding
+gives hands back as tuples of cards in the order they were written, or as compact hands once the game is playing
+tricks.
+
+A game is laid out as:
+
+    version, state, trump                                  3 bytes
+    4 players                                              length byte + UTF-8 name each
+    4 hands                                                count byte + card ids each
+    current bid, bidding player index, bidding trump       uint16 + 2 bytes
+    active bidders                                         count byte + seat indices
+    has tricks                                             1 byte, then if set:
+        player index, winner index, winning card, led suit 4 bytes
+        current trick                                      count byte + card ids
+        team points                                        2 bytes
+        completed tricks                                   count byte + (leader, 4 card ids, winner, points) each
+
+and the public view of a game (see game_deltas.public_view) as:
+
+    version, state, trump                                  3 bytes
+    event count, current bid                               2 uint16
+    4 players                                              length byte + UTF-8 name each
+    current player, bid winner                             seat index each
+    hand sizes                                             4 bytes
+    current trick                                          count byte + card ids
+    team points                                            2 bytes
+
+Optional values are written as 255 when absent.  Player names can be at most 255 bytes of UTF-8.
+"""
+import struct
+from typing import Any, Dict, Iterable, Optional, Tuple, List
+
+from pinochle.bidding import BiddingState
+from pinochle.cards import Card, Suit, card_id, card_from_id
+from pinochle.compact_hand import CompactHand
+from pinochle.game_deltas import cards_json
+from pinochle.pinochle_game import PinochleGame, GameState
+from pinochle.play_tricks import PlayTricksState, CompletedTrick
+
+MEDIA_TYPE = "application/vnd.pinochle+binary"
+VERSION = 1
+MAX_NAME_BYTES = 255
+
+_NONE = 255
+_SUITS = tuple(Suit)
+_STATES = tuple(GameState)
+_STATE_ORDINALS = {state: ordinal for ordinal, state in enumerate(_STATES)}
+_HEADER = struct.Struct("BBB")
+_BIDDING = struct.Struct("<HBB")
+_TRICKS = struct.Struct("BBBB")
+_COMPLETED_TRICK = struct.Struct("BBBBBBB")
+_VIEW_COUNTS = struct.Struct("<HH")
+
+
+class WireFormatError(ValueError):
+    pass
+
+
+def encode_cards(cards: Iterable[Card]) -> bytes:
+    return bytes(card_id(card) for card in cards)
+
+
+def decode_cards(data: bytes) -> Tuple[Card, ...]:
+    try:
+        return tuple(card_from_id(id_) for id_ in data)
+    except IndexError:
+        raise WireFormatError("Card ids must be below 24") from None
+
+
+def encode_game(game: PinochleGame) -> bytes:
+    out = bytearray(_HEADER.pack(VERSION, _STATE_ORDINALS[game.state], _suit_byte(game.trump)))
+    _append_players(out, game.players)
+    for hand in game.hands:
+        _append_cards(out, hand)
+
+    bidding = game.bidding
+    out += _BIDDING.pack(bidding.current_bid, bidding.current_player_index, _suit_byte(bidding.trump))
+    out.append(len(bidding.active_players))
+    out += bytes(game.players.index(player) for player in bidding.active_players)
+
+    tricks = game.tricks
+    if tricks is None:
+        out.append(0)
+        return bytes(out)
+    out.append(1)
+    out += _TRICKS.pack(
+        tricks.player_index,
+        _NONE if tricks.winner_index is None else tricks.winner_index,
+        _NONE if tricks.winning_card is None else card_id(tricks.winning_card),
+        _suit_byte(tricks.led_suit),
+    )
+    _append_cards(out, tricks.current_trick)
+    out += bytes(tricks.team_points)
+    out.append(len(tricks.completed_tricks))
+    for trick in tricks.completed_tricks:
+        out += _COMPLETED_TRICK.pack(trick.leader_index, *map(card_id, trick.cards), trick.winner_index, trick.points)
+    return bytes(out)
+
+
+def decode_game(data: bytes) -> PinochleGame:
+    try:
+        return _Reader(data).game()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise WireFormatError(f"Malformed game: {e}") from e
+
+
+def encode_view(game: PinochleGame, event_count: int) -> bytes:
+    out = bytearray(_HEADER.pack(VERSION, _STATE_ORDINALS[game.state], _suit_byte(game.trump)))
+    out += _VIEW_COUNTS.pack(event_count, game.bidding.current_bid)
+    _append_players(out, game.players)
+    out.append(_seat_byte(game.players, game.current_player()))
+    out.append(_seat_byte(game.players, game.bidding.get_winner()))
+    out += bytes(len(hand) for hand in game.hands)
+    tricks = game.tricks
+    _append_cards(out, () if tricks is None else tricks.current_trick)
+    out += bytes((0, 0) if tricks is None else tricks.team_points)
+    return bytes(out)
+
+
+def decode_view(data: bytes) -> Dict[str, Any]:
+    """
+    The view as game_deltas.public_view gives it.
+    """
+    try:
+        return _Reader(data).view()
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise WireFormatError(f"Malformed view: {e}") from e
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._offset = 0
+
+    def game(self) -> PinochleGame:
+        state, trump = self._header()
+        players = self._players()
+        hands = tuple(self._cards() for _ in range(4))
+
+        current_bid, current_player_index, bidding_trump = self._unpack(_BIDDING)
+        active_players = tuple(players[seat] for seat in self._take(self._byte()))
+        bidding = BiddingState(
+            current_bid=current_bid,
+            active_players=active_players,
+            current_player_index=current_player_index,
+            trump=_suit(bidding_trump),
+        )
+
+        tricks = None
+        if self._byte():
+            hands = tuple(CompactHand.from_cards(hand) for hand in hands)
+            tricks = self._tricks(hands, players, _suit(trump))
+        self._check_end("game")
+        return PinochleGame(
+            state=_STATES[state], players=players, hands=hands, bidding=bidding, trump=_suit(trump), tricks=tricks
+        )
+
+    def view(self) -> Dict[str, Any]:
+        state, trump = self._header()
+        event_count, current_bid = self._unpack(_VIEW_COUNTS)
+        players = self._players()
+        current_player, bid_winner = self._take(2)
+        hand_sizes = list(self._take(4))
+        current_trick = self._cards()
+        team_points = list(self._take(2))
+        self._check_end("view")
+        return {
+            "event_count": event_count,
+            "players": players,
+            "state": _STATES[state].value,
+            "current_player": _seat_name(players, current_player),
+            "current_bid": current_bid,
+            "bid_winner": _seat_name(players, bid_winner),
+            "trump": None if trump == _NONE else _SUITS[trump].value,
+            "hand_sizes": hand_sizes,
+            "current_trick": cards_json(current_trick),
+            "team_points": team_points,
+        }
+
+    def _header(self) -> Tuple[int, int]:
+        version, state, trump = self._unpack(_HEADER)
+        if version != VERSION:
+            raise WireFormatError(f"Unsupported wire format version {version}")
+        return state, trump
+
+    def _players(self) -> Tuple[str, ...]:
+        return tuple(self._take(self._byte()).decode() for _ in range(4))
+
+    def _check_end(self, what: str) -> None:
+        if self._offset != len(self._data):
+            raise WireFormatError(f"{len(self._data) - self._offset} unexpected bytes after the {what}")
+
+    def _tricks(self, hands, players, trump: Suit) -> PlayTricksState:
+        player_index, winner_index, winning_card, led_suit = self._unpack(_TRICKS)
+        current_trick = self._cards()
+        team_points = tuple(self._take(2))
+        completed_tricks: List[CompletedTrick] = []
+        for _ in range(self._byte()):
+            leader_index, *ids, trick_winner, points = self._unpack(_COMPLETED_TRICK)
+            completed_tricks.append(
+                CompletedTrick(
+                    leader_index=leader_index,
+                    cards=tuple(map(card_from_id, ids)),
+                    winner_index=trick_winner,
+                    points=points,
+                )
+            )
+        return PlayTricksState(
+            hands=hands,
+            players=players,
+            player_index=player_index,
+            trump=trump,
+            current_trick=current_trick,
+            winner_index=None if winner_index == _NONE else winner_index,
+            winning_card=None if winning_card == _NONE else card_from_id(winning_card),
+            led_suit=_suit(led_suit),
+            completed_tricks=tuple(completed_tricks),
+            team_points=team_points,
+        )
+
+    def _byte(self) -> int:
+        value = self._data[self._offset]
+        self._offset += 1
+        return value
+
+    def _take(self, count: int) -> bytes:
+        if self._offset + count > len(self._data):
+            raise WireFormatError("Game data ends early")
+        value = self._data[self._offset : self._offset + count]
+        self._offset += count
+        return value
+
+    def _unpack(self, layout: struct.Struct) -> tuple:
+        value = layout.unpack_from(self._data, self._offset)
+        self._offset += layout.size
+        return value
+
+    def _cards(self) -> Tuple[Card, ...]:
+        return decode_cards(self._take(self._byte()))
+
+
+def _append_players(out: bytearray, players: Iterable[str]) -> None:
+    for player in players:
+        name = player.encode()
+        if len(name) > MAX_NAME_BYTES:
+            raise WireFormatError(f"Player names can be at most {MAX_NAME_BYTES} bytes of UTF-8")
+        out.append(len(name))
+        out += name
+
+
+def _append_cards(out: bytearray, cards: Iterable[Card]) -> None:
+    encoded = encode_cards(cards)
+    out.append(len(encoded))
+    out += encoded
+
+
+def _seat_byte(players: Tuple[str, ...], player: Optional[str]) -> int:
+    return _NONE if player is None else players.index(player)
+
+
+def _seat_name(players: Tuple[str, ...], seat: int) -> Optional[str]:
+    return None if seat == _NONE else players[seat]
+
+
+def _suit_byte(suit: Optional[Suit]) -> int:
+    return _NONE if suit is None else suit.ordinal
+
+
+def _suit(value: int) -> Optional[Suit]:
+    return None if value == _NONE else _SUITS[value]
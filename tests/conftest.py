@@ -1,8 +1,21 @@
+import random
 from typing import Tuple
 
 import pytest
 
-from pinochle.cards import Card, Suit, Rank
+from pinochle.cards import Card, Suit, Rank, CardDeck
+from pinochle.game_events import (
+    GameEvent,
+    GameStarted,
+    BidPlaced,
+    BiddingPassed,
+    TrumpSelected,
+    CardsPassed,
+    CardPlayed,
+    apply_event,
+    replay,
+)
+from pinochle.pinochle_game import GameState
 
 
 @pytest.fixture(scope="session")
@@ -28,3 +41,26 @@ def all_spades() -> Tuple[Card, ...]:
 @pytest.fixture(scope="session")
 def sorted_hands(all_clubs, all_diamonds, all_hearts, all_spades) -> Tuple[Tuple[Card, ...], ...]:
     return all_clubs, all_diamonds, all_hearts, all_spades
+
+
+@pytest.fixture(scope="session")
+def full_game_events() -> Tuple[GameEvent, ...]:
+    """
+    Every event of one complete game:  a bids 25 and takes it in hearts, and each player always plays their lowest
+    legal card.
+    """
+    cards = random.Random(0).sample(CardDeck.all_cards(), k=48)
+    events = [
+        GameStarted(players=("a", "b", "c", "d"), hands=tuple(tuple(cards[i : i + 12]) for i in range(0, 48, 12)))
+    ]
+    events += [BidPlaced("a", 25), BiddingPassed("b"), BiddingPassed("c"), BiddingPassed("d")]
+    events += [TrumpSelected("a", Suit.HEARTS)]
+    game = replay(events)
+    events.append(CardsPassed("c", "a", game.hands[2][:4]))
+    game = apply_event(game, events[-1])
+    events.append(CardsPassed("a", "c", game.hands[0][:4]))
+    game = apply_event(game, events[-1])
+    while game.state == GameState.PLAYING_TRICKS:
+        events.append(CardPlayed(game.tricks.current_player(), game.tricks.legal_moves()[0]))
+        game = apply_event(game, events[-1])
+    return tuple(events)
@@ -0,0 +1,91 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pinochle.bidding import OPENING_BID
+from pinochle.cards import CardDeck, Suit
+from pinochle.scoring import score_meld_all_trumps
+from pinochle.sim import SEATS, MAX_BID
+
+np = pytest.importorskip("numpy")
+
+from pinochle.analysis.auction import (  # noqa: E402
+    run_auctions,
+    simulate_auctions,
+    MeldPolicy,
+    MonteCarloPolicy,
+    ThresholdPolicy,
+    _meld_by_trump,
+)
+from pinochle.batch_scoring import card_count_matrix  # noqa: E402
+
+MIXED_POLICIES = (MeldPolicy(), ThresholdPolicy(), MonteCarloPolicy(num_samples=4), MeldPolicy())
+
+
+@pytest.fixture(scope="module")
+def hands():
+    return [hand for seed in range(10) for hand in CardDeck.deal(seed)]
+
+
+@pytest.mark.parametrize(
+    "first_bidder, limits, expected_winner, expected_bid, expected_bids",
+    [
+        (0, (30, 0, 0, 0), "north", 25, 1),
+        (0, (28, 30, 0, 0), "east", 28, 4),
+        (2, (0, 0, 0, 0), "east", OPENING_BID, 0),
+        (3, (0, 0, 0, 40), "west", 25, 1),
+    ],
+)
+def test_run_auctions(first_bidder, limits, expected_winner, expected_bid, expected_bids) -> None:
+    states, num_bids = run_auctions([first_bidder], np.array([limits]))
+    assert states[0].get_winner() == expected_winner
+    assert states[0].current_bid == expected_bid
+    assert num_bids.tolist() == [expected_bids]
+
+
+def test_meld_policy_values_best_meld_plus_trick_points(hands) -> None:
+    counts = card_count_matrix(hands)
+    values = MeldPolicy(expected_trick_points=10).value_hands(counts, _meld_by_trump(counts), np.random.default_rng(0))
+    for hand, limit, trump in zip(hands, values.limits, values.trumps):
+        melds = score_meld_all_trumps(hand)
+        assert limit == max(meld.score() for meld in melds.values()) + 10
+        assert melds[tuple(Suit)[trump]].score() + 10 == limit
+
+
+def test_monte_carlo_policy_counts_on_its_own_meld_and_more(hands) -> None:
+    counts = card_count_matrix(hands)
+    meld = _meld_by_trump(counts)
+    policy = MonteCarloPolicy(num_samples=8)
+    values = policy.value_hands(counts, meld, np.random.default_rng(0))
+    assert np.all(values.limits >= meld.max(axis=1))
+    again = policy.value_hands(counts, meld, np.random.default_rng(0))
+    assert values.limits.tolist() == again.limits.tolist()
+
+
+def test_simulate_auctions_reports_every_deal() -> None:
+    results = simulate_auctions(500, MIXED_POLICIES, seed=3, chunk_size=128)
+    assert len(results.bids) == 500
+    assert results.first_bidders.tolist() == [deal % len(SEATS) for deal in range(500)]
+    assert np.all((results.bids >= OPENING_BID) & (results.bids <= MAX_BID))
+    # Every bid raises by one
+    assert results.num_bids.tolist() == (results.bids - OPENING_BID).tolist()
+
+    stats = results.stats()
+    assert stats.deals == 500
+    assert sum(stats.bid_counts.values()) == 500
+    assert sum(stats.win_rate_by_seat.values()) == pytest.approx(1)
+    assert sum(stats.trump_rate.values()) == pytest.approx(1)
+    assert stats.opening_bid_rate == pytest.approx(stats.bid_counts.get(OPENING_BID, 0) / 500)
+
+
+def test_results_do_not_depend_on_workers() -> None:
+    in_process = simulate_auctions(300, MIXED_POLICIES, seed=1, chunk_size=100)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        with_workers = simulate_auctions(300, MIXED_POLICIES, seed=1, executor=executor, chunk_size=100)
+    for column in ("winners", "bids", "trumps", "team_meld", "num_bids"):
+        assert getattr(in_process, column).tolist() == getattr(with_workers, column).tolist()
+
+
+def test_needs_a_policy_per_seat() -> None:
+    with pytest.raises(ValueError):
+        simulate_auctions(10, (MeldPolicy(),))
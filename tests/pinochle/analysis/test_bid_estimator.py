@@ -0,0 +1,85 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+import pytest
+
+from pinochle.analysis.bid_estimator import estimate_bid, best_bid, heuristic_trick_points
+from pinochle.cards import Card, Rank, Suit
+from pinochle.scoring import TOTAL_TRICK_POINTS
+
+
+@pytest.fixture(scope="module")
+def heart_heavy_hand() -> Tuple[Card, ...]:
+    return (
+        Card(Rank.ACE, Suit.HEARTS),
+        Card(Rank.TEN, Suit.HEARTS),
+        Card(Rank.KING, Suit.HEARTS),
+        Card(Rank.QUEEN, Suit.HEARTS),
+        Card(Rank.JACK, Suit.HEARTS),
+        Card(Rank.NINE, Suit.HEARTS),
+        Card(Rank.ACE, Suit.HEARTS),
+        Card(Rank.TEN, Suit.HEARTS),
+        Card(Rank.ACE, Suit.CLUBS),
+        Card(Rank.ACE, Suit.DIAMONDS),
+        Card(Rank.ACE, Suit.SPADES),
+        Card(Rank.NINE, Suit.CLUBS),
+    )
+
+
+def test_estimates_every_trump(heart_heavy_hand) -> None:
+    estimates = estimate_bid(heart_heavy_hand, num_samples=20)
+    assert set(estimates) == set(Suit)
+    for trump, estimate in estimates.items():
+        assert estimate.trump == trump
+        assert estimate.samples == 20
+        assert 0 <= estimate.trick_points <= TOTAL_TRICK_POINTS
+
+
+def test_best_bid_picks_the_long_suit(heart_heavy_hand) -> None:
+    estimate = best_bid(estimate_bid(heart_heavy_hand, num_samples=20))
+    assert estimate.trump == Suit.HEARTS
+    # A run in trump plus aces around is already 25 meld before the partner helps
+    assert estimate.meld >= 25
+
+
+def test_same_seed_same_estimate(heart_heavy_hand) -> None:
+    assert estimate_bid(heart_heavy_hand, num_samples=30, seed=7) == estimate_bid(
+        heart_heavy_hand, num_samples=30, seed=7
+    )
+
+
+def test_process_pool_matches_in_process(heart_heavy_hand) -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        pooled = estimate_bid(heart_heavy_hand, num_samples=40, seed=3, chunk_size=10, executor=executor)
+    assert pooled == estimate_bid(heart_heavy_hand, num_samples=40, seed=3, chunk_size=10)
+
+
+def test_time_budget_returns_partial_estimate(heart_heavy_hand) -> None:
+    estimates = estimate_bid(heart_heavy_hand, num_samples=1_000_000, time_budget=0.05)
+    samples = estimates[Suit.HEARTS].samples
+    assert 0 < samples < 1_000_000
+
+
+def test_time_budget_with_process_pool_returns_partial_estimate(heart_heavy_hand) -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        estimates = estimate_bid(
+            heart_heavy_hand, num_samples=1_000_000, time_budget=0.1, executor=executor, num_workers=2
+        )
+    assert 0 < estimates[Suit.HEARTS].samples < 1_000_000
+
+
+def test_spent_time_budget_with_process_pool_still_samples(heart_heavy_hand) -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        estimates = estimate_bid(heart_heavy_hand, num_samples=1000, time_budget=0, executor=executor)
+    assert estimates[Suit.HEARTS].samples >= 1
+
+
+def test_rejects_wrong_hand_size(heart_heavy_hand) -> None:
+    with pytest.raises(ValueError) as e:
+        estimate_bid(heart_heavy_hand[:11])
+    assert e.value.args[0] == "Bid estimates need a 12-card hand, got 11"
+
+
+def test_heuristic_trick_points_split_evenly_for_identical_holdings() -> None:
+    cards = (Card(Rank.ACE, Suit.CLUBS), Card(Rank.NINE, Suit.SPADES))
+    assert heuristic_trick_points(cards, cards, Suit.SPADES) == TOTAL_TRICK_POINTS / 2
@@ -0,0 +1,111 @@
+import itertools
+import random
+
+import pytest
+
+from pinochle.analysis.bid_estimator import card_trick_power, PASS_SIZE
+from pinochle.analysis.pass_optimizer import (
+    best_passes,
+    suggest_passes,
+    PassObjective,
+    TO_BID_WINNER,
+    TO_PARTNER,
+)
+from pinochle.cards import Card, CardDeck, Rank, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.passing_cards import PassingCards, IllegalPass
+from pinochle.scoring import score_meld
+from pinochle.utils import remove_cards_from_hand
+
+
+def _brute_force_scores(hand, trump, objective):
+    scores = {}
+    for cards in set(itertools.combinations(sorted(hand), PASS_SIZE)):
+        kept = remove_cards_from_hand(hand, cards)
+        scores[cards] = (
+            score_meld(list(kept), trump)
+            + objective.kept_power * sum(card_trick_power(card, trump) for card in kept)
+            + objective.passed_power * sum(card_trick_power(card, trump) for card in cards)
+        )
+    return scores
+
+
+def _hands(seed):
+    rng = random.Random(seed)
+    deal = CardDeck.deal(rng)
+    return rng.choice(list(Suit)), deal[0], deal[1] + deal[2][:PASS_SIZE]
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("direction", [TO_BID_WINNER, TO_PARTNER])
+def test_best_passes_match_brute_force(seed, direction) -> None:
+    trump, twelve_cards, sixteen_cards = _hands(seed)
+    hand = twelve_cards if direction is TO_BID_WINNER else sixteen_cards
+    scores = _brute_force_scores(hand, trump, direction)
+
+    search = best_passes(hand, trump, direction, top_k=3, time_budget=None)
+
+    assert search.complete
+    assert [candidate.score for candidate in search.candidates] == pytest.approx(
+        sorted(scores.values(), reverse=True)[:3]
+    )
+    for candidate in search.candidates:
+        assert candidate.score == pytest.approx(scores[candidate.cards])
+        assert candidate.meld == score_meld(list(remove_cards_from_hand(hand, candidate.cards)), trump)
+
+
+def test_every_distinct_pass_is_returned_once() -> None:
+    nine, king, ace = Card(Rank.NINE, Suit.CLUBS), Card(Rank.KING, Suit.CLUBS), Card(Rank.ACE, Suit.CLUBS)
+    # Only 6 distinct passes of four from two each of three cards
+    hand = (nine, nine, king, king, ace, ace)
+    search = best_passes(hand, Suit.HEARTS, top_k=100, time_budget=None)
+    assert len(search.candidates) == 6
+    assert len({candidate.cards for candidate in search.candidates}) == 6
+    assert search.candidates[0].cards.count(ace) == 2
+
+
+def test_compact_hands_search_the_same() -> None:
+    trump, hand, _ = _hands(0)
+    assert best_passes(CompactHand.from_cards(hand), trump, top_k=5, time_budget=None) == best_passes(
+        hand, trump, top_k=5, time_budget=None
+    )
+
+
+def test_out_of_time_returns_the_best_found_so_far() -> None:
+    trump, _, hand = _hands(1)
+    search = best_passes(hand, trump, TO_PARTNER, top_k=50, time_budget=0)
+    assert not search.complete
+    assert search.candidates
+
+
+@pytest.mark.parametrize(
+    "objective, top_k, hand",
+    [
+        (PassObjective(kept_power=-1.0, passed_power=1.0), 1, _hands(0)[1]),
+        (TO_BID_WINNER, 0, _hands(0)[1]),
+        (TO_BID_WINNER, 1, _hands(0)[1][:3]),
+    ],
+)
+def test_best_passes_rejects_bad_arguments(objective, top_k, hand) -> None:
+    with pytest.raises(ValueError):
+        best_passes(hand, Suit.HEARTS, objective, top_k)
+
+
+def test_suggested_passes_can_be_made_in_turn() -> None:
+    trump, partner_hand, bid_winner_hand = _hands(2)
+    passing = PassingCards(
+        bid_winner="north", partner="south", bid_winner_hand=bid_winner_hand[:12], partner_hand=partner_hand
+    )
+    for source, destination in (("south", "north"), ("north", "south")):
+        suggestion = suggest_passes(passing, trump, time_budget=None)
+        assert (suggestion.source, suggestion.destination) == (source, destination)
+        passing = passing.pass_cards(source, destination, suggestion.search.candidates[0].cards)
+
+
+def test_no_pass_is_due_with_uneven_hands() -> None:
+    _, partner_hand, bid_winner_hand = _hands(3)
+    passing = PassingCards(
+        bid_winner="north", partner="south", bid_winner_hand=bid_winner_hand[:13], partner_hand=partner_hand[:11]
+    )
+    with pytest.raises(IllegalPass):
+        suggest_passes(passing, Suit.HEARTS)
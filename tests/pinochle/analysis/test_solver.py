@@ -0,0 +1,106 @@
+import random
+from typing import Tuple
+
+import pytest
+
+from pinochle.analysis.solver import solve, Solver
+from pinochle.cards import Card, CardDeck, Rank, Suit
+from pinochle.play_tricks import PlayTricksState
+from pinochle.scoring import count_trick_points, LAST_TRICK_POINTS
+
+PLAYERS = ("a", "b", "c", "d")
+
+
+def _brute_force(state: PlayTricksState) -> int:
+    """
+    Plain minimax over PlayTricksState, as a reference:  the points the first team takes from here on.
+    """
+    if not any(state.hands) and not state.current_trick:
+        return 0
+    maximizing = state.player_index % 2 == 0
+    values = []
+    for card in state.legal_moves():
+        next_state = state.play_card(state.current_player(), card)
+        gained = 0
+        if not next_state.current_trick:
+            trick = state.current_trick + (card,)
+            gained = count_trick_points(trick) + (0 if any(next_state.hands) else LAST_TRICK_POINTS)
+            gained = gained if next_state.player_index % 2 == 0 else 0
+        values.append(gained + _brute_force(next_state))
+    return max(values) if maximizing else min(values)
+
+
+def _random_endgame(seed: int, cards_per_hand: int) -> PlayTricksState:
+    rng = random.Random(seed)
+    cards = rng.sample(CardDeck.all_cards(), k=4 * cards_per_hand)
+    hands = tuple(tuple(cards[player::4]) for player in range(4))
+    return PlayTricksState(hands=hands, players=PLAYERS, player_index=rng.randrange(4), trump=rng.choice(list(Suit)))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force_on_small_endgames(seed: int) -> None:
+    state = _random_endgame(seed, cards_per_hand=3)
+    result = solve(state)
+    expected = _brute_force(state)
+    assert result.team_points[0] == expected
+    assert sum(result.team_points) == count_trick_points(card for hand in state.hands for card in hand) + 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_brute_force_mid_trick(seed: int) -> None:
+    state = _random_endgame(seed, cards_per_hand=3)
+    state = state.play_card(state.current_player(), sorted(state.legal_moves())[0])
+    assert solve(state).team_points[0] == _brute_force(state)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_best_card_achieves_the_solved_value(seed: int) -> None:
+    state = _random_endgame(seed, cards_per_hand=3)
+    result = solve(state)
+    assert result.best_card in state.legal_moves()
+
+    next_state = state.play_card(state.current_player(), result.best_card)
+    assert _brute_force(next_state) == _brute_force(state)
+
+
+def test_last_trick_point() -> None:
+    hands: Tuple[Tuple[Card, ...], ...] = (
+        (Card(Rank.NINE, Suit.CLUBS),),
+        (Card(Rank.JACK, Suit.CLUBS),),
+        (Card(Rank.QUEEN, Suit.CLUBS),),
+        (Card(Rank.NINE, Suit.HEARTS),),
+    )
+    state = PlayTricksState(hands=hands, players=PLAYERS, player_index=0, trump=Suit.SPADES)
+    assert solve(state).team_points == (1, 0)
+
+
+def test_solver_reuses_its_table_across_positions() -> None:
+    solver = Solver()
+    state = _random_endgame(7, cards_per_hand=4)
+    first = solver.solve(state)
+    second = solver.solve(state)
+    assert second.team_points == first.team_points
+    assert second.nodes < first.nodes
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_solver_reused_across_trumps_matches_a_fresh_one(seed: int) -> None:
+    solver = Solver()
+    state = _random_endgame(seed, cards_per_hand=3)
+    for trump in Suit:
+        trump_state = state._replace(trump=trump)
+        assert solver.solve(trump_state).team_points == Solver().solve(trump_state).team_points
+
+
+def test_full_table_is_emptied_and_refilled() -> None:
+    solver = Solver(max_entries=50)
+    for seed in range(5):
+        state = _random_endgame(seed, cards_per_hand=3)
+        assert solver.solve(state).team_points[0] == _brute_force(state)
+        assert len(solver._table) <= 50
+
+
+def test_solves_six_card_hands() -> None:
+    state = _random_endgame(11, cards_per_hand=6)
+    result = solve(state)
+    assert 0 <= result.team_points[0] <= sum(result.team_points)
@@ -0,0 +1,38 @@
+import pytest
+
+from pinochle.cards import CardDeck
+from pinochle.compact_hand import CompactHand
+
+np = pytest.importorskip("numpy")
+
+from pinochle.batch_dealing import deal_ids, deal_many, id_counts  # noqa: E402
+from pinochle.batch_scoring import card_count_matrix  # noqa: E402
+
+
+def test_every_deal_uses_the_whole_deck() -> None:
+    for deal in deal_many(50, seed=0):
+        assert [len(hand) for hand in deal] == [12, 12, 12, 12]
+        assert sorted(card for hand in deal for card in hand) == sorted(CardDeck.all_cards())
+
+
+def test_seeded_deals_repeat() -> None:
+    assert np.array_equal(deal_ids(20, seed=1), deal_ids(20, seed=1))
+    assert not np.array_equal(deal_ids(20, seed=1), deal_ids(20, seed=2))
+
+
+def test_deals_differ() -> None:
+    deals = list(deal_many(100, seed=0))
+    assert len(set(deals)) == 100
+
+
+def test_compact_deals_match_card_deals() -> None:
+    deals = deal_many(30, seed=4)
+    compact_deals = deal_many(30, seed=4, compact=True)
+    for deal, compact_deal in zip(deals, compact_deals):
+        assert compact_deal == tuple(CompactHand.from_cards(hand) for hand in deal)
+
+
+def test_id_counts_match_card_count_matrix() -> None:
+    ids = deal_ids(10, seed=5).reshape(40, 12)
+    hands = [hand for deal in deal_many(10, seed=5) for hand in deal]
+    assert np.array_equal(id_counts(ids), card_count_matrix(hands))
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from pinochle.cards import Card, CardDeck, Rank, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.scoring import MeldCounter, score_meld
+
+np = pytest.importorskip("numpy")
+
+from pinochle.batch_scoring import card_count_matrix, meld_batch, score_meld_batch, meld_from_row  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def random_hands():
+    rng = random.Random(1234)
+    return [tuple(rng.sample(CardDeck.all_cards(), k=rng.choice((12, 16)))) for _ in range(500)]
+
+
+@pytest.fixture(scope="module")
+def meldy_hands():
+    run = tuple(Card(rank, Suit.HEARTS) for rank in Rank if rank != Rank.NINE)
+    return [
+        run * 2,
+        tuple(Card(Rank.ACE, suit) for suit in Suit) * 2,
+        (Card(Rank.JACK, Suit.DIAMONDS), Card(Rank.QUEEN, Suit.SPADES)) * 2,
+        (Card(Rank.QUEEN, Suit.CLUBS), Card(Rank.KING, Suit.CLUBS), Card(Rank.NINE, Suit.HEARTS)),
+        tuple(),
+    ]
+
+
+def test_count_matrix_counts_copies():
+    counts = card_count_matrix([(Card(Rank.NINE, Suit.CLUBS),) * 2 + (Card(Rank.ACE, Suit.SPADES),)])
+    assert counts.shape == (1, 24)
+    assert counts[0, 0] == 2
+    assert counts[0, 23] == 1
+    assert counts.sum() == 3
+
+
+def test_count_matrix_matches_for_compact_hands(random_hands):
+    compact_hands = [CompactHand.from_cards(hand) for hand in random_hands]
+    assert (card_count_matrix(compact_hands) == card_count_matrix(random_hands)).all()
+
+
+@pytest.mark.parametrize("trump", [pytest.param(suit, id=suit.name) for suit in Suit])
+def test_scores_match_score_meld(random_hands, meldy_hands, trump):
+    hands = random_hands + meldy_hands
+    expected = [score_meld(hand=list(hand), trump=trump) for hand in hands]
+    assert score_meld_batch(hands, trump).tolist() == expected
+
+
+def test_meld_fields_match_meld_counter(random_hands, meldy_hands):
+    hands = random_hands + meldy_hands
+    trumps = [random.Random(index).choice(list(Suit)) for index in range(len(hands))]
+    melds = meld_batch(hands, trumps)
+    for hand, trump, row in zip(hands, trumps, melds):
+        assert meld_from_row(row) == MeldCounter(hand=list(hand), trump=trump).count()
+
+
+def test_accepts_count_matrix(random_hands):
+    counts = card_count_matrix(random_hands)
+    assert (score_meld_batch(counts, Suit.SPADES) == score_meld_batch(random_hands, Suit.SPADES)).all()
+
+
+def test_accepts_trump_ordinals(random_hands):
+    trumps = [random.Random(index).choice(list(Suit)) for index in range(len(random_hands))]
+    ordinals = np.array([trump.ordinal for trump in trumps])
+    assert (score_meld_batch(random_hands, ordinals) == score_meld_batch(random_hands, trumps)).all()
+
+
+def test_rejects_mismatched_trumps(random_hands):
+    with pytest.raises(ValueError):
+        score_meld_batch(random_hands, [Suit.SPADES])
+    with pytest.raises(ValueError):
+        score_meld_batch(random_hands, np.zeros(2, dtype=int))
+
+
+def test_rejects_impossible_counts():
+    hand = tuple(Card(Rank.ACE, suit) for suit in Suit) * 3
+    with pytest.raises(ValueError):
+        score_meld_batch([hand], Suit.SPADES)
+
+
+def test_empty_batch():
+    assert score_meld_batch([], Suit.SPADES).tolist() == []
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from pinochle.canonical import (
+    canonical_deal,
+    canonical_hand,
+    deal_hash,
+    hand_hash,
+    relabel,
+    suit_permutations,
+)
+from pinochle.cards import Card, CardDeck, Rank, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.scoring import score_meld, score_meld_all_trumps
+
+CLUBS_HEARTS_SWAP = (Suit.HEARTS.ordinal, Suit.DIAMONDS.ordinal, Suit.CLUBS.ordinal, Suit.SPADES.ordinal)
+
+
+def _swap_clubs_and_hearts(hand):
+    return relabel(CompactHand.from_cards(hand), CLUBS_HEARTS_SWAP)
+
+
+@pytest.mark.parametrize(
+    "trump, preserve_meld, count",
+    [
+        (None, True, 2),
+        (Suit.CLUBS, True, 1),
+        (Suit.DIAMONDS, True, 2),
+        (None, False, 24),
+        (Suit.SPADES, False, 6),
+    ],
+)
+def test_suit_permutations(trump, preserve_meld, count) -> None:
+    permutations = suit_permutations(trump, preserve_meld)
+    assert len(set(permutations)) == count
+    for permutation in permutations:
+        if trump is not None:
+            assert permutation[trump.ordinal] == trump.ordinal
+        if preserve_meld:
+            assert permutation[Suit.DIAMONDS.ordinal] == Suit.DIAMONDS.ordinal
+            assert permutation[Suit.SPADES.ordinal] == Suit.SPADES.ordinal
+
+
+def test_card_order_does_not_matter() -> None:
+    hand = CardDeck.deal(0)[0]
+    assert hand_hash(hand) == hand_hash(tuple(reversed(hand)))
+    assert canonical_hand(hand) == canonical_hand(CompactHand.from_cards(hand))
+
+
+def test_swapping_free_suits_gives_the_same_canonical_form() -> None:
+    hands = CardDeck.deal(1)
+    swapped = tuple(_swap_clubs_and_hearts(hand) for hand in hands)
+    assert canonical_deal(hands).hands == canonical_deal(swapped).hands
+    assert deal_hash(hands, Suit.SPADES) == deal_hash(swapped, Suit.SPADES)
+    assert deal_hash(hands, Suit.HEARTS) != deal_hash(swapped, Suit.HEARTS)
+
+
+def test_meld_is_the_same_for_equivalent_hands() -> None:
+    rng = random.Random(2)
+    for _ in range(50):
+        hand = CardDeck.deal(rng)[0]
+        canonical = canonical_hand(hand)
+        assert canonical_hand(_swap_clubs_and_hearts(hand)) == canonical
+        for trump in (Suit.DIAMONDS, Suit.SPADES):
+            assert score_meld(canonical, trump) == score_meld(hand, trump)
+        assert sorted(meld.score() for meld in score_meld_all_trumps(canonical).values()) == sorted(
+            meld.score() for meld in score_meld_all_trumps(hand).values()
+        )
+
+
+def test_pinochle_is_not_relabeled() -> None:
+    pinochle = (Card(Rank.JACK, Suit.DIAMONDS), Card(Rank.QUEEN, Suit.SPADES))
+    not_pinochle = (Card(Rank.JACK, Suit.SPADES), Card(Rank.QUEEN, Suit.DIAMONDS))
+    assert hand_hash(pinochle) != hand_hash(not_pinochle)
+    assert hand_hash(pinochle, preserve_meld=False) == hand_hash(not_pinochle, preserve_meld=False)
+
+
+def test_cards_map_to_and_from_canonical_labels() -> None:
+    hands = CardDeck.deal(3)
+    deal = canonical_deal(hands, Suit.HEARTS, preserve_meld=False)
+    for hand, canonical in zip(hands, deal.hands):
+        assert CompactHand.from_cards(deal.to_canonical(card) for card in hand) == canonical
+        assert all(deal.from_canonical(deal.to_canonical(card)) == card for card in hand)
+
+
+def test_hash_is_stable() -> None:
+    hand = (Card(Rank.ACE, Suit.HEARTS), Card(Rank.NINE, Suit.CLUBS))
+    assert hand_hash(hand, Suit.HEARTS) == hand_hash(list(hand), Suit.HEARTS)
+    assert 0 <= hand_hash(hand) < 2**64
+    assert hand_hash(hand, Suit.HEARTS) != hand_hash(hand, Suit.SPADES)
+    assert hand_hash(hand) == 0xE61D54FEA9251C81
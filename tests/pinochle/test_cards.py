@@ -1,6 +1,8 @@
+import random
+
 import pytest
 
-from pinochle.cards import Rank, CardDeck, Suit, Card
+from pinochle.cards import Rank, CardDeck, Suit, Card, card_id, card_from_id, NUM_DISTINCT_CARDS
 
 
 @pytest.mark.parametrize(
@@ -87,6 +89,10 @@ class TestCardDeckShuffle:
             card_orders.add(CardDeck._shuffled_cards())
             assert len(card_orders) == size
 
+    def test_seeded_shuffles_repeat(self):
+        assert CardDeck._shuffled_cards(7) == CardDeck._shuffled_cards(random.Random(7))
+        assert CardDeck._shuffled_cards(7) != CardDeck._shuffled_cards(8)
+
 
 def _validate_all_cards_present(cards):
     assert sorted(cards) == sorted(CardDeck.all_cards())
@@ -107,6 +113,14 @@ class TestCardDeckDeal:
             all_cards.extend(hand)
         _validate_all_cards_present(all_cards)
 
+    def test_seeded_deals_repeat(self):
+        assert CardDeck.deal(3) == CardDeck.deal(3)
+        assert CardDeck.deal(3) != CardDeck.deal(4)
+
+    def test_deals_from_a_shared_rng_differ(self):
+        rng = random.Random(3)
+        assert CardDeck.deal(rng) != CardDeck.deal(rng)
+
 
 class TestForMutMut:
     """
@@ -139,3 +153,20 @@ class TestForMutMut:
         card = Card(Rank.QUEEN, Suit.SPADES)
         assert not card < card
         assert not card > card
+
+
+class TestCardIds:
+    def test_ids_are_unique_and_dense(self):
+        assert sorted({card_id(card) for card in CardDeck.all_cards()}) == list(range(NUM_DISTINCT_CARDS))
+
+    def test_ids_round_trip(self):
+        for card in CardDeck.all_cards():
+            assert card_from_id(card_id(card)) == card
+
+    def test_ids_follow_sort_order(self):
+        assert sorted(CardDeck.all_cards(), key=card_id) == sorted(CardDeck.all_cards())
+
+
+def test_hash_matches_equality():
+    assert len(set(CardDeck.all_cards())) == NUM_DISTINCT_CARDS
+    assert hash(Card(Rank.TEN, Suit.HEARTS)) == hash(Card(Rank.TEN, Suit.HEARTS))
@@ -0,0 +1,110 @@
+import pytest
+
+from pinochle.cards import Card, Rank, Suit, CardDeck
+from pinochle.compact_hand import CompactHand, MAX_COPIES
+
+
+@pytest.fixture(scope="session")
+def hand() -> CompactHand:
+    return CompactHand.from_cards(
+        (
+            Card(Rank.ACE, Suit.SPADES),
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.ACE, Suit.SPADES),
+            Card(Rank.QUEEN, Suit.HEARTS),
+        )
+    )
+
+
+def test_empty_hand() -> None:
+    hand = CompactHand()
+    assert len(hand) == 0
+    assert not hand
+    assert hand.to_cards() == tuple()
+
+
+def test_round_trip_is_sorted_and_lossless(hand: CompactHand) -> None:
+    assert hand.to_cards() == (
+        Card(Rank.NINE, Suit.CLUBS),
+        Card(Rank.QUEEN, Suit.HEARTS),
+        Card(Rank.ACE, Suit.SPADES),
+        Card(Rank.ACE, Suit.SPADES),
+    )
+
+
+def test_round_trip_of_full_deck() -> None:
+    hand = CompactHand.from_cards(CardDeck.all_cards())
+    assert len(hand) == 48
+    assert hand.to_cards() == tuple(sorted(CardDeck.all_cards()))
+
+
+def test_count_and_contains(hand: CompactHand) -> None:
+    assert hand.count(Card(Rank.ACE, Suit.SPADES)) == 2
+    assert hand.count(Card(Rank.NINE, Suit.CLUBS)) == 1
+    assert hand.count(Card(Rank.NINE, Suit.HEARTS)) == 0
+    assert Card(Rank.QUEEN, Suit.HEARTS) in hand
+    assert Card(Rank.QUEEN, Suit.SPADES) not in hand
+
+
+def test_len(hand: CompactHand) -> None:
+    assert len(hand) == 4
+
+
+def test_add(hand: CompactHand) -> None:
+    new_hand = hand.add(Card(Rank.NINE, Suit.CLUBS))
+    assert new_hand.count(Card(Rank.NINE, Suit.CLUBS)) == 2
+    assert len(new_hand) == 5
+    assert len(hand) == 4
+
+
+def test_add_cards_with_plus(hand: CompactHand) -> None:
+    new_hand = hand + (Card(Rank.JACK, Suit.DIAMONDS), Card(Rank.JACK, Suit.DIAMONDS))
+    assert new_hand.count(Card(Rank.JACK, Suit.DIAMONDS)) == 2
+    assert new_hand + CompactHand.from_cards((Card(Rank.TEN, Suit.HEARTS),)) == new_hand.add(
+        Card(Rank.TEN, Suit.HEARTS)
+    )
+
+
+def test_remove(hand: CompactHand) -> None:
+    new_hand = hand.remove(Card(Rank.ACE, Suit.SPADES))
+    assert new_hand.count(Card(Rank.ACE, Suit.SPADES)) == 1
+    assert len(new_hand) == 3
+
+
+def test_remove_missing_card(hand: CompactHand) -> None:
+    with pytest.raises(ValueError) as e:
+        hand.remove(Card(Rank.KING, Suit.DIAMONDS))
+    assert e.value.args[0] == "King of Diamonds is not in hand"
+
+
+def test_remove_too_many_copies(hand: CompactHand) -> None:
+    with pytest.raises(ValueError) as e:
+        hand.remove_cards((Card(Rank.ACE, Suit.SPADES),) * 3)
+    assert e.value.args[0] == "Ace of Spades is not in hand"
+
+
+def test_slot_overflow_is_rejected() -> None:
+    hand = CompactHand.from_cards((Card(Rank.ACE, Suit.SPADES),) * MAX_COPIES)
+    with pytest.raises(ValueError):
+        hand.add(Card(Rank.ACE, Suit.SPADES))
+
+
+def test_equal_regardless_of_card_order() -> None:
+    cards = CardDeck.all_cards()[:12]
+    assert CompactHand.from_cards(cards) == CompactHand.from_cards(reversed(cards))
+    assert hash(CompactHand.from_cards(cards)) == hash(CompactHand.from_cards(reversed(cards)))
+
+
+def test_counts_round_trip(hand: CompactHand) -> None:
+    assert CompactHand.from_counts(hand.counts()) == hand
+
+
+def test_from_counts_rejects_wrong_length() -> None:
+    with pytest.raises(ValueError):
+        CompactHand.from_counts((1, 2, 3))
+
+
+@pytest.mark.parametrize("copies", [1, 2, 3, 4, 8, MAX_COPIES])
+def test_distinct_cards_are_sorted_whatever_the_count(copies: int) -> None:
+    cards = CardDeck.all_cards()[::5] * copies
+    assert CompactHand.from_cards(cards).distinct_cards() == tuple(sorted(set(cards)))
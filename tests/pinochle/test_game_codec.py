@@ -0,0 +1,22 @@
+from typing import Tuple
+
+import pytest
+
+from pinochle.game_codec import encode_event, decode_event, encode_game, decode_game
+from pinochle.game_events import GameEvent, replay
+
+
+def test_events_round_trip(full_game_events: Tuple[GameEvent, ...]) -> None:
+    for event in full_game_events:
+        assert decode_event(encode_event(event)) == event
+
+
+@pytest.mark.parametrize("event_count", [1, 4, 6, 7, 8, 9, 10, 37, 56])
+def test_games_round_trip(full_game_events: Tuple[GameEvent, ...], event_count: int) -> None:
+    game = replay(full_game_events[:event_count])
+    assert decode_game(encode_game(game)) == game
+
+
+def test_decoded_game_plays_on(full_game_events: Tuple[GameEvent, ...]) -> None:
+    game = decode_game(encode_game(replay(full_game_events[:21])))
+    assert replay(full_game_events[21:], game) == replay(full_game_events)
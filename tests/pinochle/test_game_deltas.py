@@ -0,0 +1,33 @@
+from typing import Tuple
+
+from pinochle.game_deltas import public_delta, private_deltas, seat_view, cards_json
+from pinochle.game_events import GameEvent, replay
+
+
+def test_deal_is_private(full_game_events: Tuple[GameEvent, ...]) -> None:
+    started = full_game_events[0]
+    game = replay(full_game_events[:1])
+    assert "hand" not in str(public_delta(None, started, game, 1))
+    deltas = private_deltas(started, 1)
+    assert deltas["b"]["hand"] == cards_json(sorted(started.hands[1]))
+    assert seat_view(game, 1, "b")["hand"] == deltas["b"]["hand"]
+    assert "hand" not in seat_view(game, 1, None)
+
+
+def test_completed_trick_delta(full_game_events: Tuple[GameEvent, ...]) -> None:
+    # The first trick is completed by the 12th event
+    before, after = replay(full_game_events[:11]), replay(full_game_events[:12])
+    delta = public_delta(before, full_game_events[11], after, 12)
+    trick = after.tricks.completed_tricks[0]
+    assert delta["trick_winner"] == after.players[trick.winner_index] == delta["current_player"]
+    assert delta["trick_points"] == trick.points
+    assert "state" not in delta
+    assert private_deltas(full_game_events[11], 12) == {}
+
+
+def test_last_card_completes_the_game(full_game_events: Tuple[GameEvent, ...]) -> None:
+    before, after = replay(full_game_events[:-1]), replay(full_game_events)
+    delta = public_delta(before, full_game_events[-1], after, len(full_game_events))
+    assert delta["state"] == "Complete"
+    assert delta["current_player"] is None
+    assert sum(delta["team_points"]) == 25
@@ -0,0 +1,21 @@
+from typing import Tuple
+
+import pytest
+
+from pinochle.game_events import GameEvent, InvalidEvent, apply_event, replay
+from pinochle.pinochle_game import GameState
+
+
+def test_replay_matches_applying_events_one_at_a_time(full_game_events: Tuple[GameEvent, ...]) -> None:
+    game = None
+    for event in full_game_events:
+        game = apply_event(game, event)
+    assert replay(full_game_events) == game
+    assert game.state == GameState.COMPLETE
+
+
+def test_first_event_must_start_the_game(full_game_events: Tuple[GameEvent, ...]) -> None:
+    with pytest.raises(InvalidEvent):
+        apply_event(None, full_game_events[1])
+    with pytest.raises(InvalidEvent):
+        apply_event(replay(full_game_events[:1]), full_game_events[0])
@@ -0,0 +1,81 @@
+import pytest
+
+from pinochle import instrumentation, memo
+from pinochle.bidding import BiddingState
+from pinochle.cards import Card, Rank, Suit
+from pinochle.play_tricks import PlayTricksState
+from pinochle.scoring import score_meld
+
+
+@pytest.fixture
+def instrumented():
+    instrumentation.enable_instrumentation()
+    instrumentation.reset_metrics()
+    yield
+    instrumentation.disable_instrumentation()
+    instrumentation.reset_metrics()
+
+
+def _count(operation: str) -> int:
+    return instrumentation.histogram(operation).snapshot()[2]
+
+
+def test_disabled_leaves_the_methods_alone() -> None:
+    original = BiddingState.new_bid
+    instrumentation.enable_instrumentation()
+    assert BiddingState.new_bid is not original
+    instrumentation.disable_instrumentation()
+    assert BiddingState.new_bid is original
+    assert not instrumentation.is_enabled()
+
+
+def test_counts_calls(instrumented) -> None:
+    BiddingState(current_bid=24, active_players=("a", "b")).new_bid(bid=25, player="a")
+    score_meld([Card(Rank.NINE, Suit.HEARTS)], Suit.HEARTS)
+    score_meld([], Suit.HEARTS)
+    assert _count("bidding.new_bid") == 1
+    assert _count("scoring.score_meld") == 2
+
+
+def test_failed_calls_are_timed_too(instrumented) -> None:
+    state = PlayTricksState(
+        hands=((Card(Rank.NINE, Suit.HEARTS),), (), (), ()), players=("a", "b", "c", "d"), player_index=0, trump=None
+    )
+    with pytest.raises(Exception):
+        state.play_card("b", Card(Rank.NINE, Suit.HEARTS))
+    assert _count("tricks.play_card") == 1
+
+
+def test_timed_blocks(instrumented) -> None:
+    with instrumentation.timed("custom"):
+        pass
+    assert _count("custom") == 1
+    instrumentation.disable_instrumentation()
+    with instrumentation.timed("custom"):
+        pass
+    assert _count("custom") == 1
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    histogram = instrumentation.Histogram()
+    for seconds in (5e-7, 3e-6, 3e-6, 1.0):
+        histogram.observe(seconds)
+    cumulative, total_seconds, count = histogram.snapshot()
+    assert cumulative[:4] == [1, 1, 3, 3]
+    assert cumulative[-1] == count == 4
+    assert total_seconds == pytest.approx(1.0000065)
+
+
+def test_prometheus_text(instrumented) -> None:
+    memo.enable_caching()
+    try:
+        BiddingState(current_bid=24, active_players=("a", "b")).new_bid(bid=25, player="a")
+        score_meld([], Suit.CLUBS)
+        text = instrumentation.prometheus_text()
+    finally:
+        memo.disable_caching()
+    assert "# TYPE pinochle_operation_seconds histogram" in text
+    assert 'pinochle_operation_seconds_bucket{operation="bidding.new_bid",le="+Inf"} 1' in text
+    assert 'pinochle_operation_seconds_count{operation="bidding.new_bid"} 1' in text
+    assert 'pinochle_cache_misses_total{cache="meld"} 1' in text
+    assert text.endswith("\n")
@@ -0,0 +1,89 @@
+import pytest
+
+from pinochle import memo
+from pinochle.cards import CardDeck, Suit
+from pinochle.compact_hand import CompactHand
+from pinochle.memo import LRUCache, memoize, hand_key
+from pinochle.scoring import score_meld, MeldCounter
+
+
+@pytest.fixture
+def caching():
+    memo.enable_caching(maxsize=16)
+    yield
+    memo.disable_caching()
+
+
+class TestLRUCache:
+    def test_counts_hits_misses_and_evictions(self) -> None:
+        cache = LRUCache(maxsize=2)
+        assert cache.get("a") is None
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.maxsize) == (2, 2, 1, 2, 2)
+        assert stats.hit_rate() == 0.5
+
+    def test_clear(self) -> None:
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.clear()
+        assert cache.get("a") is None
+        assert cache.stats().size == 0
+
+    def test_needs_room_for_an_entry(self) -> None:
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+
+def test_memoized_function_only_caches_when_enabled() -> None:
+    calls = []
+
+    @memoize("test_double", key=lambda x: x)
+    def double(x: int) -> int:
+        calls.append(x)
+        return 2 * x
+
+    assert double(2) == double(2) == 4
+    assert calls == [2, 2]
+    assert double.memo.cache_stats() is None
+
+    double.memo.enable_cache(maxsize=4)
+    assert double(x=3) == double(3) == 6
+    assert calls == [2, 2, 3]
+    assert double.memo.cache_stats().hits == 1
+    double.memo.disable_cache()
+
+
+def test_hand_key_ignores_order_and_type() -> None:
+    hand = CardDeck.deal(0)[0]
+    assert hand_key(hand) == hand_key(tuple(reversed(hand))) == hand_key(CompactHand.from_cards(hand))
+
+
+def test_meld_is_cached_across_card_orders(caching) -> None:
+    hand = CardDeck.deal(1)[0]
+    expected = score_meld(hand, Suit.HEARTS)
+    assert score_meld(tuple(reversed(hand)), trump=Suit.HEARTS) == expected
+    assert MeldCounter(CompactHand.from_cards(hand), Suit.HEARTS).count().score() == expected
+    assert score_meld(hand, Suit.SPADES) == score_meld(hand, Suit.SPADES)
+    stats = memo.cache_stats()["meld"]
+    assert (stats.hits, stats.misses) == (3, 2)
+
+
+def test_trick_resolution_is_not_memoized(caching) -> None:
+    # Resolving a trick is cheaper than a cache lookup, so only meld is wrapped
+    assert "meld" in memo.cache_stats()
+    assert "trick_winning_card" not in memo.cache_stats()
+
+
+def test_lru_evicts_the_least_recently_used_hands(caching) -> None:
+    hands = [hand for seed in range(5) for hand in CardDeck.deal(seed)]
+    for hand in hands:
+        score_meld(hand, Suit.HEARTS)
+    stats = memo.cache_stats()["meld"]
+    assert stats.size == 16
+    assert stats.evictions == len(hands) - 16
@@ -3,6 +3,7 @@ from typing import Tuple
 import pytest
 
 from pinochle.cards import Card, Suit, Rank
+from pinochle.compact_hand import CompactHand
 from pinochle.passing_cards import PassingCards, IllegalPass
 from pinochle.utils import InvalidCardRemoval
 
@@ -156,3 +157,29 @@ def test_second_pass_from_bid_winner_back_to_partner(
             Card(Rank.NINE, Suit.SPADES),
         )
     )
+
+
+def test_pass_with_compact_hands(partner_passed_cards, bid_winner_passed_cards, all_spades, all_diamonds):
+    state = PassingCards(
+        bid_winner=bid_winner(),
+        partner=partner(),
+        bid_winner_hand=CompactHand.from_cards(all_spades),
+        partner_hand=CompactHand.from_cards(all_diamonds),
+    )
+    first_pass = state.pass_cards(source=partner(), destination=bid_winner(), cards=partner_passed_cards)
+    second_pass = first_pass.pass_cards(source=bid_winner(), destination=partner(), cards=bid_winner_passed_cards)
+
+    assert isinstance(second_pass.bid_winner_hand, CompactHand)
+    assert second_pass.bid_winner_hand.count(Card(Rank.ACE, Suit.DIAMONDS)) == 2
+    assert Card(Rank.NINE, Suit.SPADES) not in second_pass.bid_winner_hand
+    assert second_pass.partner_hand.count(Card(Rank.NINE, Suit.SPADES)) == 2
+    assert len(second_pass.partner_hand) == 12
+
+
+def test_compact_hand_must_have_passed_cards(passing_cards_state) -> None:
+    state = passing_cards_state._replace(partner_hand=CompactHand.from_cards(passing_cards_state.partner_hand))
+    passed_cards = (Card(Rank.ACE, Suit.DIAMONDS), Card(Rank.JACK, Suit.HEARTS)) * 2
+
+    with pytest.raises(InvalidCardRemoval) as e:
+        state.pass_cards(source=partner(), destination=bid_winner(), cards=passed_cards)
+    assert e.value.args[0] == "Jack of Hearts is not in hand"
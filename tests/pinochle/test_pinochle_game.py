@@ -2,9 +2,14 @@ from typing import Tuple
 
 import pytest
 
-from pinochle.bidding import BiddingState
+from pinochle.bidding import BiddingState, InvalidBid
 from pinochle.cards import CardDeck, Suit, Card, Rank
+from pinochle.compact_hand import CompactHand
+from pinochle.game_events import replay
+from pinochle.passing_cards import IllegalPass
 from pinochle.pinochle_game import PinochleGame, GameState
+from pinochle.play_tricks import InvalidPlay
+from pinochle.scoring import TOTAL_TRICK_POINTS
 
 
 @pytest.fixture(scope="session")
@@ -80,3 +85,73 @@ def test_set_trump_advances_state_to_passing(
 ) -> None:
     game = game_bidding_complete.select_trump(player="a", trump=Suit.DIAMONDS)
     assert game.state == GameState.PASSING_TO_BID_WINNER
+
+
+def test_bidding_through_the_game(new_game: PinochleGame) -> None:
+    game = new_game.bid(player="a", bid=25).pass_bidding(player="b").pass_bidding(player="c").pass_bidding(player="d")
+    assert game.bidding.get_winner() == "a"
+    assert game.bidding.current_bid == 25
+    assert game.state == GameState.BIDDING
+
+
+def test_only_bid_winner_selects_trump(game_bidding_complete: PinochleGame) -> None:
+    with pytest.raises(InvalidBid):
+        game_bidding_complete.select_trump(player="b", trump=Suit.SPADES)
+
+
+def test_cannot_bid_after_trump_is_selected(game_bidding_complete: PinochleGame) -> None:
+    game = game_bidding_complete.select_trump(player="a", trump=Suit.SPADES)
+    with pytest.raises(InvalidBid):
+        game.bid(player="a", bid=30)
+
+
+def test_pass_cards_to_bid_winner_then_back(
+    game_ready_to_pass: PinochleGame, passed_cards: Tuple[Card, Card, Card, Card]
+) -> None:
+    game = game_ready_to_pass.pass_cards(source="c", destination="a", cards=passed_cards)
+    assert game.state == GameState.PASSING_TO_PARTNER
+    assert len(game.hands[0]) == 16
+    assert len(game.hands[2]) == 8
+
+    returned_cards = game.hands[0][:4]
+    game = game.pass_cards(source="a", destination="c", cards=returned_cards)
+    assert game.state == GameState.PLAYING_TRICKS
+    assert len(game.hands[0]) == len(game.hands[2]) == 12
+    assert game.tricks.current_player() == "a"
+    assert game.tricks.trump == Suit.CLUBS
+    assert game.tricks.hands == game.hands
+    assert all(isinstance(hand, CompactHand) for hand in game.hands)
+
+
+def test_passes_must_come_in_order(
+    game_ready_to_pass: PinochleGame, passed_cards: Tuple[Card, Card, Card, Card]
+) -> None:
+    with pytest.raises(IllegalPass):
+        game_ready_to_pass.pass_cards(source="a", destination="c", cards=game_ready_to_pass.hands[0][:4])
+    with pytest.raises(IllegalPass):
+        game_ready_to_pass.pass_cards(source="b", destination="a", cards=passed_cards)
+
+
+def test_cannot_play_before_passing(game_ready_to_pass: PinochleGame) -> None:
+    with pytest.raises(InvalidPlay):
+        game_ready_to_pass.play_card(player="a", card=game_ready_to_pass.hands[0][0])
+
+
+def test_game_completes_after_last_trick(full_game_events) -> None:
+    game = replay(full_game_events)
+    assert game.state == GameState.COMPLETE
+    assert len(game.tricks.completed_tricks) == 12
+    assert sum(game.tricks.team_points) == TOTAL_TRICK_POINTS
+    with pytest.raises(InvalidPlay):
+        game.play_card(player="a", card=Card(Rank.ACE, Suit.HEARTS))
+
+
+def test_current_player_through_the_game(full_game_events) -> None:
+    assert replay(full_game_events[:1]).current_player() == "a"
+    assert replay(full_game_events[:2]).current_player() == "b"
+    # Bidding is won, so waiting on the winner to select trump
+    assert replay(full_game_events[:5]).current_player() == "a"
+    assert replay(full_game_events[:6]).current_player() == "c"
+    assert replay(full_game_events[:7]).current_player() == "a"
+    assert replay(full_game_events[:8]).current_player() == "a"
+    assert replay(full_game_events).current_player() is None
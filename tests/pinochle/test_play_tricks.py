@@ -1,9 +1,12 @@
+import random
 from typing import Tuple
 
 import pytest
 
-from pinochle.cards import Card, Suit, Rank
-from pinochle.play_tricks import PlayTricksState, InvalidPlay
+from pinochle.cards import Card, Suit, Rank, CardDeck
+from pinochle.compact_hand import CompactHand
+from pinochle.play_tricks import PlayTricksState, InvalidPlay, CompletedTrick
+from pinochle.scoring import TOTAL_TRICK_POINTS
 
 
 PLAYERS = ("a", "b", "c", "d")
@@ -301,8 +304,189 @@ def test_index_of_trick_winner(trick, final_player_index, expected) -> None:
     assert play_state.play_card(PLAYERS[final_player_index], last_card).player_index == expected
 
 
-# TODO
-#  - When a trick is over:
-#    + Assign trick cards to appropriate player
-#    + Credit the point for last trick if applicable
-#    + Reset trick
+def test_trick_is_cleared_once_complete(middle_of_play: PlayTricksState) -> None:
+    play_state = (
+        middle_of_play.play_card("a", Card(Rank.JACK, Suit.CLUBS))
+        .play_card("b", Card(Rank.QUEEN, Suit.CLUBS))
+        .play_card("c", Card(Rank.JACK, Suit.CLUBS))
+    )
+    assert len(play_state.current_trick) == 3
+
+    play_state = play_state.play_card("d", Card(Rank.TEN, Suit.SPADES))
+    assert play_state.current_trick == tuple()
+    assert play_state.current_player() == "d"
+
+
+def test_play_with_compact_hands(middle_of_play: PlayTricksState) -> None:
+    play_state = middle_of_play._replace(hands=tuple(CompactHand.from_cards(hand) for hand in middle_of_play.hands))
+    play_state = play_state.play_card(player="a", card=Card(Rank.JACK, Suit.CLUBS))
+    play_state = play_state.play_card(player="b", card=Card(Rank.QUEEN, Suit.CLUBS))
+
+    assert play_state.hands[1] == CompactHand.from_cards((Card(Rank.ACE, Suit.DIAMONDS),))
+    with pytest.raises(InvalidPlay) as e:
+        play_state.play_card(player="c", card=Card(Rank.ACE, Suit.HEARTS))
+    assert e.value.args[0] == "Invalid card played"
+
+
+def test_legal_moves_at_start_of_trick_are_distinct_and_sorted() -> None:
+    hand = (Card(Rank.ACE, Suit.SPADES), Card(Rank.NINE, Suit.CLUBS), Card(Rank.ACE, Suit.SPADES))
+    play_state = PlayTricksState(hands=(hand,), players=PLAYERS, player_index=0, trump=Suit.HEARTS)
+    assert play_state.legal_moves() == (Card(Rank.NINE, Suit.CLUBS), Card(Rank.ACE, Suit.SPADES))
+
+
+@pytest.mark.parametrize(
+    "trick, trump, expected",
+    [
+        # Must beat the trick in the led suit
+        ((Card(Rank.QUEEN, Suit.CLUBS),), Suit.HEARTS, (Card(Rank.KING, Suit.CLUBS), Card(Rank.ACE, Suit.CLUBS))),
+        # Cannot beat it, since a tie goes to the first card played, so any card of the led suit
+        (
+            (Card(Rank.ACE, Suit.CLUBS),),
+            Suit.HEARTS,
+            (Card(Rank.NINE, Suit.CLUBS), Card(Rank.KING, Suit.CLUBS), Card(Rank.ACE, Suit.CLUBS)),
+        ),
+        # Already trumped, so any card of the led suit
+        (
+            (Card(Rank.NINE, Suit.CLUBS), Card(Rank.NINE, Suit.SPADES)),
+            Suit.SPADES,
+            (Card(Rank.NINE, Suit.CLUBS), Card(Rank.KING, Suit.CLUBS), Card(Rank.ACE, Suit.CLUBS)),
+        ),
+        # Out of the led suit, so must overtrump
+        (
+            (Card(Rank.NINE, Suit.DIAMONDS), Card(Rank.JACK, Suit.HEARTS)),
+            Suit.HEARTS,
+            (Card(Rank.TEN, Suit.HEARTS),),
+        ),
+        # Out of the led suit and trump, so anything
+        (
+            (Card(Rank.NINE, Suit.DIAMONDS),),
+            Suit.SPADES,
+            (
+                Card(Rank.NINE, Suit.CLUBS),
+                Card(Rank.KING, Suit.CLUBS),
+                Card(Rank.ACE, Suit.CLUBS),
+                Card(Rank.JACK, Suit.HEARTS),
+                Card(Rank.TEN, Suit.HEARTS),
+            ),
+        ),
+    ],
+)
+def test_legal_moves_following(trick: Tuple[Card, ...], trump: Suit, expected: Tuple[Card, ...]) -> None:
+    hand = (
+        Card(Rank.ACE, Suit.CLUBS),
+        Card(Rank.NINE, Suit.CLUBS),
+        Card(Rank.KING, Suit.CLUBS),
+        Card(Rank.NINE, Suit.CLUBS),
+        Card(Rank.TEN, Suit.HEARTS),
+        Card(Rank.JACK, Suit.HEARTS),
+    )
+    player_index = len(trick)
+    hands = ((),) * player_index + (hand,)
+    play_state = PlayTricksState(
+        hands=hands, players=PLAYERS, player_index=player_index, trump=trump, current_trick=trick
+    )
+    assert play_state.legal_moves() == expected
+    assert play_state._replace(hands=tuple(CompactHand.from_cards(h) for h in hands)).legal_moves() == expected
+
+
+def test_trick_in_progress_is_tracked(middle_of_play: PlayTricksState) -> None:
+    play_state = middle_of_play.play_card("a", Card(Rank.JACK, Suit.CLUBS))
+    assert play_state.led_suit == Suit.CLUBS
+    assert (play_state.winner_index, play_state.winning_card) == (0, Card(Rank.JACK, Suit.CLUBS))
+
+    play_state = play_state.play_card("b", Card(Rank.QUEEN, Suit.CLUBS))
+    assert (play_state.winner_index, play_state.winning_card) == (1, Card(Rank.QUEEN, Suit.CLUBS))
+
+    # A tie stays with the card played first
+    play_state = play_state.play_card("c", Card(Rank.JACK, Suit.CLUBS))
+    assert (play_state.winner_index, play_state.winning_card) == (1, Card(Rank.QUEEN, Suit.CLUBS))
+    assert play_state.led_suit == Suit.CLUBS
+
+
+def test_completed_trick_is_recorded(middle_of_play: PlayTricksState) -> None:
+    play_state = (
+        middle_of_play.play_card("a", Card(Rank.JACK, Suit.CLUBS))
+        .play_card("b", Card(Rank.QUEEN, Suit.CLUBS))
+        .play_card("c", Card(Rank.JACK, Suit.CLUBS))
+        .play_card("d", Card(Rank.TEN, Suit.SPADES))
+    )
+    assert play_state.completed_tricks == (
+        CompletedTrick(
+            leader_index=0,
+            cards=(
+                Card(Rank.JACK, Suit.CLUBS),
+                Card(Rank.QUEEN, Suit.CLUBS),
+                Card(Rank.JACK, Suit.CLUBS),
+                Card(Rank.TEN, Suit.SPADES),
+            ),
+            winner_index=3,
+            points=1,
+        ),
+    )
+    assert play_state.team_points == (0, 1)
+    assert (play_state.winner_index, play_state.winning_card, play_state.led_suit) == (None, None, None)
+
+
+def test_last_trick_earns_a_bonus_point(middle_of_play: PlayTricksState) -> None:
+    play_state = (
+        middle_of_play.play_card("a", Card(Rank.JACK, Suit.CLUBS))
+        .play_card("b", Card(Rank.QUEEN, Suit.CLUBS))
+        .play_card("c", Card(Rank.JACK, Suit.CLUBS))
+        .play_card("d", Card(Rank.TEN, Suit.SPADES))
+        .play_card("d", Card(Rank.ACE, Suit.SPADES))
+        .play_card("a", Card(Rank.ACE, Suit.CLUBS))
+        .play_card("b", Card(Rank.ACE, Suit.DIAMONDS))
+        .play_card("c", Card(Rank.ACE, Suit.HEARTS))
+    )
+    assert play_state.completed_tricks[-1].points == 4 + 1
+    assert play_state.team_points == (0, 1 + 5)
+
+
+def test_trick_in_progress_is_worked_out_when_not_given() -> None:
+    hands = ((Card(Rank.ACE, Suit.CLUBS),), (Card(Rank.NINE, Suit.CLUBS),), (), ())
+    play_state = PlayTricksState(
+        hands=hands,
+        players=PLAYERS,
+        player_index=0,
+        trump=Suit.HEARTS,
+        current_trick=(Card(Rank.TEN, Suit.CLUBS), Card(Rank.NINE, Suit.HEARTS)),
+    )
+    assert play_state.legal_moves() == (Card(Rank.ACE, Suit.CLUBS),)
+    assert play_state.play_card("a", Card(Rank.ACE, Suit.CLUBS)).winner_index == 3
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_team_points_of_a_full_hand_add_up(seed: int) -> None:
+    cards = random.Random(seed).sample(CardDeck.all_cards(), k=48)
+    hands = tuple(tuple(cards[i : i + 12]) for i in range(0, 48, 12))
+    play_state = PlayTricksState(hands=hands, players=PLAYERS, player_index=seed % 4, trump=Suit.DIAMONDS)
+    while any(play_state.hands):
+        play_state = play_state.play_card(play_state.current_player(), play_state.legal_moves()[0])
+
+    assert len(play_state.completed_tricks) == 12
+    assert sum(play_state.team_points) == TOTAL_TRICK_POINTS
+    for team in range(2):
+        assert play_state.team_points[team] == sum(
+            trick.points for trick in play_state.completed_tricks if trick.winner_index % 2 == team
+        )
+
+
+def test_compact_and_tuple_hands_play_out_the_same() -> None:
+    rng = random.Random(7)
+    hands = CardDeck.deal(rng)
+    play_state = PlayTricksState(hands=hands, players=PLAYERS, player_index=0, trump=Suit.CLUBS)
+    compact_state = play_state._replace(hands=tuple(CompactHand.from_cards(hand) for hand in hands))
+    while any(play_state.hands):
+        card = rng.choice(play_state.legal_moves())
+        play_state = play_state.play_card(play_state.current_player(), card)
+        compact_state = compact_state.play_card(compact_state.current_player(), card)
+        assert compact_state.legal_moves() == play_state.legal_moves()
+        assert compact_state.current_trick == play_state.current_trick
+        assert compact_state.team_points == play_state.team_points
+
+
+def test_play_card_shares_the_hands_it_does_not_change(start_of_play_a: PlayTricksState) -> None:
+    card = start_of_play_a.legal_moves()[0]
+    play_state = start_of_play_a.play_card("a", card)
+    assert all(play_state.hands[i] is start_of_play_a.hands[i] for i in range(1, 4))
+    assert play_state.players is start_of_play_a.players
@@ -1,9 +1,23 @@
+import random
 from typing import NamedTuple, List
 
 import pytest
 
-from pinochle.cards import Suit, Card, Rank
-from pinochle.scoring import score_meld
+from pinochle.cards import Suit, Card, Rank, CardDeck
+from pinochle.compact_hand import CompactHand
+from pinochle.scoring import (
+    score_meld,
+    suit_meld,
+    SuitMeld,
+    precompute_meld_table,
+    score_meld_all_trumps,
+    score_suit_melds,
+    best_meld_trump,
+    MeldCounter,
+    count_trick_points,
+    LAST_TRICK_POINTS,
+    TOTAL_TRICK_POINTS,
+)
 
 
 class TestScoreMeld:
@@ -177,3 +191,102 @@ class TestScoreMeld:
             Card(Rank.QUEEN, Suit.SPADES),
         ]
         assert score_meld(hand=hand, trump=Suit.CLUBS) == 4
+
+    def test_compact_hand(self):
+        hand = CompactHand.from_cards(self._create_run(Suit.HEARTS) * 2)
+        assert score_meld(hand=hand, trump=Suit.HEARTS) == 150
+
+
+class TestScoreMeldAllTrumps:
+    @pytest.fixture(scope="module")
+    def hand(self) -> List[Card]:
+        return [
+            Card(Rank.ACE, Suit.HEARTS),
+            Card(Rank.TEN, Suit.HEARTS),
+            Card(Rank.KING, Suit.HEARTS),
+            Card(Rank.QUEEN, Suit.HEARTS),
+            Card(Rank.JACK, Suit.HEARTS),
+            Card(Rank.NINE, Suit.CLUBS),
+            Card(Rank.KING, Suit.CLUBS),
+            Card(Rank.QUEEN, Suit.CLUBS),
+            Card(Rank.JACK, Suit.DIAMONDS),
+            Card(Rank.QUEEN, Suit.SPADES),
+            Card(Rank.ACE, Suit.SPADES),
+            Card(Rank.ACE, Suit.DIAMONDS),
+        ]
+
+    def test_matches_meld_counter_for_every_trump(self, hand):
+        melds = score_meld_all_trumps(hand)
+        assert set(melds) == set(Suit)
+        for trump in Suit:
+            assert melds[trump] == MeldCounter(hand=hand, trump=trump).count()
+
+    def test_matches_score_meld_for_random_hands(self):
+        rng = random.Random(42)
+        for _ in range(200):
+            hand = CompactHand.from_cards(rng.sample(CardDeck.all_cards(), k=12))
+            melds = score_meld_all_trumps(hand)
+            for trump in Suit:
+                assert melds[trump].score() == score_meld(hand=hand, trump=trump)
+
+    def test_score_suit_melds_matches_score_meld(self, hand):
+        rng = random.Random(7)
+        hands = [hand] + [rng.sample(CardDeck.all_cards(), k=rng.choice((8, 12, 16))) for _ in range(200)]
+        for cards in hands:
+            compact_hand = CompactHand.from_cards(cards)
+            suits = [suit_meld(signature) for signature in compact_hand.suit_signatures()]
+            for trump in Suit:
+                assert score_suit_melds(suits, trump) == score_meld(hand=compact_hand, trump=trump)
+
+    def test_best_trump(self, hand):
+        assert best_meld_trump(hand) == Suit.HEARTS
+
+    def test_best_trump_ties_go_to_lowest_suit(self):
+        assert best_meld_trump([]) == Suit.CLUBS
+
+
+class TestSuitMeld:
+    def test_empty_suit(self):
+        assert suit_meld(CompactHand().suit_signature(Suit.HEARTS)) == SuitMeld(0, 0, 0, 0, 0, 0, 0)
+
+    def test_ingredients_of_a_suit(self):
+        hand = CompactHand.from_cards(
+            [
+                Card(Rank.NINE, Suit.HEARTS),
+                Card(Rank.QUEEN, Suit.HEARTS),
+                Card(Rank.QUEEN, Suit.HEARTS),
+                Card(Rank.KING, Suit.HEARTS),
+                Card(Rank.KING, Suit.HEARTS),
+                Card(Rank.JACK, Suit.HEARTS),
+                Card(Rank.TEN, Suit.HEARTS),
+                Card(Rank.ACE, Suit.HEARTS),
+                Card(Rank.ACE, Suit.SPADES),
+            ]
+        )
+        assert suit_meld(hand.suit_signature(Suit.HEARTS)) == SuitMeld(
+            nines=1, marriages=2, runs=1, jacks=1, queens=2, kings=2, aces=1
+        )
+
+    def test_signature_ignores_other_suits(self):
+        hearts = [Card(Rank.QUEEN, Suit.HEARTS), Card(Rank.KING, Suit.HEARTS)]
+        with_spades = hearts + [Card(Rank.ACE, Suit.SPADES)]
+        assert CompactHand.from_cards(hearts).suit_signature(Suit.HEARTS) == CompactHand.from_cards(
+            with_spades
+        ).suit_signature(Suit.HEARTS)
+
+    def test_precompute_fills_every_real_signature(self):
+        precompute_meld_table()
+        assert suit_meld.cache_info().currsize >= 3**6
+
+
+class TestTrickPoints:
+    def test_counters_score_a_point_each(self):
+        cards = [Card(Rank.ACE, Suit.CLUBS), Card(Rank.TEN, Suit.HEARTS), Card(Rank.KING, Suit.SPADES)]
+        assert count_trick_points(cards) == 3
+
+    def test_non_counters_score_nothing(self):
+        cards = [Card(Rank.QUEEN, Suit.CLUBS), Card(Rank.JACK, Suit.HEARTS), Card(Rank.NINE, Suit.SPADES)]
+        assert count_trick_points(cards) == 0
+
+    def test_whole_deck(self):
+        assert count_trick_points(CardDeck.all_cards()) + LAST_TRICK_POINTS == TOTAL_TRICK_POINTS == 25
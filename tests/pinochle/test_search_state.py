@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+from pinochle.cards import Card, CardDeck, Rank, Suit, card_id, card_from_id
+from pinochle.compact_hand import CompactHand
+from pinochle.play_tricks import PlayTricksState
+from pinochle.scoring import TOTAL_TRICK_POINTS
+from pinochle.search_state import SearchState, random_playout
+
+PLAYERS = ("a", "b", "c", "d")
+
+
+def _compact_start(seed: int) -> PlayTricksState:
+    rng = random.Random(seed)
+    hands = tuple(CompactHand.from_cards(hand) for hand in CardDeck.deal(rng))
+    return PlayTricksState(hands=hands, players=PLAYERS, player_index=seed % 4, trump=rng.choice(list(Suit)))
+
+
+def _play_randomly(state: PlayTricksState, rng: random.Random, num_cards: int) -> PlayTricksState:
+    for _ in range(num_cards):
+        state = state.play_card(state.current_player(), rng.choice(state.legal_moves()))
+    return state
+
+
+@pytest.mark.parametrize("num_cards", [0, 1, 3, 4, 22, 48])
+def test_round_trips_to_the_same_state(num_cards: int) -> None:
+    state = _play_randomly(_compact_start(num_cards), random.Random(num_cards), num_cards)
+    assert SearchState(state).to_state() == state
+
+
+def test_tuple_hands_come_back_sorted() -> None:
+    hands = tuple(tuple(reversed(sorted(hand))) for hand in CardDeck.deal(random.Random(0)))
+    state = PlayTricksState(hands=hands, players=PLAYERS, player_index=0, trump=Suit.HEARTS)
+    assert SearchState(state).to_state() == state._replace(hands=tuple(tuple(sorted(hand)) for hand in hands))
+
+
+def test_trick_in_progress_without_tracking_is_worked_out() -> None:
+    hands = ((Card(Rank.ACE, Suit.CLUBS),), (), (), (Card(Rank.NINE, Suit.CLUBS),))
+    state = PlayTricksState(
+        hands=hands,
+        players=PLAYERS,
+        player_index=3,
+        trump=Suit.HEARTS,
+        current_trick=(Card(Rank.TEN, Suit.CLUBS), Card(Rank.NINE, Suit.HEARTS), Card(Rank.KING, Suit.CLUBS)),
+    )
+    converted = SearchState(state).to_state()
+    assert converted.winner_index == 1
+    assert converted.winning_card == Card(Rank.NINE, Suit.HEARTS)
+    assert converted.led_suit == Suit.CLUBS
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_make_move_follows_play_card(seed: int) -> None:
+    rng = random.Random(seed)
+    state = _compact_start(seed)
+    search_state = SearchState(state)
+    while any(state.hands):
+        assert tuple(card_from_id(id_) for id_ in search_state.legal_moves()) == state.legal_moves()
+        id_ = rng.choice(search_state.legal_moves())
+        search_state.make_move(id_)
+        state = state.play_card(state.current_player(), card_from_id(id_))
+        assert search_state.to_state() == state
+        assert search_state.hash == SearchState(state).hash
+    assert search_state.is_over()
+    assert sum(search_state.team_points) == TOTAL_TRICK_POINTS
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_unmake_move_restores_every_position(seed: int) -> None:
+    rng = random.Random(seed)
+    search_state = SearchState(_compact_start(seed))
+    history = []
+    while not search_state.is_over():
+        history.append((search_state.to_state(), search_state.hash))
+        search_state.make_move(rng.choice(search_state.legal_moves()))
+    for expected_state, expected_hash in reversed(history):
+        search_state.unmake_move()
+        assert search_state.to_state() == expected_state
+        assert search_state.hash == expected_hash
+
+
+def test_hash_is_the_same_whichever_way_a_position_is_reached() -> None:
+    # Each player holds one card of each suit, so players follow with the only card they can
+    suits = (Suit.CLUBS, Suit.HEARTS, Suit.DIAMONDS)
+    hands = tuple(tuple(Card(rank, suit) for suit in suits) for rank in (Rank.ACE, Rank.NINE, Rank.JACK, Rank.KING))
+    state = PlayTricksState(hands=hands, players=PLAYERS, player_index=0, trump=Suit.SPADES)
+    clubs_first, hearts_first = SearchState(state), SearchState(state)
+    for search_state, suits in ((clubs_first, (Suit.CLUBS, Suit.HEARTS)), (hearts_first, (Suit.HEARTS, Suit.CLUBS))):
+        for suit in suits:
+            search_state.make_move(card_id(Card(Rank.ACE, suit)))
+            for _ in range(3):
+                search_state.make_move(search_state.legal_moves()[0])
+
+    assert clubs_first.to_state().hands == hearts_first.to_state().hands
+    assert clubs_first.hash == hearts_first.hash
+    assert clubs_first.to_state().completed_tricks != hearts_first.to_state().completed_tricks
+
+
+def test_random_playout_takes_every_point() -> None:
+    state = _compact_start(1)
+    assert sum(random_playout(state, random.Random(0))) == TOTAL_TRICK_POINTS
+    assert random_playout(state, random.Random(0)) == random_playout(state, random.Random(0))
+
+
+def test_random_playout_counts_points_already_taken() -> None:
+    state = _play_randomly(_compact_start(2), random.Random(2), 20)
+    team_points = random_playout(state, random.Random(0))
+    assert sum(team_points) == TOTAL_TRICK_POINTS
+    assert all(final >= taken for final, taken in zip(team_points, state.team_points))
@@ -0,0 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from pinochle.pinochle_game import GameState
+from pinochle.scoring import TOTAL_TRICK_POINTS
+from pinochle.sim import play_hand, simulate, HeuristicPolicy, RandomPolicy, SEATS
+
+
+@pytest.mark.parametrize("policy", [HeuristicPolicy(), RandomPolicy()])
+def test_plays_a_whole_hand(policy) -> None:
+    states = []
+    result = play_hand(3, (policy,) * 4, seed=1, record=states)
+    assert states[-1].state == GameState.COMPLETE
+    assert {state.state for state in states} == set(GameState)
+    assert sum(result.trick_points) == TOTAL_TRICK_POINTS
+    assert result.bid_winner in SEATS
+    assert result.bid == states[-1].bidding.current_bid
+
+
+def test_first_bid_rotates() -> None:
+    first_bidders = []
+    for hand_number in range(4):
+        states = []
+        play_hand(hand_number, (HeuristicPolicy(),) * 4, record=states)
+        first_bidders.append(states[0].current_player())
+    assert first_bidders == list(SEATS)
+
+
+def test_bidding_team_that_falls_short_loses_the_bid() -> None:
+    for hand in simulate(200, (RandomPolicy(),) * 4).hands:
+        bidding_team = SEATS.index(hand.bid_winner) % 2
+        made = hand.meld[bidding_team] + hand.trick_points[bidding_team]
+        assert hand.scores[bidding_team] == (made if made >= hand.bid else -hand.bid)
+        assert hand.made_bid() == (made >= hand.bid)
+
+
+def test_reproducible_across_workers() -> None:
+    serial = simulate(40, seed=5, chunk_size=7)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = simulate(40, seed=5, executor=executor, chunk_size=11)
+    assert serial.hands == parallel.hands
+    assert [hand.hand_number for hand in serial.hands] == list(range(40))
+    assert simulate(40, seed=6).hands != serial.hands
+
+
+def test_needs_a_policy_per_seat() -> None:
+    with pytest.raises(ValueError):
+        simulate(1, (HeuristicPolicy(),))
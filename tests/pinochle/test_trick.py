@@ -1,7 +1,7 @@
 import pytest
 
 from pinochle.cards import Card, Rank, Suit
-from pinochle.trick import get_trick_winning_card, get_trick_winner_index, second_card_wins
+from pinochle.trick import get_trick_winning_card, get_trick_winner_index, second_card_wins, card_strength_key
 
 
 @pytest.mark.parametrize(
@@ -68,3 +68,26 @@ def test_second_card_wins_true(card0, card1, trump):
 )
 def test_second_card_wins_false(card0, card1, trump):
     assert not second_card_wins(card0, card1, trump)
+
+
+@pytest.mark.parametrize(
+    "weaker, stronger",
+    [
+        (Card(Rank.ACE, Suit.HEARTS), Card(Rank.NINE, Suit.DIAMONDS)),
+        (Card(Rank.KING, Suit.DIAMONDS), Card(Rank.TEN, Suit.DIAMONDS)),
+        (Card(Rank.ACE, Suit.DIAMONDS), Card(Rank.NINE, Suit.CLUBS)),
+        (Card(Rank.NINE, Suit.CLUBS), Card(Rank.JACK, Suit.CLUBS)),
+    ],
+)
+def test_card_strength_key_orders_trump_then_led_suit_then_rest(weaker, stronger):
+    card_strength = card_strength_key(Suit.DIAMONDS, Suit.CLUBS)
+    assert card_strength(weaker) < card_strength(stronger)
+
+
+def test_card_strength_key_ties_identical_cards():
+    card_strength = card_strength_key(Suit.DIAMONDS, Suit.CLUBS)
+    assert card_strength(Card(Rank.ACE, Suit.DIAMONDS)) == card_strength(Card(Rank.ACE, Suit.DIAMONDS))
+
+
+def test_card_strength_key_is_cached():
+    assert card_strength_key(Suit.HEARTS, Suit.SPADES) is card_strength_key(Suit.HEARTS, Suit.SPADES)
@@ -0,0 +1,66 @@
+import pytest
+
+from pinochle.cards import Card, Suit, Rank
+from pinochle.compact_hand import CompactHand
+from pinochle.utils import remove_cards_from_hand, remove_cards_from_hands, InvalidCardRemoval
+
+HAND = (
+    Card(Rank.ACE, Suit.SPADES),
+    Card(Rank.NINE, Suit.CLUBS),
+    Card(Rank.QUEEN, Suit.HEARTS),
+    Card(Rank.NINE, Suit.CLUBS),
+    Card(Rank.KING, Suit.DIAMONDS),
+)
+
+
+def test_remove_keeps_order_of_remaining_cards() -> None:
+    assert remove_cards_from_hand(HAND, (Card(Rank.KING, Suit.DIAMONDS), Card(Rank.ACE, Suit.SPADES))) == (
+        Card(Rank.NINE, Suit.CLUBS),
+        Card(Rank.QUEEN, Suit.HEARTS),
+        Card(Rank.NINE, Suit.CLUBS),
+    )
+
+
+def test_remove_duplicates() -> None:
+    assert remove_cards_from_hand(HAND, (Card(Rank.NINE, Suit.CLUBS),) * 2) == (
+        Card(Rank.ACE, Suit.SPADES),
+        Card(Rank.QUEEN, Suit.HEARTS),
+        Card(Rank.KING, Suit.DIAMONDS),
+    )
+
+
+def test_remove_nothing() -> None:
+    assert remove_cards_from_hand(HAND, tuple()) == HAND
+
+
+@pytest.mark.parametrize(
+    "cards_to_remove, missing",
+    [
+        ((Card(Rank.JACK, Suit.HEARTS),), Card(Rank.JACK, Suit.HEARTS)),
+        ((Card(Rank.ACE, Suit.SPADES),) * 2, Card(Rank.ACE, Suit.SPADES)),
+        (
+            (Card(Rank.NINE, Suit.CLUBS), Card(Rank.TEN, Suit.CLUBS), Card(Rank.ACE, Suit.SPADES)) * 2,
+            Card(Rank.TEN, Suit.CLUBS),
+        ),
+    ],
+)
+def test_remove_missing_card_names_the_first_one(cards_to_remove, missing) -> None:
+    with pytest.raises(InvalidCardRemoval) as e:
+        remove_cards_from_hand(HAND, cards_to_remove)
+    assert e.value.args[0] == f"{missing} is not in hand"
+
+
+def test_remove_from_all_hands() -> None:
+    hands = (HAND, CompactHand.from_cards(HAND), tuple(), HAND)
+    cards_to_remove = ((Card(Rank.NINE, Suit.CLUBS),), (Card(Rank.ACE, Suit.SPADES),), tuple(), HAND)
+    assert remove_cards_from_hands(hands, cards_to_remove) == (
+        remove_cards_from_hand(HAND, (Card(Rank.NINE, Suit.CLUBS),)),
+        CompactHand.from_cards(HAND[1:]),
+        tuple(),
+        tuple(),
+    )
+
+
+def test_remove_from_all_hands_needs_removals_for_each_hand() -> None:
+    with pytest.raises(ValueError):
+        remove_cards_from_hands((HAND, HAND), (tuple(),))
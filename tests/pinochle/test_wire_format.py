@@ -0,0 +1,88 @@
+from typing import Tuple
+
+import pytest
+
+from pinochle.cards import CardDeck
+from pinochle.game_codec import encode_game as encode_json_game
+from pinochle.game_deltas import public_view
+from pinochle.game_events import GameEvent, replay
+from pinochle.pinochle_game import PinochleGame
+from pinochle.wire_format import (
+    encode_cards,
+    decode_cards,
+    encode_game,
+    decode_game,
+    encode_view,
+    decode_view,
+    WireFormatError,
+    MAX_NAME_BYTES,
+)
+
+
+def test_cards_are_one_byte_each() -> None:
+    hand = CardDeck.deal()[0]
+    encoded = encode_cards(hand)
+    assert len(encoded) == 12
+    assert decode_cards(encoded) == hand
+
+
+def test_card_ids_out_of_range() -> None:
+    with pytest.raises(WireFormatError):
+        decode_cards(bytes([24]))
+
+
+@pytest.mark.parametrize("event_count", [1, 4, 6, 7, 8, 9, 10, 37, 56])
+def test_games_round_trip(full_game_events: Tuple[GameEvent, ...], event_count: int) -> None:
+    game = replay(full_game_events[:event_count])
+    assert decode_game(encode_game(game)) == game
+
+
+def test_smaller_than_json(full_game_events: Tuple[GameEvent, ...]) -> None:
+    game = replay(full_game_events[:37])
+    assert len(encode_game(game)) * 4 < len(encode_json_game(game).encode())
+
+
+def test_decoded_game_plays_on(full_game_events: Tuple[GameEvent, ...]) -> None:
+    game = decode_game(encode_game(replay(full_game_events[:21])))
+    assert replay(full_game_events[21:], game) == replay(full_game_events)
+
+
+@pytest.mark.parametrize("cut", [0, 1, 10, -1])
+def test_truncated_game(full_game_events: Tuple[GameEvent, ...], cut: int) -> None:
+    with pytest.raises(WireFormatError):
+        decode_game(encode_game(replay(full_game_events[:37]))[:cut])
+
+
+def test_trailing_bytes(full_game_events: Tuple[GameEvent, ...]) -> None:
+    with pytest.raises(WireFormatError):
+        decode_game(encode_game(replay(full_game_events[:8])) + b"\0")
+
+
+def test_unknown_version(full_game_events: Tuple[GameEvent, ...]) -> None:
+    with pytest.raises(WireFormatError):
+        decode_game(b"\x02" + encode_game(replay(full_game_events[:1]))[1:])
+
+
+@pytest.mark.parametrize("event_count", [1, 4, 6, 7, 8, 9, 10, 37, 56])
+def test_views_round_trip(full_game_events: Tuple[GameEvent, ...], event_count: int) -> None:
+    game = replay(full_game_events[:event_count])
+    assert decode_view(encode_view(game, event_count)) == public_view(game, event_count)
+
+
+@pytest.mark.parametrize("cut", [0, 1, 10, -1])
+def test_truncated_view(full_game_events: Tuple[GameEvent, ...], cut: int) -> None:
+    with pytest.raises(WireFormatError):
+        decode_view(encode_view(replay(full_game_events[:37]), 37)[:cut])
+
+
+@pytest.mark.parametrize("name, fits", [("é" * (MAX_NAME_BYTES // 2), True), ("é" * (MAX_NAME_BYTES // 2 + 1), False)])
+def test_player_names_up_to_the_byte_limit(name: str, fits: bool) -> None:
+    game = PinochleGame.new_game(players=(name, "b", "c", "d"))
+    if fits:
+        assert decode_game(encode_game(game)).players[0] == name
+        assert decode_view(encode_view(game, 1))["players"][0] == name
+    else:
+        with pytest.raises(WireFormatError):
+            encode_game(game)
+        with pytest.raises(WireFormatError):
+            encode_view(game, 1)
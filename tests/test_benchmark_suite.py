@@ -0,0 +1,19 @@
+from benchmarks.suite import Benchmark, run_benchmarks, find_regressions, to_json, BENCHMARKS
+
+
+def test_results_are_per_call_times() -> None:
+    benchmark = Benchmark("sum", setup=lambda: list(range(100)), run=lambda numbers: sum(numbers) and 4, number=2)
+    results = run_benchmarks((benchmark,), repeat=1)
+    assert list(results) == ["sum"]
+    assert results["sum"] > 0
+
+
+def test_filter() -> None:
+    assert list(run_benchmarks(BENCHMARKS, repeat=1, name_filter="trick_winning")) == ["get_trick_winning_card"]
+
+
+def test_regressions_beyond_the_threshold() -> None:
+    baseline = to_json({"fast": 10.0, "steady": 10.0, "removed": 10.0})
+    regressions = find_regressions(baseline, {"fast": 12.5, "steady": 11.0, "added": 50.0}, threshold=0.2)
+    assert [regression.name for regression in regressions] == ["fast"]
+    assert regressions[0].slowdown() == 0.25
@@ -0,0 +1,65 @@
+from typing import Tuple
+
+import pytest
+
+from game_repository import GameRepository
+from game_store import InMemoryGameStore, GameNotFound, EventConflict
+from pinochle.game_events import GameEvent, replay
+from pinochle.play_tricks import InvalidPlay
+
+
+@pytest.fixture
+def repository() -> GameRepository:
+    return GameRepository(InMemoryGameStore(), snapshot_interval=8)
+
+
+def _record_all(repository: GameRepository, events: Tuple[GameEvent, ...]) -> int:
+    game_id, loaded = repository.start(events[0])
+    for event in events[1:]:
+        loaded = repository.record(game_id, loaded, event)
+    return game_id
+
+
+def test_load_current_game(repository: GameRepository, full_game_events: Tuple[GameEvent, ...]) -> None:
+    game_id = _record_all(repository, full_game_events)
+    loaded = repository.load(game_id)
+    assert loaded.event_count == len(full_game_events)
+    assert loaded.game == replay(full_game_events)
+
+
+def test_snapshots_every_interval(repository: GameRepository, full_game_events: Tuple[GameEvent, ...]) -> None:
+    game_id = _record_all(repository, full_game_events)
+    assert repository.store.get_snapshot(game_id)[0] == 56
+    assert repository.store.get_snapshot(game_id, at_or_before=55)[0] == 48
+
+
+@pytest.mark.parametrize("event_count", [1, 7, 8, 9, 40])
+def test_load_earlier_game(
+    repository: GameRepository, full_game_events: Tuple[GameEvent, ...], event_count: int
+) -> None:
+    game_id = _record_all(repository, full_game_events)
+    assert repository.load(game_id, event_count=event_count).game == replay(full_game_events[:event_count])
+    with pytest.raises(ValueError):
+        repository.load(game_id, event_count=len(full_game_events) + 1)
+
+
+def test_rejected_move_is_not_recorded(repository: GameRepository, full_game_events: Tuple[GameEvent, ...]) -> None:
+    game_id = _record_all(repository, full_game_events[:20])
+    loaded = repository.load(game_id)
+    # Playing out of turn
+    with pytest.raises(InvalidPlay):
+        repository.record(game_id, loaded, full_game_events[21])
+    assert repository.load(game_id) == loaded
+
+
+def test_stale_game_conflicts(repository: GameRepository, full_game_events: Tuple[GameEvent, ...]) -> None:
+    game_id = _record_all(repository, full_game_events[:20])
+    loaded = repository.load(game_id)
+    repository.record(game_id, loaded, full_game_events[20])
+    with pytest.raises(EventConflict):
+        repository.record(game_id, loaded, full_game_events[20])
+
+
+def test_load_missing_game(repository: GameRepository) -> None:
+    with pytest.raises(GameNotFound):
+        repository.load(3)
@@ -0,0 +1,130 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from game_store import (
+    GameStore,
+    GameNotFound,
+    EventConflict,
+    InMemoryGameStore,
+    SqliteGameStore,
+    AppendOnlyFileGameStore,
+    open_game_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "file"])
+def store_url(request, tmp_path: Path) -> str:
+    return "memory" if request.param == "memory" else f"{request.param}:{tmp_path / 'games'}"
+
+
+@pytest.fixture
+def store(store_url: str) -> GameStore:
+    store = open_game_store(store_url)
+    yield store
+    store.close()
+
+
+def test_create(store: GameStore) -> None:
+    first_id = store.create()
+    second_id = store.create()
+    assert first_id != second_id
+    store.check_exists(first_id)
+    store.check_exists(second_id)
+    assert store.get_events(first_id) == []
+
+
+def test_missing_game(store: GameStore) -> None:
+    with pytest.raises(GameNotFound):
+        store.check_exists(7)
+
+
+def test_events_are_appended_in_sequence(store: GameStore) -> None:
+    game_id = store.create()
+    store.append_event(game_id, 0, "first")
+    store.append_event(game_id, 1, "second")
+    store.append_event(game_id, 2, "third")
+    assert store.get_events(game_id) == ["first", "second", "third"]
+    assert store.get_events(game_id, start=1) == ["second", "third"]
+    assert store.get_events(game_id, start=1, stop=2) == ["second"]
+
+
+@pytest.mark.parametrize("sequence", [0, 2])
+def test_out_of_sequence_event_conflicts(store: GameStore, sequence: int) -> None:
+    game_id = store.create()
+    store.append_event(game_id, 0, "first")
+    with pytest.raises(EventConflict):
+        store.append_event(game_id, sequence, "other")
+    assert store.get_events(game_id) == ["first"]
+
+
+def test_events_for_missing_game(store: GameStore) -> None:
+    with pytest.raises(GameNotFound):
+        store.append_event(7, 0, "event")
+    with pytest.raises(GameNotFound):
+        store.put_snapshot(7, 1, "snapshot")
+    assert store.get_events(7) == []
+    assert store.get_snapshot(7) is None
+
+
+def test_latest_snapshot(store: GameStore) -> None:
+    game_id = store.create()
+    assert store.get_snapshot(game_id) is None
+    store.put_snapshot(game_id, 16, "after 16")
+    store.put_snapshot(game_id, 32, "after 32")
+    assert store.get_snapshot(game_id) == (32, "after 32")
+    assert store.get_snapshot(game_id, at_or_before=31) == (16, "after 16")
+    assert store.get_snapshot(game_id, at_or_before=15) is None
+
+
+def test_open_game_store_kinds(tmp_path: Path) -> None:
+    assert isinstance(open_game_store("memory"), InMemoryGameStore)
+    assert isinstance(open_game_store(f"sqlite:{tmp_path / 'games.db'}"), SqliteGameStore)
+    assert isinstance(open_game_store(f"file:{tmp_path / 'games.log'}"), AppendOnlyFileGameStore)
+    with pytest.raises(ValueError):
+        open_game_store("redis:localhost")
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "file"])
+def test_games_survive_reopening(kind: str, tmp_path: Path) -> None:
+    url = f"{kind}:{tmp_path / 'games'}"
+    store = open_game_store(url)
+    game_id = store.create()
+    store.append_event(game_id, 0, "event")
+    store.put_snapshot(game_id, 1, "snapshot")
+    store.close()
+
+    reopened = open_game_store(url)
+    reopened.check_exists(game_id)
+    assert reopened.get_events(game_id) == ["event"]
+    assert reopened.get_snapshot(game_id) == (1, "snapshot")
+    assert reopened.create() != game_id
+
+
+def _create_games(url: str, worker: int, count: int) -> List[int]:
+    store = open_game_store(url)
+    game_ids = []
+    for i in range(count):
+        game_id = store.create()
+        store.append_event(game_id, 0, f"game {worker}.{i}")
+        game_ids.append(game_id)
+    store.close()
+    return game_ids
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "file"])
+def test_ids_are_unique_across_processes(kind: str, tmp_path: Path) -> None:
+    url = f"{kind}:{tmp_path / 'games'}"
+    open_game_store(url).close()
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_create_games, [url] * 4, range(4), [25] * 4))
+
+    all_ids = [game_id for game_ids in results for game_id in game_ids]
+    assert len(set(all_ids)) == 100
+
+    store = open_game_store(url)
+    for worker, game_ids in enumerate(results):
+        for i, game_id in enumerate(game_ids):
+            assert store.get_events(game_id) == [f"game {worker}.{i}"]
@@ -0,0 +1,252 @@
+import asyncio
+
+import httpx
+import pytest
+from starlette.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+import game_channels
+import main
+from pinochle import wire_format, instrumentation
+from pinochle.cards import Card
+from pinochle.game_codec import decode_game
+
+client = TestClient(main.app)
+
+
+def _card_json(card: Card) -> dict:
+    return {"rank": card.rank.value, "suit": card.suit.value}
+
+
+@pytest.fixture
+def game_id() -> int:
+    response = client.post("/games/", json={"players": ["a", "b", "c", "d"]})
+    assert response.status_code == 200
+    return response.json()["game_id"]
+
+
+def _won_by_a_in_hearts(game_id: int) -> None:
+    client.post(f"/games/{game_id}/bids", json={"player": "a", "bid": 25}).raise_for_status()
+    for player in "bcd":
+        client.post(f"/games/{game_id}/bids/pass", json={"player": player}).raise_for_status()
+    client.post(f"/games/{game_id}/trump", json={"player": "a", "trump": "Hearts"}).raise_for_status()
+
+
+def _pass(game_id: int, source: str, destination: str) -> dict:
+    hand = client.get(f"/games/{game_id}/players/{source}/hand").json()
+    response = client.post(
+        f"/games/{game_id}/passes", json={"source": source, "destination": destination, "cards": hand[:4]}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def test_new_game_view(game_id: int) -> None:
+    view = client.get(f"/games/{game_id}").json()
+    assert view["players"] == ["a", "b", "c", "d"]
+    assert view["state"] == "Bidding"
+    assert view["current_player"] == "a"
+    assert view["hand_sizes"] == [12, 12, 12, 12]
+    assert len(client.get(f"/games/{game_id}/players/b/hand").json()) == 12
+
+
+def test_unknown_game_and_player(game_id: int) -> None:
+    assert client.get("/games/100000").status_code == 404
+    assert client.get(f"/games/{game_id}/players/z/hand").status_code == 404
+
+
+def test_play_a_whole_game(game_id: int) -> None:
+    _won_by_a_in_hearts(game_id)
+    assert _pass(game_id, "c", "a")["state"] == "PassingToPartner"
+    view = _pass(game_id, "a", "c")
+    assert view["state"] == "PlayingTricks"
+    assert view["trump"] == "Hearts"
+
+    while view["state"] == "PlayingTricks":
+        tricks = main.repository.load(game_id).game.tricks
+        card = tricks.legal_moves()[0]
+        response = client.post(
+            f"/games/{game_id}/plays", json={"player": tricks.current_player(), "card": _card_json(card)}
+        )
+        assert response.status_code == 200
+        view = response.json()
+
+    assert view["state"] == "Complete"
+    assert view["current_player"] is None
+    assert sum(view["team_points"]) == 25
+    assert view["event_count"] == 56
+
+    binary = client.get(f"/games/{game_id}/states/37", headers={"Accept": wire_format.MEDIA_TYPE})
+    assert binary.headers["content-type"] == wire_format.MEDIA_TYPE
+    json_state = client.get(f"/games/{game_id}/states/37")
+    assert decode_game(json_state.text) == wire_format.decode_game(binary.content)
+    assert decode_game(json_state.text) == main.repository.load(game_id, 37).game
+    assert client.get(f"/games/{game_id}/states/57").status_code == 404
+    assert client.get(f"/games/{game_id}/states/0").status_code == 404
+
+
+def test_binary_hand(game_id: int) -> None:
+    response = client.get(
+        f"/games/{game_id}/players/b/hand", headers={"Accept": f"{wire_format.MEDIA_TYPE}, application/json;q=0.5"}
+    )
+    assert response.headers["content-type"] == wire_format.MEDIA_TYPE
+    assert [_card_json(card) for card in wire_format.decode_cards(response.content)] == client.get(
+        f"/games/{game_id}/players/b/hand"
+    ).json()
+
+
+def test_binary_views(game_id: int) -> None:
+    binary = client.get(f"/games/{game_id}", headers={"Accept": wire_format.MEDIA_TYPE})
+    assert binary.headers["content-type"] == wire_format.MEDIA_TYPE
+    assert wire_format.decode_view(binary.content) == {
+        **client.get(f"/games/{game_id}").json(),
+        "players": ("a", "b", "c", "d"),
+    }
+
+    binary = client.post(
+        f"/games/{game_id}/bids", json={"player": "a", "bid": 25}, headers={"Accept": wire_format.MEDIA_TYPE}
+    )
+    assert binary.headers["content-type"] == wire_format.MEDIA_TYPE
+    view = wire_format.decode_view(binary.content)
+    assert (view["current_bid"], view["current_player"], view["event_count"]) == (25, "b", 2)
+
+
+def test_player_names_must_fit_the_binary_format() -> None:
+    too_long = "x" * (wire_format.MAX_NAME_BYTES + 1)
+    assert client.post("/games/", json={"players": [too_long, "b", "c", "d"]}).status_code == 422
+
+
+def test_states_are_hidden_until_the_game_is_over(game_id: int) -> None:
+    assert client.get(f"/games/{game_id}/states/1").status_code == 403
+
+
+def test_metrics(game_id: int) -> None:
+    instrumentation.enable_instrumentation()
+    try:
+        client.post(f"/games/{game_id}/bids", json={"player": "a", "bid": 25}).raise_for_status()
+        response = client.get("/metrics")
+    finally:
+        instrumentation.disable_instrumentation()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'pinochle_operation_seconds_count{operation="bidding.new_bid"}' in response.text
+
+
+def test_illegal_moves_are_rejected(game_id: int) -> None:
+    response = client.post(f"/games/{game_id}/bids", json={"player": "b", "bid": 30})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "b cannot take actions on a's turn"
+
+    response = client.post(f"/games/{game_id}/trump", json={"player": "a", "trump": "Hearts"})
+    assert response.status_code == 400
+    assert client.get(f"/games/{game_id}").json()["event_count"] == 1
+
+
+def test_concurrent_moves_on_one_game_are_serialized(game_id: int) -> None:
+    async def bid_twice():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            return await asyncio.gather(
+                *(client.post(f"/games/{game_id}/bids", json={"player": "a", "bid": 25}) for _ in range(2))
+            )
+
+    responses = asyncio.run(bid_twice())
+    assert sorted(response.status_code for response in responses) == [200, 400]
+    assert client.get(f"/games/{game_id}").json()["event_count"] == 2
+
+
+def test_updates_are_pushed_to_each_seat(game_id: int) -> None:
+    with TestClient(main.app) as live_client:
+        with live_client.websocket_connect(
+            f"/games/{game_id}/updates?player=a"
+        ) as seat_a, live_client.websocket_connect(
+            f"/games/{game_id}/updates?player=c"
+        ) as seat_c, live_client.websocket_connect(
+            f"/games/{game_id}/updates"
+        ) as spectator:
+            view_a = seat_a.receive_json()
+            assert view_a["state"] == "Bidding"
+            assert len(view_a["hand"]) == 12
+            assert "hand" not in spectator.receive_json()
+            hand_c = seat_c.receive_json()["hand"]
+
+            live_client.post(f"/games/{game_id}/bids", json={"player": "a", "bid": 25}).raise_for_status()
+            delta = {"event_count": 2, "type": "BidPlaced", "player": "a", "bid": 25, "current_player": "b"}
+            assert seat_a.receive_json() == seat_c.receive_json() == spectator.receive_json() == delta
+
+            for player in "bcd":
+                live_client.post(f"/games/{game_id}/bids/pass", json={"player": player}).raise_for_status()
+            live_client.post(f"/games/{game_id}/trump", json={"player": "a", "trump": "Hearts"}).raise_for_status()
+            for _ in range(4):
+                spectator.receive_json()
+                seat_a.receive_json()
+                seat_c.receive_json()
+
+            response = live_client.post(
+                f"/games/{game_id}/passes", json={"source": "c", "destination": "a", "cards": hand_c[:4]}
+            )
+            response.raise_for_status()
+            public = {
+                "event_count": 7,
+                "type": "CardsPassed",
+                "source": "c",
+                "destination": "a",
+                "state": "PassingToPartner",
+                "current_player": "a",
+            }
+            assert spectator.receive_json() == seat_a.receive_json() == seat_c.receive_json() == public
+            # Only the partners see the cards that changed hands
+            assert seat_a.receive_json() == {"event_count": 7, "cards_added": hand_c[:4]}
+            assert seat_c.receive_json() == {"event_count": 7, "cards_removed": hand_c[:4]}
+
+
+def test_trick_winner_is_pushed(game_id: int) -> None:
+    with TestClient(main.app) as live_client:
+        _won_by_a_in_hearts(game_id)
+        _pass(game_id, "c", "a")
+        _pass(game_id, "a", "c")
+        with live_client.websocket_connect(f"/games/{game_id}/updates") as spectator:
+            assert spectator.receive_json()["event_count"] == 8
+            for _ in range(4):
+                tricks = main.repository.load(game_id).game.tricks
+                card = tricks.legal_moves()[0]
+                live_client.post(
+                    f"/games/{game_id}/plays", json={"player": tricks.current_player(), "card": _card_json(card)}
+                ).raise_for_status()
+                delta = spectator.receive_json()
+                assert delta["card"] == _card_json(card)
+
+            tricks = main.repository.load(game_id).game.tricks
+            assert delta["trick_winner"] == tricks.current_player()
+            assert delta["current_player"] == tricks.current_player()
+            assert delta["team_points"] == list(tricks.team_points)
+
+
+def test_updates_for_unknown_game_or_player(game_id: int) -> None:
+    with TestClient(main.app) as live_client:
+        for url in ("/games/100000/updates", f"/games/{game_id}/updates?player=z"):
+            with live_client.websocket_connect(url) as websocket:
+                with pytest.raises(WebSocketDisconnect) as e:
+                    websocket.receive_json()
+                assert e.value.code == 4404
+
+
+def test_updates_close_with_an_error_when_the_channel_fails(game_id: int, monkeypatch, caplog) -> None:
+    async def fail_to_catch_up(self) -> None:
+        raise RuntimeError("store unavailable")
+
+    with TestClient(main.app) as live_client:
+        monkeypatch.setattr(game_channels.GameChannel, "_catch_up", fail_to_catch_up)
+        with live_client.websocket_connect(f"/games/{game_id}/updates") as spectator:
+            assert spectator.receive_json()["event_count"] == 1
+            live_client.post(f"/games/{game_id}/bids", json={"player": "a", "bid": 25}).raise_for_status()
+            with pytest.raises(WebSocketDisconnect) as e:
+                spectator.receive_json()
+            assert e.value.code == 1011
+        assert f"Stopped following game {game_id}" in caplog.text
+
+        # A new subscriber follows the game again once the store recovers
+        monkeypatch.undo()
+        with live_client.websocket_connect(f"/games/{game_id}/updates") as spectator:
+            assert spectator.receive_json()["event_count"] == 2
+            live_client.post(f"/games/{game_id}/bids/pass", json={"player": "b"}).raise_for_status()
+            assert spectator.receive_json()["type"] == "BiddingPassed"